@@ -0,0 +1,63 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Benchmarks for metadata queries"""
+
+import os.path as op
+import tempfile
+
+from datalad.metadata.metadata import _iter_content_metadata
+from datalad.support.json_py import dump2xzstream
+from datalad.support.packed_stream import dump2packstream
+from datalad.utils import path_startswith
+
+from .common import SuprocBenchmarks
+
+
+def _gen_records(nfiles):
+    # something in between a flat and a deep hierarchy, with a bit
+    # of metadata for each file, like an extractor would produce
+    for i in range(nfiles):
+        yield {
+            'path': 'sub-{:04d}/ses-{:02d}/file{:d}.dat'.format(
+                i // 1000, (i // 100) % 10, i),
+            'datalad_core': {'url': ['http://example.com/{}'.format(i)]},
+            'audio': {'duration': i * 0.1, 'format': 'mp3'},
+        }
+
+
+class content_metadata(SuprocBenchmarks):
+    """
+    Query the metadata of a single file from an aggregated content
+    metadata object, as done by `datalad metadata <file>`
+    """
+    params = [[1000, 1000000], ['jsonxz', 'msgpack']]
+    param_names = ['nfiles', 'format']
+    timeout = 3600
+
+    def setup_cache(self):
+        topdir = tempfile.mkdtemp(prefix='datalad-bm')
+        for nfiles in self.params[0]:
+            dump2xzstream(
+                _gen_records(nfiles),
+                op.join(topdir, 'cn-{}.xz'.format(nfiles)))
+            dump2packstream(
+                _gen_records(nfiles),
+                op.join(topdir, 'cn-{}.msgpack'.format(nfiles)))
+        return topdir
+
+    def time_query_single_file(self, topdir, nfiles, format):
+        objpath = op.join(
+            topdir,
+            'cn-{}.{}'.format(nfiles, 'xz' if format == 'jsonxz' else format))
+        target = 'sub-0000/ses-05/file{:d}.dat'.format(min(nfiles, 1000) // 2)
+        # same filtering as in _query_aggregated_metadata_singlepath()
+        res = [fpath
+               for fpath, fmeta in _iter_content_metadata(objpath, path=target)
+               if path_startswith(fpath, target)]
+        assert len(res) == 1
@@ -0,0 +1,66 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Benchmarks for queries of repository state"""
+
+import os.path as op
+import subprocess
+import tempfile
+
+import git as gitpy
+
+from datalad.support.gitindex import iter_index
+
+from .common import SuprocBenchmarks
+
+
+class git_index(SuprocBenchmarks):
+    """
+    Read all entries of git's index, as done by `GitRepo.get_indexed_files()`
+    """
+    params = [1000, 100000]
+    param_names = ['nfiles']
+    timeout = 3600
+
+    def setup_cache(self):
+        topdir = tempfile.mkdtemp(prefix='datalad-bm')
+        for nfiles in self.params:
+            path = op.join(topdir, str(nfiles))
+            subprocess.check_call(['git', 'init', '-q', path])
+            blob = subprocess.check_output(
+                ['git', 'hash-object', '-w', '--stdin'],
+                cwd=path, input=b'content').decode().strip()
+            # populate the index only, no need for a work tree
+            subprocess.run(
+                ['git', 'update-index', '--index-info'],
+                cwd=path, check=True,
+                input=''.join(
+                    '100644 {} 0\tsub-{:04d}/file{:d}.dat\n'.format(
+                        blob, i // 1000, i)
+                    for i in range(nfiles)).encode())
+        return topdir
+
+    def time_gitpython(self, topdir, nfiles):
+        repo = gitpy.Repo(op.join(topdir, str(nfiles)))
+        paths = [k[0] for k in repo.index.entries]
+        assert len(paths) == nfiles
+
+    def time_iter_index(self, topdir, nfiles):
+        paths = [e.path for e in iter_index(
+            op.join(topdir, str(nfiles), '.git', 'index'))]
+        assert len(paths) == nfiles
+
+    def peakmem_gitpython(self, topdir, nfiles):
+        repo = gitpy.Repo(op.join(topdir, str(nfiles)))
+        entries = repo.index.entries
+        assert len(entries) == nfiles
+
+    def peakmem_iter_index(self, topdir, nfiles):
+        entries = list(iter_index(
+            op.join(topdir, str(nfiles), '.git', 'index')))
+        assert len(entries) == nfiles
@@ -0,0 +1,47 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Benchmarks for helpers in datalad.support"""
+
+import os
+import os.path as op
+import tempfile
+
+from datalad.support.digests import Digester
+
+from .common import SuprocBenchmarks
+
+
+class digester(SuprocBenchmarks):
+    """
+    Compute all default digests for a single large or many small files
+    """
+    params = [False, True]
+    param_names = ['parallel']
+    timeout = 600
+
+    def setup_cache(self):
+        topdir = tempfile.mkdtemp(prefix='datalad-bm')
+        with open(op.join(topdir, 'large.dat'), 'wb') as f:
+            for i in range(256):
+                f.write(os.urandom(1 << 20))
+        os.mkdir(op.join(topdir, 'small'))
+        for i in range(1000):
+            with open(op.join(topdir, 'small', str(i)), 'wb') as f:
+                f.write(os.urandom(1 << 16))
+        return topdir
+
+    def time_large_file(self, topdir, parallel):
+        Digester(parallel=parallel)(op.join(topdir, 'large.dat'))
+
+    def time_many_files(self, topdir, parallel):
+        small = op.join(topdir, 'small')
+        fpaths = [op.join(small, f) for f in os.listdir(small)]
+        res = list(Digester().digest_files(
+            fpaths, jobs=None if parallel else 1))
+        assert len(res) == len(fpaths)
@@ -0,0 +1,180 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Runners executing commands concurrently with asyncio
+
+Python 3.5+ only, hence not to be imported directly but via
+`datalad.cmd_async`. Logging, protocols and error reporting follow the
+synchronous `Runner` in `datalad.cmd`, but any number of commands can be
+running at the same time from a single thread.
+"""
+
+import asyncio
+import logging
+import shlex
+import subprocess
+
+from six import string_types
+
+from .cmd import Runner
+from .cmd import GitRunner
+from .dochelpers import borrowdoc
+from .dochelpers import exc_str
+from .utils import assure_unicode
+from .utils import on_windows
+
+lgr = logging.getLogger('datalad.cmd')
+
+
+def _new_event_loop():
+    # only the proactor loop supports subprocesses on windows
+    return asyncio.ProactorEventLoop() if on_windows \
+        else asyncio.new_event_loop()
+
+
+class AsyncRunner(Runner):
+    """Runner that can execute commands concurrently
+
+    `run_async()` is a coroutine with the semantics of `Runner.run()`
+    (minus online logging). `run_many()` runs a sequence of commands in a
+    private event loop and returns their outputs in order. It must be called
+    from the main thread.
+    """
+
+    async def run_async(self, cmd, log_stdout=True, log_stderr=True,
+                        expect_stderr=False, expect_fail=False,
+                        cwd=None, env=None, shell=None, stdin=None):
+        """Coroutine to run the command `cmd`
+
+        See `Runner.run()` for a description of the parameters. Outputs that
+        are not logged are not captured, but go to the process' stdout or
+        stderr, respectively.
+
+        Returns
+        -------
+        (stdout, stderr)
+
+        Raises
+        ------
+        CommandError
+           if command's exitcode wasn't 0 or None.
+        """
+        popen_env = env or self.env
+        self._log_run(cmd, cwd, stdin, popen_env)
+
+        if not self.protocol.do_execute_ext_commands:
+            if self.protocol.records_ext_commands:
+                self.protocol.add_section(shlex.split(cmd,
+                                                      posix=not on_windows)
+                                          if isinstance(cmd, string_types)
+                                          else cmd, None)
+            return ("DRY", "DRY")
+
+        if shell is None:
+            shell = isinstance(cmd, string_types)
+
+        if self.protocol.records_ext_commands:
+            prot_exc = None
+            prot_id = self.protocol.start_section(
+                shlex.split(cmd, posix=not on_windows)
+                if isinstance(cmd, string_types)
+                else cmd)
+        kwargs = dict(
+            stdout=subprocess.PIPE if log_stdout else None,
+            stderr=subprocess.PIPE if log_stderr else None,
+            cwd=cwd or self.cwd,
+            env=popen_env,
+            stdin=stdin)
+        try:
+            if shell:
+                proc = await asyncio.create_subprocess_shell(
+                    cmd, **kwargs)
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, **kwargs)
+        except Exception as e:
+            prot_exc = e
+            lgr.log(11, "Failed to start %r%r: %s" %
+                    (cmd, " under %r" % cwd if cwd else '', exc_str(e)))
+            raise
+        finally:
+            if self.protocol.records_ext_commands:
+                self.protocol.end_section(prot_id, prot_exc)
+
+        out = await proc.communicate()
+        return self._finish_run(
+            cmd, cwd, out, proc.returncode,
+            expect_stderr=expect_stderr,
+            expect_fail=expect_fail)
+
+    def run_many(self, cmds, jobs=None, return_exceptions=False, **kwargs):
+        """Run multiple commands concurrently
+
+        Parameters
+        ----------
+        cmds : iterable
+          Commands, as accepted by `run()`.
+        jobs : int, optional
+          Maximum number of commands running at the same time. No limit
+          if None.
+        return_exceptions : bool, optional
+          If True, the exception (e.g. CommandError) of a failing command is
+          reported instead of its output. Otherwise the first exception (in
+          the order of `cmds`) is raised. Either way, all commands are
+          waited for.
+        **kwargs
+          Passed to `run_async()` for each command.
+
+        Returns
+        -------
+        list
+          (stdout, stderr) of each command (or exception), in the order of
+          `cmds`.
+        """
+        prev_loop = asyncio.get_event_loop()
+        loop = _new_event_loop()
+        # make it the current loop, so everything (incl. the watcher for
+        # child processes) gets attached to it
+        asyncio.set_event_loop(loop)
+        try:
+            limit = asyncio.Semaphore(jobs) if jobs else None
+
+            async def _run(cmd):
+                if limit is None:
+                    return await self.run_async(cmd, **kwargs)
+                async with limit:
+                    return await self.run_async(cmd, **kwargs)
+
+            # never let gather() return before all commands are done, or
+            # the loop would be closed under the running processes
+            res = loop.run_until_complete(
+                asyncio.gather(
+                    *[_run(cmd) for cmd in cmds],
+                    return_exceptions=True))
+        finally:
+            loop.close()
+            asyncio.set_event_loop(prev_loop)
+        if not return_exceptions:
+            for r in res:
+                if isinstance(r, BaseException):
+                    raise r
+        return res
+
+
+class AsyncGitRunner(AsyncRunner, GitRunner):
+    """AsyncRunner to run git and git-annex commands
+
+    See `GitRunner` for the adjustments of the environment.
+    """
+
+    @borrowdoc(AsyncRunner)
+    async def run_async(self, cmd, env=None, *args, **kwargs):
+        out, err = await super(AsyncGitRunner, self).run_async(
+            cmd, env=self.get_git_environ_adjusted(env), *args, **kwargs)
+        # All communication here will be returned as unicode
+        return assure_unicode(out), assure_unicode(err)
@@ -367,7 +367,7 @@ class Runner(object):
 
     def run(self, cmd, log_stdout=True, log_stderr=True, log_online=False,
             expect_stderr=False, expect_fail=False,
-            cwd=None, env=None, shell=None, stdin=None):
+            cwd=None, env=None, shell=None, stdin=None, on_start=None):
         """Runs the command `cmd` using shell.
 
         In case of dry-mode `cmd` is just added to `commands` and it is
@@ -423,6 +423,11 @@ class Runner(object):
         stdin: file descriptor
             input stream to connect to stdin of the process.
 
+        on_start: callable, optional
+            Called with the `subprocess.Popen` instance right after the
+            process was started, e.g. to be able to terminate it from
+            another thread.
+
         Returns
         -------
         (stdout, stderr) - bytes!
@@ -447,23 +452,7 @@ class Runner(object):
         # to overcome this problem.
         # For now necessary test code should be wrapped into swallow_outputs cm
         # to avoid the problem
-        log_msgs = ["Running: %s"]
-        log_args = [cmd]
-        if self.log_cwd:
-            log_msgs += ['cwd=%r']
-            log_args += [cwd or self.cwd]
-        if self.log_stdin:
-            log_msgs += ['stdin=%r']
-            log_args += [stdin]
-        log_env = self.log_env
-        if log_env and popen_env:
-            log_msgs += ["env=%r"]
-            log_args.append(
-                popen_env if log_env is True
-                else {k: popen_env[k] for k in log_env if k in popen_env}
-            )
-        log_msg = '\n'.join(log_msgs)
-        self.log(log_msg, *log_args)
+        self._log_run(cmd, cwd, stdin, popen_env)
 
         if self.protocol.do_execute_ext_commands:
 
@@ -496,6 +485,8 @@ class Runner(object):
                     self.protocol.end_section(prot_id, prot_exc)
 
             try:
+                if on_start:
+                    on_start(proc)
                 if log_online:
                     out = self._get_output_online(proc,
                                                   log_stdout, log_stderr,
@@ -505,32 +496,11 @@ class Runner(object):
                 else:
                     out = proc.communicate()
 
-                if PY3:
-                    # Decoding was delayed to this point
-                    def decode_if_not_None(x):
-                        return "" if x is None else binary_type.decode(x)
-                    # TODO: check if we can avoid PY3 specific here
-                    out = tuple(map(decode_if_not_None, out))
-
-                status = proc.poll()
-
-                # needs to be done after we know status
-                if not log_online:
-                    self._log_out(out[0])
-                    if status not in [0, None]:
-                        self._log_err(out[1], expected=expect_fail)
-                    else:
-                        # as directed
-                        self._log_err(out[1], expected=expect_stderr)
-
-                if status not in [0, None]:
-                    msg = "Failed to run %r%s. Exit code=%d. out=%s err=%s" \
-                        % (cmd, " under %r" % (cwd or self.cwd), status, out[0], out[1])
-                    lgr.log(9 if expect_fail else 11, msg)
-                    raise CommandError(str(cmd), msg, status, out[0], out[1])
-                else:
-                    self.log("Finished running %r with status %s" % (cmd, status),
-                             level=8)
+                out = self._finish_run(
+                    cmd, cwd, out, proc.poll(),
+                    log_outputs=not log_online,
+                    expect_stderr=expect_stderr,
+                    expect_fail=expect_fail)
             finally:
                 # Those streams are for us to close if we asked for a PIPE
                 # TODO -- assure closing the files import pdb; pdb.set_trace()
@@ -547,6 +517,65 @@ class Runner(object):
 
         return out
 
+    def _log_run(self, cmd, cwd, stdin, popen_env):
+        """Log the execution of a command, as configured"""
+        log_msgs = ["Running: %s"]
+        log_args = [cmd]
+        if self.log_cwd:
+            log_msgs += ['cwd=%r']
+            log_args += [cwd or self.cwd]
+        if self.log_stdin:
+            log_msgs += ['stdin=%r']
+            log_args += [stdin]
+        log_env = self.log_env
+        if log_env and popen_env:
+            log_msgs += ["env=%r"]
+            log_args.append(
+                popen_env if log_env is True
+                else {k: popen_env[k] for k in log_env if k in popen_env}
+            )
+        log_msg = '\n'.join(log_msgs)
+        self.log(log_msg, *log_args)
+
+    def _finish_run(self, cmd, cwd, out, status, log_outputs=True,
+                    expect_stderr=False, expect_fail=False):
+        """Decode and log outputs of a finished command, and check its status
+
+        Returns
+        -------
+        (stdout, stderr)
+
+        Raises
+        ------
+        CommandError
+          if the exit code wasn't 0 or None
+        """
+        if PY3:
+            # Decoding was delayed to this point
+            def decode_if_not_None(x):
+                return "" if x is None else binary_type.decode(x)
+            # TODO: check if we can avoid PY3 specific here
+            out = tuple(map(decode_if_not_None, out))
+
+        # needs to be done after we know status
+        if log_outputs:
+            self._log_out(out[0])
+            if status not in [0, None]:
+                self._log_err(out[1], expected=expect_fail)
+            else:
+                # as directed
+                self._log_err(out[1], expected=expect_stderr)
+
+        if status not in [0, None]:
+            msg = "Failed to run %r%s. Exit code=%d. out=%s err=%s" \
+                % (cmd, " under %r" % (cwd or self.cwd), status, out[0], out[1])
+            lgr.log(9 if expect_fail else 11, msg)
+            raise CommandError(str(cmd), msg, status, out[0], out[1])
+        else:
+            self.log("Finished running %r with status %s" % (cmd, status),
+                     level=8)
+        return out
+
     def call(self, f, *args, **kwargs):
         """Helper to unify collection of logging all "dry" actions.
 
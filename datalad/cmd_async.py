@@ -0,0 +1,23 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Runners executing commands concurrently with asyncio
+
+`AsyncRunner` and `AsyncGitRunner` are only available with Python 3.5+,
+and are None otherwise. They are implemented in `datalad._cmd_async`, which
+uses syntax older Pythons cannot even parse (its leading underscore also
+keeps nose from collecting it, e.g. for doctests).
+"""
+
+import sys
+
+if sys.version_info >= (3, 5):
+    from ._cmd_async import AsyncRunner
+    from ._cmd_async import AsyncGitRunner
+else:  # pragma: no cover
+    AsyncRunner = AsyncGitRunner = None
@@ -12,8 +12,12 @@
 import datalad
 from datalad.cmd import GitRunner
 from datalad.dochelpers import exc_str
+from datalad.support.statecache import load_state
+from datalad.support.statecache import save_state
+from datalad.support.statecache import clear_state
 from distutils.version import LooseVersion
 
+import logging
 import re
 import os
 from os.path import join as opj, exists
@@ -21,6 +25,8 @@ from os.path import getmtime
 from os.path import abspath
 from time import time
 
+lgr = logging.getLogger('datalad.config')
+
 cfg_kv_regex = re.compile(r'(^.*)\n(.*)$', flags=re.MULTILINE)
 cfg_section_regex = re.compile(r'(.*)\.[^.]+')
 cfg_sectionoption_regex = re.compile(r'(.*)\.([^.]+)')
@@ -88,6 +94,20 @@ def _parse_gitconfig_dump(dump, store, fileset, replace):
     return store, fileset
 
 
+def _global_cfgfnames():
+    """Locations of the user's git config files, whether they exist or not"""
+    home = os.path.expanduser('~')
+    xdg_home = os.environ.get('XDG_CONFIG_HOME', None) or opj(home, '.config')
+    return [opj(home, '.gitconfig'), opj(xdg_home, 'git', 'config')]
+
+
+def _get_gitconfig_env():
+    """Environment variables that affect which config files git reads"""
+    return {k: v for k, v in os.environ.items()
+            if k.startswith('GIT_CONFIG') or
+            k in ('HOME', 'XDG_CONFIG_HOME', 'GIT_DIR')}
+
+
 def _parse_env(store):
     dct = {}
     for k in os.environ:
@@ -181,8 +201,8 @@ class ConfigManager(object):
         else:
             self._dataset_path = dataset.path
             self._dataset_cfgfname = opj(self._dataset_path, '.datalad', 'config')
-            if not dataset_only:
-                self._repo_cfgfname = opj(self._dataset_path, '.git', 'config')
+            self._repo_cfgfname = None if dataset_only \
+                else opj(self._dataset_path, '.git', 'config')
         self._dataset_only = dataset_only
         # Since configs could contain sensitive information, to prevent
         # any "facilitated" leakage -- just disable logging of outputs for
@@ -193,16 +213,24 @@ class ConfigManager(object):
             # to pick up the right config files
             run_kwargs['cwd'] = dataset.path
         self._runner = GitRunner(**run_kwargs)
-        try:
-            self._gitconfig_has_showorgin = \
-                LooseVersion(get_git_version(self._runner)) >= '2.8.0'
-        except:
-            # no git something else broken, assume git is present anyway
-            # to not delay this, but assume it is old
-            self._gitconfig_has_showorgin = False
+        # determined on first use, a reload from the state cache does not
+        # need to know
+        self._has_showorigin = None
 
         self.reload(force=True)
 
+    @property
+    def _gitconfig_has_showorgin(self):
+        if self._has_showorigin is None:
+            try:
+                self._has_showorigin = \
+                    LooseVersion(get_git_version(self._runner)) >= '2.8.0'
+            except:
+                # no git something else broken, assume git is present anyway
+                # to not delay this, but assume it is old
+                self._has_showorigin = False
+        return self._has_showorigin
+
     def reload(self, force=False):
         """Reload all configuration items from the configured sources
 
@@ -228,6 +256,9 @@ class ConfigManager(object):
                 self._store = _parse_env(self._store)
                 return
 
+        if self._dataset_path and self._load_state_cache():
+            return
+
         self._store = {}
         # 2-step strategy:
         #   - load datalad dataset config from dataset
@@ -251,6 +282,8 @@ class ConfigManager(object):
                     stdout, self._store, self._cfgfiles, replace=False)
 
         if self._dataset_only:
+            if self._dataset_path:
+                self._save_state_cache()
             # superimpose overrides
             self._store.update(self.overrides)
             return
@@ -265,12 +298,87 @@ class ConfigManager(object):
             self._cfgfiles.add(self._repo_cfgfname)
         self._cfgmtimes = {c: getmtime(c) for c in self._cfgfiles if exists(c)}
 
+        if self._dataset_path:
+            self._save_state_cache()
+
         # superimpose overrides
         self._store.update(self.overrides)
 
         # override with environment variables
         self._store = _parse_env(self._store)
 
+    def _state_cache_enabled(self, store):
+        # overrides and environment take precedence, like for any other
+        # setting
+        store = dict(store, **self.overrides)
+        if not self._dataset_only:
+            store = _parse_env(store)
+        return anything2bool(store.get('datalad.repo.state-cache', False))
+
+    def _state_cache_name(self):
+        return 'config-dataset' if self._dataset_only else 'config'
+
+    def _state_cache_files(self):
+        # configuration files that would be read, if they existed
+        if self._dataset_only:
+            return {self._dataset_cfgfname}
+        return set(_global_cfgfnames()).union(
+            (self._dataset_cfgfname, self._repo_cfgfname))
+
+    def _load_state_cache(self):
+        """Load the config from the persistent state cache, if valid
+
+        Returns
+        -------
+        bool
+          Whether the config was loaded.
+        """
+        cached = load_state(
+            self._dataset_path,
+            self._state_cache_name(),
+            files=self._state_cache_files())
+        if cached is None or cached.get('env') != _get_gitconfig_env():
+            return False
+        # multi-value items come back as lists
+        store = {k: tuple(v) if isinstance(v, list) else v
+                 for k, v in cached['store'].items()}
+        if not self._state_cache_enabled(store):
+            # got disabled by an override or the environment
+            clear_state(self._dataset_path, self._state_cache_name())
+            return False
+        lgr.debug("Loaded config of %s from state cache", self._dataset_path)
+        self._store = store
+        self._cfgfiles = set(cached['cfgfiles'])
+        if self._dataset_only:
+            self._store.update(self.overrides)
+            return True
+        self._cfgmtimes = {c: getmtime(c) for c in self._cfgfiles if exists(c)}
+        self._store.update(self.overrides)
+        self._store = _parse_env(self._store)
+        return True
+
+    def _save_state_cache(self):
+        """Save the config read from files in the persistent state cache
+
+        Must be called before overrides and environment variables are
+        applied to the store. A possibly existing cache is removed, if the
+        cache is not enabled.
+        """
+        if not self._state_cache_enabled(self._store):
+            clear_state(self._dataset_path, self._state_cache_name())
+            return
+        if not self._gitconfig_has_showorgin:
+            # without knowing the origin of each setting, we cannot know
+            # which files to monitor
+            return
+        save_state(
+            self._dataset_path,
+            self._state_cache_name(),
+            self._state_cache_files().union(self._cfgfiles),
+            {'store': self._store,
+             'cfgfiles': sorted(self._cfgfiles),
+             'env': _get_gitconfig_env()})
+
     @_where_reload
     def obtain(self, var, default=None, dialog_type=None, valtype=None,
                store=False, where=None, reload=True, **kwargs):
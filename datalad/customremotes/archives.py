@@ -11,6 +11,7 @@
 __docformat__ = 'restructuredtext'
 
 import os
+import threading
 from os.path import join as opj
 from collections import OrderedDict
 from operator import itemgetter
@@ -48,6 +49,7 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
 
     AVAILABILITY = "local"
     COST = 500
+    ASYNC = True
 
     def __init__(self, persistent_cache=True, **kwargs):
         super(ArchiveAnnexCustomRemote, self).__init__(**kwargs)
@@ -57,6 +59,9 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
 
         self._last_url = None  # for heuristic to choose among multiple URLs
         self._cache = ArchivesCache(self.path, persistent=persistent_cache)
+        # locks to fetch each archive by a single job at a time, by archive
+        # key.  The lock around `annex get` works only across processes
+        self._fetch_locks = {}
 
     def stop(self, *args):
         """Stop communication with annex"""
@@ -271,7 +276,7 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
         # The same content could be available from multiple locations within the same
         # archive, so let's not ask it twice since here we don't care about "afile"
         for akey, _ in self._gen_akey_afiles(key, unique_akeys=True):
-            if self.get_contentlocation(akey) or self.repo.is_available(akey, batch=True, key=True):
+            if self.get_contentlocation(akey) or self._is_available(akey):
                 self.send("CHECKPRESENT-SUCCESS", key)
                 return
         self.send("CHECKPRESENT-UNKNOWN", key)
@@ -335,33 +340,7 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
                 continue
             akeys_tried.append(akey)
             try:
-                with lock_if_check_fails(
-                    check=(self.get_contentlocation, (akey,)),
-                    lock_path=(lambda k: opj(self.repo.path, '.git', 'datalad-archives-%s' % k), (akey,)),
-                    operation="annex-get"
-                ) as (akey_fpath, lock):
-                    if lock:
-                        assert not akey_fpath
-                        self._annex_get_archive_by_key(akey)
-                        akey_fpath = self.get_contentlocation(akey)
-
-                if not akey_fpath:
-                    raise RuntimeError(
-                        "We were reported to fetch it alright but now can't "
-                        "get its location.  Check logic"
-                )
-
-                akey_path = opj(self.repo.path, akey_fpath)
-                assert exists(akey_path), "Key file %s is not present" % akey_path
-
-                # Extract that bloody file from the bloody archive
-                # TODO: implement/use caching, for now a simple one
-                #  actually patool doesn't support extraction of a single file
-                #  https://github.com/wummel/patool/issues/20
-                # so
-                pwd = getpwd()
-                lgr.debug(u"Getting file {afile} from {akey_path} while PWD={pwd}".format(**locals()))
-                apath = self.cache[akey_path].get_extracted_file(afile)
+                apath = self._get_extracted_file(akey, afile)
                 link_file_load(apath, path)
                 self.send('TRANSFER-SUCCESS', cmd, key)
                 return
@@ -377,6 +356,42 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
             "Tried: {akeys_tried}".format(**locals())
         )
 
+    def _is_available(self, akey):
+        with self._annex_lock:
+            return self.repo.is_available(akey, batch=True, key=True)
+
+    def _get_extracted_file(self, akey, afile):
+        """Obtain the archive, if needed, and return path to extracted afile
+        """
+        with self._fetch_locks.setdefault(akey, threading.Lock()), \
+                lock_if_check_fails(
+                    check=(self.get_contentlocation, (akey,)),
+                    lock_path=(lambda k: opj(self.repo.path, '.git', 'datalad-archives-%s' % k), (akey,)),
+                    operation="annex-get"
+                ) as (akey_fpath, lock):
+            if lock:
+                assert not akey_fpath
+                self._annex_get_archive_by_key(akey)
+                akey_fpath = self.get_contentlocation(akey)
+
+        if not akey_fpath:
+            raise RuntimeError(
+                "We were reported to fetch it alright but now can't "
+                "get its location.  Check logic"
+        )
+
+        akey_path = opj(self.repo.path, akey_fpath)
+        assert exists(akey_path), "Key file %s is not present" % akey_path
+
+        # Extract that bloody file from the bloody archive
+        # TODO: implement/use caching, for now a simple one
+        #  actually patool doesn't support extraction of a single file
+        #  https://github.com/wummel/patool/issues/20
+        # so
+        pwd = getpwd()
+        lgr.debug(u"Getting file {afile} from {akey_path} while PWD={pwd}".format(**locals()))
+        return self.cache.get_extracted_file(akey_path, afile)
+
     def _annex_get_archive_by_key(self, akey):
         # TODO: make it more stringent?
         # Command could have fail to run if key was not present locally yet
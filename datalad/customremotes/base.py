@@ -16,10 +16,12 @@ import inspect
 import errno
 import os
 import sys
+import threading
 
 from ..support.path import exists, join as opj, realpath, dirname, lexists
 
 from six.moves import range
+from six.moves.queue import Queue
 from six.moves.urllib.parse import urlparse
 
 import logging
@@ -200,6 +202,11 @@ class AnnexCustomRemote(object):
     COST = DEFAULT_COST
     AVAILABILITY = DEFAULT_AVAILABILITY
 
+    # Whether requests can be handled concurrently, so git-annex could send
+    # them all to a single process (ASYNC protocol extension) instead of
+    # starting a process per job
+    ASYNC = False
+
     def __init__(self, path=None, cost=None, fin=None, fout=None):  # , availability=DEFAULT_AVAILABILITY):
         """
         Parameters
@@ -239,6 +246,17 @@ class AnnexCustomRemote(object):
 
         # To signal either we are in the loop and e.g. could correspond to annex
         self._in_the_loop = False
+        # whether ASYNC extension was negotiated with git-annex
+        self._async = False
+        # job id -> queue of messages from git-annex for the job
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._job_threads = []
+        # the job handled by the current thread
+        self._local = threading.local()
+        self._send_lock = threading.Lock()
+        # batched annex processes must not be used concurrently
+        self._annex_lock = threading.Lock()
         self._protocol = \
             AnnexExchangeProtocol(self.path, self.CUSTOM_REMOTE_NAME) \
             if os.environ.get('DATALAD_TESTS_PROTOCOLREMOTE') else None
@@ -291,15 +309,16 @@ class AnnexCustomRemote(object):
         of the result (we are asking the location for the same archive key often)
         """
         if key not in self._contentlocations:
-            fpath = self.repo.get_contentlocation(key, batch=True)
+            with self._annex_lock:
+                fpath = self.repo.get_contentlocation(key, batch=True)
             if fpath:  # shouldn't store empty ones
                 self._contentlocations[key] = fpath
         else:
             fpath = self._contentlocations[key]
             # but verify that it exists
             if verify_exists and not lexists(opj(self.path, fpath)):
-                # prune from cache
-                del self._contentlocations[key]
+                # prune from cache (unless another job did already)
+                self._contentlocations.pop(key, None)
                 fpath = ''
 
         if absolute and fpath:
@@ -323,10 +342,14 @@ class AnnexCustomRemote(object):
             lgr.debug("We are not yet in the loop, thus should not send to annex"
                       " anything.  Got: %s" % msg.encode())
             return
+        job = getattr(self._local, 'job', None)
+        if job is not None:
+            msg = "J %s %s" % (job[0], msg)
         try:
             self.heavydebug("Sending %r" % msg)
-            self.fout.write(msg + "\n")  # .encode())
-            self.fout.flush()
+            with self._send_lock:
+                self.fout.write(msg + "\n")  # .encode())
+                self.fout.flush()
             if self._protocol is not None:
                 self._protocol += "send %s" % msg
         except IOError as exc:
@@ -357,9 +380,14 @@ class AnnexCustomRemote(object):
         # TODO: should we strip or should we not? verify how annex would deal
         # with filenames starting/ending with spaces - encoded?
         # Split right away
-        l = self.fin.readline().rstrip(os.linesep)
-        if self._protocol is not None:
-            self._protocol += "recv %s" % l
+        job = getattr(self._local, 'job', None)
+        if job is not None:
+            # the main loop passes on the messages for this job
+            l = job[1].get()
+        else:
+            l = self.fin.readline().rstrip(os.linesep)
+            if self._protocol is not None:
+                self._protocol += "recv %s" % l
         msg = l.split(None, n)
         if req and ((not msg) or (req != msg[0])):
             # verify correct response was given
@@ -420,39 +448,101 @@ class AnnexCustomRemote(object):
 
         self.send("VERSION", SUPPORTED_PROTOCOL)
 
-        while True:
-            l = self.read(n=1)
+        try:
+            while True:
+                l = self.read(n=1)
 
-            if l is not None and not l:
-                # empty line: exit
-                self.stop()
-                return
+                if l is not None and not l:
+                    # empty line: exit
+                    self._finish_jobs()
+                    self.stop()
+                    return
 
-            req, req_load = l[0], l[1:]
-            method = getattr(self, "req_%s" % req, None)
-            if not method:
-                self.send_unsupported(
-                    "We have no support for %s request, part of %s response"
-                    % (req, l)
-                )
-                continue
+                if self._async and l and l[0] == 'J' and len(l) > 1:
+                    self._dispatch_job_message(l[1])
+                else:
+                    self._process_request(l)
+        finally:
+            self._finish_jobs()
+
+    def _process_request(self, l):
+        """Call the req_ method for a request split into [REQ, load]"""
+        req, req_load = l[0], l[1:]
+        method = getattr(self, "req_%s" % req, None)
+        if not method:
+            self.send_unsupported(
+                "We have no support for %s request, part of %s response"
+                % (req, l)
+            )
+            return
 
-            req_nargs = self._req_nargs[req]
-            if req_load and req_nargs > 1:
-                assert len(req_load) == 1, "Could be only one due to n=1"
-                # but now we need to slice it according to the respective req
-                # We assume that at least it shouldn't start with a space
-                # since str.split would get rid of it as well, and then we should
-                # have used re.split(" ", ...)
-                req_load = req_load[0].split(None, req_nargs - 1)
+        req_nargs = self._req_nargs[req]
+        if req_load and req_nargs > 1:
+            assert len(req_load) == 1, "Could be only one due to n=1"
+            # but now we need to slice it according to the respective req
+            # We assume that at least it shouldn't start with a space
+            # since str.split would get rid of it as well, and then we should
+            # have used re.split(" ", ...)
+            req_load = req_load[0].split(None, req_nargs - 1)
 
-            try:
-                method(*req_load)
-            except Exception as e:
-                self.error("Problem processing %r with parameters %r: %r"
-                           % (req, req_load, exc_str(e)))
-                from traceback import format_exc
-                lgr.error("Caught exception detail: %s" % format_exc())
+        try:
+            method(*req_load)
+        except AnnexRemoteQuit:
+            raise
+        except Exception as e:
+            self.error("Problem processing %r with parameters %r: %r"
+                       % (req, req_load, exc_str(e)))
+            from traceback import format_exc
+            lgr.error("Caught exception detail: %s" % format_exc())
+
+    def _dispatch_job_message(self, msg):
+        """Pass a "J <n> ..." message on to the job, or start a new one
+
+        A message for a job which is running is a reply to a request of the
+        job (e.g. VALUE to GETURLS). Otherwise, it is a new request, which
+        gets processed in a thread of its own.
+        """
+        job_id, msg = (msg.split(None, 1) + [''])[:2]
+        with self._jobs_lock:
+            queue = self._jobs.get(job_id)
+            if queue is not None:
+                queue.put(msg)
+                return
+            queue = self._jobs[job_id] = Queue()
+        thread = threading.Thread(
+            target=self._run_job, args=(job_id, queue, msg),
+            name="job-%s" % job_id)
+        thread.daemon = True
+        self._job_threads = [t for t in self._job_threads if t.is_alive()]
+        self._job_threads.append(thread)
+        thread.start()
+
+    def _run_job(self, job_id, queue, msg):
+        self._local.job = (job_id, queue)
+        try:
+            while msg:
+                self._process_request(msg.split(None, 1))
+                with self._jobs_lock:
+                    # git-annex might have sent the next request for this
+                    # job already, as soon as it got our reply
+                    if queue.empty():
+                        del self._jobs[job_id]
+                        return
+                msg = queue.get()
+        except AnnexRemoteQuit:
+            pass
+        # no more messages are to come
+        with self._jobs_lock:
+            self._jobs.pop(job_id, None)
+
+    def _finish_jobs(self):
+        """Wait for running jobs, after there will be no messages for them"""
+        with self._jobs_lock:
+            for queue in self._jobs.values():
+                queue.put('')
+        for thread in self._job_threads:
+            thread.join()
+        self._job_threads = []
 
     def req_INITREMOTE(self, *args):
         """Initialize this remote. Provides high level abstraction.
@@ -495,6 +585,18 @@ class AnnexCustomRemote(object):
     # def req_EXPORT(self, name):
     #   pass
 
+    def req_EXTENSIONS(self, *extensions):
+        """Reply with the protocol extensions we support among the announced
+        """
+        extensions = " ".join(extensions).split()
+        supported = []
+        if 'INFO' in extensions and self._annex_supports_info:
+            supported.append('INFO')
+        if 'ASYNC' in extensions and self.ASYNC:
+            supported.append('ASYNC')
+            self._async = True
+        self.send("EXTENSIONS", *supported)
+
     def req_GETCOST(self):
         self.send("COST", self.cost)
 
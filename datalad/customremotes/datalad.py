@@ -31,6 +31,8 @@ class DataladAnnexCustomRemote(AnnexCustomRemote):
     SUPPORTED_SCHEMES = ('http', 'https', 's3')
 
     AVAILABILITY = "global"
+    # downloads run concurrently, sharing connections of the providers
+    ASYNC = True
 
     def __init__(self, **kwargs):
         super(DataladAnnexCustomRemote, self).__init__(**kwargs)
@@ -41,6 +43,13 @@ class DataladAnnexCustomRemote(AnnexCustomRemote):
         self._last_url = None  # for heuristic to choose among multiple URLs
         self._providers = Providers.from_config_files()
 
+    def stop(self, msg=None):
+        stats = self._providers.get_connection_stats()
+        if stats['requests']:
+            lgr.debug("Sent %(requests)d requests over %(connections)d "
+                      "connections", stats)
+        super(DataladAnnexCustomRemote, self).stop(msg)
+
     #
     # Helper methods
 
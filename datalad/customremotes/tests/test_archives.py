@@ -216,6 +216,44 @@ def test_interactions(tdir):
         check_interaction_scenario(ArchiveAnnexCustomRemote, tdir, scenario)
 
 
+
+@with_tree(tree={'a.tar.gz': {'a.txt': 'a'}, 'b.tar.gz': {'b.txt': 'b'}})
+def test_fetch_archives_concurrently(tdir):
+    import threading
+    from multiprocessing.pool import ThreadPool
+    AnnexRepo(tdir, create=True, init=True)
+    remote = ArchiveAnnexCustomRemote(path=tdir, persistent_cache=False)
+    # archive "keys" are just their file names here
+    akeys = ['a.tar.gz', 'b.tar.gz']
+    fetching = []
+    all_fetching = threading.Event()
+    fetched = set()
+
+    def annex_get_archive_by_key(akey):
+        fetching.append(akey)
+        if len(fetching) == len(akeys):
+            all_fetching.set()
+        # would time out if archives were fetched one after another
+        assert_true(all_fetching.wait(10))
+        fetched.add(akey)
+
+    pool = ThreadPool(len(akeys))
+    try:
+        with patch.object(remote, '_annex_get_archive_by_key',
+                          annex_get_archive_by_key), \
+                patch.object(remote, 'get_contentlocation',
+                             lambda akey: akey if akey in fetched else None):
+            paths = pool.map(
+                lambda akey: remote._get_extracted_file(
+                    akey, opj(akey[0], akey[0] + '.txt')),
+                akeys)
+    finally:
+        pool.terminate()
+    ok_file_has_content(paths[0], 'a')
+    ok_file_has_content(paths[1], 'b')
+    remote.cache.clean()
+
+
 from datalad.tests.utils import serve_path_via_http
 @with_tree(tree=
     {'1.tar.gz':
@@ -10,8 +10,12 @@
 
 from datalad.tests.utils import known_failure_direct_mode
 
+import threading
+import time
 from os.path import isabs
 
+from six.moves.queue import Queue
+
 from datalad.tests.utils import with_tree
 from datalad.support.annexrepo import AnnexRepo
 
@@ -154,3 +158,75 @@ def test_interactions(tdir):
     ]:
         check_interaction_scenario(AnnexCustomRemote, tdir, scenario)
 
+
+
+class QueueFile(object):
+    """A line-based pipe between threads, dropping DEBUG messages"""
+    def __init__(self):
+        self.queue = Queue()
+
+    def write(self, l):
+        self.queue.put(l)
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        while True:
+            l = self.queue.get(timeout=10).rstrip('\n')
+            if not re.match('(J [0-9]+ )?DEBUG ', l):
+                return l
+
+
+class AsyncRemote(AnnexCustomRemote):
+    ASYNC = True
+    SUPPORTED_SCHEMES = ('http',)
+
+    def __init__(self, *args, **kwargs):
+        super(AsyncRemote, self).__init__(*args, **kwargs)
+        self.transferring = set()
+
+    def _transfer(self, cmd, key, path):
+        urls = self.get_URLS(key)
+        self.transferring.add(key)
+        # wait for the other transfer, which could only run concurrently
+        for i in range(100):
+            if len(self.transferring) > 1:
+                break
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("no concurrent transfer")
+        self.send('TRANSFER-SUCCESS', cmd, key, *urls)
+
+
+@with_tree(tree={'file.dat': ''})
+def test_async_interactions(tdir):
+    AnnexRepo(tdir, create=True, init=True)
+    fin, fout = QueueFile(), QueueFile()
+    cr = AsyncRemote(path=tdir, fin=fin, fout=fout)
+    thread = threading.Thread(target=cr.main)
+    thread.start()
+    try:
+        eq_(fout.readline(), 'VERSION 1')
+        fin.write('EXTENSIONS INFO ASYNC FANCY\n')
+        eq_(fout.readline(), 'EXTENSIONS INFO ASYNC')
+        for i in (1, 2):
+            fin.write('J %d TRANSFER RETRIEVE key%d file%d\n' % (i, i, i))
+        requests = set(fout.readline() for i in (1, 2))
+        eq_(requests, {'J 1 GETURLS key1 http:', 'J 2 GETURLS key2 http:'})
+        # replies to the jobs could come in any order
+        for i in (2, 1):
+            fin.write('J %d VALUE http://example.com/%d\n' % (i, i))
+            fin.write('J %d VALUE\n' % i)
+        replies = set(fout.readline() for i in (1, 2))
+        eq_(replies,
+            {'J %d TRANSFER-SUCCESS RETRIEVE key%d http://example.com/%d'
+             % (i, i, i) for i in (1, 2)})
+        # job numbers get reused, and requests without one are still served
+        fin.write('J 1 GETCOST\n')
+        eq_(fout.readline(), 'J 1 COST %d' % DEFAULT_COST)
+        fin.write('GETAVAILABILITY\n')
+        eq_(fout.readline(), 'AVAILABILITY %s' % DEFAULT_AVAILABILITY)
+    finally:
+        fin.write('\n')
+        thread.join()
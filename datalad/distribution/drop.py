@@ -94,7 +94,7 @@ def _drop_files(ds, paths, check, noannex_iserror=False, **kwargs):
 
     opts = ['--force'] if not check else []
     respath_by_status = {}
-    for res in ds.repo.drop(paths, options=opts):
+    for res in ds.repo.drop(paths, options=opts, stream=True):
         res = annexjson2result(
             # annex reports are always about files
             res, ds, type='file', **kwargs)
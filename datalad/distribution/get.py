@@ -133,6 +133,20 @@ def _get_flexible_source_candidates_for_submodule(ds, sm_path, sm_url=None):
 def _install_subds_from_flexible_source(
         ds, sm_path, sm_url, reckless, description=None):
     """Tries to obtain a given subdataset from several meaningful locations"""
+    subds = _clone_subds_from_flexible_source(
+        ds, sm_path, sm_url, reckless, description=description)
+    _register_cloned_subds(ds, sm_path, subds)
+    return subds
+
+
+def _clone_subds_from_flexible_source(
+        ds, sm_path, sm_url, reckless, description=None):
+    """Clone a subdataset from one of several meaningful locations
+
+    Only the clone itself is created, the superdataset `ds` is left untouched
+    (see _register_cloned_subds()). Hence this can run concurrently for
+    several subdatasets of the same superdataset.
+    """
     # TODO remove this assertion eventually, for now it assures intented
     # usage of this helper function
     assert(sm_path in ds.subdatasets(recursive=False, result_xfm='relpaths'))
@@ -183,6 +197,11 @@ def _install_subds_from_flexible_source(
                 clone_urls))
 
     assert(subds.is_installed())
+    return subds
+
+
+def _register_cloned_subds(ds, sm_path, subds):
+    """Make a freshly cloned subdataset known as an initialized submodule"""
     _fixup_submodule_dotgit_setup(ds, sm_path)
 
     # do fancy update
@@ -288,8 +307,111 @@ def _install_necessary_subdatasets(
         cur_subds = subds_trail[-1]
 
 
+def _clone_subds_worker(args):
+    """Worker for _recursive_install_subds_underneath_parallel()
+
+    Returns
+    -------
+    (str, None) or (None, str)
+      Path of the clone, or a description of the failure.
+    """
+    parent_path, sm_path, sm_url, reckless, description = args
+    try:
+        subds = _clone_subds_from_flexible_source(
+            Dataset(parent_path), sm_path, sm_url, reckless,
+            description=description)
+        return subds.path, None
+    except Exception as e:
+        return None, exc_str(e)
+
+
+def _recursive_install_subds_underneath_parallel(
+        ds, recursion_limit, reckless, start=None, refds_path=None,
+        description=None, jobs=2):
+    """Parallel variant of _recursive_install_subds_underneath()
+
+    Subdatasets are cloned by a pool of `jobs` processes. Everything that
+    modifies a superdataset happens in the calling process, once the clone of
+    a subdataset is complete, and only then are its own subdatasets
+    considered. Results are reported in the order clones were started.
+    """
+    from multiprocessing import Pool
+    from collections import deque
+
+    # datasets whose subdatasets need to be inspected
+    todo = deque([(ds, recursion_limit, start)])
+    # running clones
+    inflight = deque()
+    pool = Pool(processes=jobs)
+    try:
+        while todo or inflight:
+            while todo:
+                parent, limit, start = todo.popleft()
+                if isinstance(limit, int) and limit <= 0:
+                    continue
+                sublimit = limit - 1 if isinstance(limit, int) else limit
+                for sub in parent.subdatasets(
+                        return_type='generator', result_renderer='disabled'):
+                    if sub.get('gitmodule_datalad-recursiveinstall', '') == 'skip':
+                        lgr.debug(
+                            "subdataset %s is configured to be skipped on recursive installation",
+                            sub['path'])
+                        continue
+                    if start is not None and not path_is_subpath(sub['path'], start):
+                        # this one we can ignore, not underneath the start path
+                        continue
+                    if sub.get('state', None) != 'absent':
+                        # dataset was already found to exist
+                        subds = Dataset(sub['path'])
+                        yield get_status_dict(
+                            'install', ds=subds, status='notneeded', logger=lgr,
+                            refds=refds_path)
+                        todo.append((subds, sublimit, None))
+                        continue
+                    sm_path = relpath(sub['path'], start=parent.path)
+                    inflight.append((
+                        pool.apply_async(
+                            _clone_subds_worker,
+                            [(parent.path, sm_path, sub['gitmodule_url'],
+                              reckless, description)]),
+                        parent, sm_path, sublimit))
+            if not inflight:
+                break
+            job, parent, sm_path, sublimit = inflight.popleft()
+            subpath, error = job.get()
+            if subpath is not None:
+                subds = Dataset(subpath)
+                try:
+                    _register_cloned_subds(parent, sm_path, subds)
+                except Exception as e:
+                    error = exc_str(e)
+            if error is not None:
+                # skip all of downstairs, if we didn't manage to install subdataset
+                yield get_status_dict(
+                    'install', path=opj(parent.path, sm_path), type='dataset',
+                    status='error', logger=lgr, refds=refds_path,
+                    message=("Installation of subdatasets %s failed with exception: %s",
+                             opj(parent.path, sm_path), error))
+                continue
+            yield get_status_dict(
+                'install', ds=subds, status='ok', logger=lgr, refds=refds_path,
+                message=("Installed subdataset %s", subds), parentds=parent.path)
+            todo.append((subds, sublimit, None))
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def _recursive_install_subds_underneath(ds, recursion_limit, reckless, start=None,
-                                        refds_path=None, description=None):
+                                        refds_path=None, description=None,
+                                        jobs=None):
+    if isinstance(jobs, int) and jobs > 1:
+        for res in _recursive_install_subds_underneath_parallel(
+                ds, recursion_limit, reckless, start=start,
+                refds_path=refds_path, description=description, jobs=jobs):
+            yield res
+        return
     if isinstance(recursion_limit, int) and recursion_limit <= 0:
         return
     # install using helper that give some flexibility regarding where to
@@ -352,7 +474,9 @@ class Get(Interface):
     across potential subdatasets, i.e. if a directory is provided, all files in
     the directory are obtained. Recursion into subdatasets is supported too. If
     enabled, relevant subdatasets are detected and installed in order to
-    fulfill a request.
+    fulfill a request. When a number of parallel jobs is given, subdatasets
+    discovered by recursion are cloned in parallel too (a dataset is still
+    always installed before its subdatasets).
 
     Known data locations for each requested file are evaluated and data are
     obtained from some available location (according to git-annex configuration
@@ -561,7 +685,8 @@ class Get(Interface):
                         reckless,
                         start=ap['path'],
                         refds_path=refds_path,
-                        description=description):
+                        description=description,
+                        jobs=jobs):
                     # yield immediately so errors could be acted upon
                     # outside, before we continue
                     if not (res['type'] == 'dataset' and res['path'] in yielded_ds):
@@ -619,7 +744,8 @@ class Get(Interface):
             for res in ds.repo.get(
                     content,
                     options=['--from=%s' % source] if source else [],
-                    jobs=jobs):
+                    jobs=jobs,
+                    stream=True):
                 res = annexjson2result(res, ds, type='file', logger=lgr,
                                        refds=refds_path)
                 success = success_status_map[res['status']]
@@ -12,12 +12,20 @@
 
 import logging
 import re
+import sys
+import threading
 from collections import OrderedDict
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from os.path import dirname
 from os.path import join as opj
 
+from six import reraise
+from six.moves import queue
 from git.remote import PushInfo as PI
 
 from datalad import ssh_manager
+from datalad.cmd_async import AsyncGitRunner
 from datalad.interface.annotate_paths import AnnotatePaths
 from datalad.interface.annotate_paths import annotated2content_by_ds
 from datalad.interface.base import Interface
@@ -33,6 +41,7 @@ from datalad.support.constraints import EnsureChoice
 from datalad.support.constraints import EnsureNone
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.sshconnector import sh_quote
+from datalad.support.exceptions import CommandError
 from datalad.support.exceptions import InsufficientArgumentsError
 from datalad.support.network import URL, RI, SSHRI, is_ssh
 
@@ -80,8 +89,70 @@ def _push(ds, remote, things2push, force=False):
         return 'ok', ('pushed to %s: %s', remote, successes)
 
 
-def has_diff(ds, refspec, remote, paths):
-    """Return bool if a dataset was modified wrt to a given remote state"""
+def _get_refs(ds):
+    """Return hexsha of HEAD and all refs of a dataset, by full ref name
+
+    All of it comes from a single `git show-ref` call, which is much cheaper
+    than querying each branch of interest on its own.
+    """
+    try:
+        out, _ = ds.repo._git_custom_command(
+            '', ['git', 'show-ref', '--head'], expect_fail=True)
+    except CommandError:
+        # there are no refs (yet)
+        return {}
+    return _parse_refs(out)
+
+
+def _parse_refs(out):
+    return dict(reversed(line.split(' ', 1)) for line in out.splitlines())
+
+
+def _get_refs_parallel(datasets, jobs=None):
+    """Run `_get_refs` for multiple datasets at the same time
+
+    The git calls are run from an asyncio event loop where possible (Python
+    3.5+, called from the main thread), and in a pool of threads otherwise.
+
+    Returns
+    -------
+    dict
+      Refs of each dataset, by dataset path
+    """
+    jobs = jobs or cpu_count()
+    if AsyncGitRunner is None \
+            or threading.current_thread() is not threading.main_thread():
+        pool = ThreadPool(jobs)
+        try:
+            return dict(zip(
+                [ds.path for ds in datasets],
+                pool.map(_get_refs, datasets)))
+        finally:
+            pool.terminate()
+
+    outs = AsyncGitRunner().run_many(
+        [['git', '-C', ds.path, 'show-ref', '--head'] for ds in datasets],
+        jobs=jobs,
+        return_exceptions=True,
+        expect_fail=True)
+    refs = {}
+    for ds, out in zip(datasets, outs):
+        if isinstance(out, CommandError):
+            # there are no refs (yet)
+            refs[ds.path] = {}
+        elif isinstance(out, Exception):
+            raise out
+        else:
+            refs[ds.path] = _parse_refs(out[0])
+    return refs
+
+
+def has_diff(ds, refspec, remote, paths, refs=None):
+    """Return bool if a dataset was modified wrt to a given remote state
+
+    If `refs` (as returned by `_get_refs`) are given, they are used instead
+    of querying the repository for the state of its branches.
+    """
     if refspec:
         remote_branch_name = refspec[11:] \
             if refspec.startswith('refs/heads/') \
@@ -91,7 +162,8 @@ def has_diff(ds, refspec, remote, paths):
         remote_branch_name = ds.repo.get_active_branch()
 
     remote_ref = '/'.join((remote, remote_branch_name))
-    if remote_ref not in ds.repo.get_remote_branches():
+    if (remote_ref not in ds.repo.get_remote_branches() if refs is None
+            else 'refs/remotes/' + remote_ref not in refs):
         lgr.debug("Remote '%s' has no branch matching %r. Will publish",
                   remote, remote_branch_name)
         # we don't have any remote state, need to push for sure
@@ -99,9 +171,14 @@ def has_diff(ds, refspec, remote, paths):
 
     lgr.debug("Testing for changes with respect to '%s' of remote '%s'",
               remote_branch_name, remote)
-    current_commit = ds.repo.get_hexsha()
+    if refs is None:
+        current_commit = ds.repo.get_hexsha()
+        remote_commit = ds.repo.get_hexsha(remote_ref)
+    else:
+        current_commit = refs.get('HEAD', None)
+        remote_commit = refs['refs/remotes/' + remote_ref]
     within_ds_paths = [p for p in paths if p['path'] != ds.path]
-    commit_differ = current_commit != ds.repo.get_hexsha(remote_ref)
+    commit_differ = current_commit != remote_commit
     # yoh: not sure what "logic" was intended here for comparing only
     # some files.  By now we get a list of files, if any were changed,
     # from the commit on remote, and somehow diff says below that they didn't differ...
@@ -204,7 +281,8 @@ def _publish_data(ds, remote, paths, annex_copy_options, force, transfer_data, *
                    # easily happen with --since
                    if not p == opj(ds.path, '.gitmodules')],
             remote=remote,
-            options=annex_copy_options_):
+            options=annex_copy_options_,
+            stream=True):
         ncopied += 1
         # TODO RF to have copy_to() yield JSON and convert that one
         # at present only the "good" results come out
@@ -263,7 +341,7 @@ def _check_and_update_remote_server_info(ds, remote):
 
 
 def _publish_dataset(ds, remote, refspec, paths, annex_copy_options, force=False, jobs=None,
-                     transfer_data='auto', **kwargs):
+                     transfer_data='auto', refs=None, **kwargs):
     # TODO: this setup is now quite ugly. The only way `refspec` can come
     # in, is when there is a tracking branch, and we get its state via
     # `refspec`
@@ -277,10 +355,12 @@ def _publish_dataset(ds, remote, refspec, paths, annex_copy_options, force=False
     # remote might be set to be ignored by annex, or we might not even know yet its uuid
     # make sure we are up-to-date on this topic on all affected remotes, before
     # we start making decisions
+    fetched = False
     for r in publish_depends + [remote]:
         if not ds.config.get('.'.join(('remote', remote, 'annex-uuid')), None):
             lgr.debug("Obtain remote annex info from '%s'", r)
             ds.repo.fetch(remote=r)
+            fetched = True
             # in order to be able to use git's config to determine what to push,
             # we need to annex merge first. Otherwise a git push might be
             # rejected if involving all matching branches for example.
@@ -289,7 +369,10 @@ def _publish_dataset(ds, remote, refspec, paths, annex_copy_options, force=False
             # somewhere and replace the repo class...
             if isinstance(ds.repo, AnnexRepo):
                 ds.repo.merge_annex(r)
-    ds.config.reload()
+    if fetched:
+        ds.config.reload()
+        # refs obtained upfront are outdated now
+        refs = None
 
     # anything that follows will not change the repo type anymore, cache
     is_annex_repo = isinstance(ds.repo, AnnexRepo)
@@ -310,17 +393,21 @@ def _publish_dataset(ds, remote, refspec, paths, annex_copy_options, force=False
     # dizzy in the forehead....
 
     # if forced -- we push regardless if there are differences or not
-    diff = True if force else has_diff(ds, refspec, remote, paths)
+    diff = True if force else has_diff(ds, refspec, remote, paths, refs=refs)
 
     # We might have got new information in git-annex branch although no other
     # changes
     if not diff and is_annex_repo:
-        try:
-            git_annex_commit = next(ds.repo.get_branch_commits('git-annex'))
-        except StopIteration:
-            git_annex_commit = None
+        if refs is None:
+            try:
+                git_annex_commit = next(ds.repo.get_branch_commits('git-annex'))
+            except StopIteration:
+                git_annex_commit = None
+        else:
+            git_annex_commit = refs.get('refs/heads/git-annex', None)
         #diff = _get_remote_diff(ds, [], git_annex_commit, remote, 'git-annex')
-        diff = _get_remote_diff(ds, git_annex_commit, remote, 'git-annex')
+        diff = _get_remote_diff(
+            ds, git_annex_commit, remote, 'git-annex', refs=refs)
         if diff:
             lgr.info("Will publish updated git-annex")
 
@@ -460,6 +547,146 @@ def _publish_dataset(ds, remote, refspec, paths, annex_copy_options, force=False
         yield get_status_dict(ds=ds, status=status, message=msg, **kwargs)
 
 
+def _open_ssh_connections(publish_kwargs):
+    """Open SSH connections to all sibling hosts of the datasets to publish
+
+    Done once upfront, so that all the `git push`es (via `datalad sshrun`)
+    running in parallel then reuse the same control masters instead of
+    racing each other to start their own.
+
+    Returns
+    -------
+    dict
+      Error message for every dataset (path) for which a connection could
+      not be opened
+    """
+    connections = {}
+    ds_connections = {}
+    errors = {}
+    for ds_path, kwargs in publish_kwargs.items():
+        ds, remote = kwargs['ds'], kwargs['remote']
+        depvar = 'remote.{}.datalad-publish-depends'.format(remote)
+        ds_connections[ds_path] = ctrl_paths = []
+        try:
+            for r in assure_list(ds.config.get(depvar, [])) + [remote]:
+                for var in ('url', 'pushurl', 'annexurl'):
+                    url = ds.config.get('remote.{}.{}'.format(r, var), None)
+                    if not url:
+                        continue
+                    ri = RI(url)
+                    if is_ssh(ri):
+                        c = ssh_manager.get_connection(ri)
+                        connections[c.ctrl_path] = c
+                        ctrl_paths.append(c.ctrl_path)
+        except Exception as e:
+            errors[ds_path] = exc_str(e)
+    failed = {}
+    for ctrl_path, c in connections.items():
+        try:
+            c.open()
+        except Exception as e:
+            failed[ctrl_path] = exc_str(e)
+    for ds_path, ctrl_paths in ds_connections.items():
+        for ctrl_path in ctrl_paths:
+            if ctrl_path in failed and ds_path not in errors:
+                errors[ds_path] = failed[ctrl_path]
+    return errors
+
+
+def _publish_datasets_parallel(publish_kwargs, jobs, **kwargs):
+    """Publish multiple datasets at the same time
+
+    A dataset is only published once all of its subdatasets among
+    `publish_kwargs` were published, so that a superdataset never refers
+    to a state of a subdataset which is not yet available at the sibling.
+
+    Parameters
+    ----------
+    publish_kwargs : dict
+      Arguments for `_publish_dataset` for every dataset path
+    jobs : int
+      Number of datasets to publish in parallel. Data transfers of each
+      dataset are then not parallelized on top of that.
+    **kwargs
+      Passed to `_publish_dataset` to be included in results
+
+    Yields
+    ------
+    dict
+      Results of `_publish_dataset`, all results of a dataset at once, in
+      the order the publication of datasets completed
+    """
+    # closest superdataset among the ones to be published, and number of
+    # not yet published (direct) subdatasets for each dataset
+    superds = {}
+    pending = dict((ds_path, 0) for ds_path in publish_kwargs)
+    for ds_path in publish_kwargs:
+        parent = dirname(ds_path)
+        while parent not in pending and parent != dirname(parent):
+            parent = dirname(parent)
+        if parent in pending:
+            superds[ds_path] = parent
+            pending[parent] += 1
+
+    ssh_errors = _open_ssh_connections(publish_kwargs)
+
+    completed = queue.Queue()
+    # set when no more publications should be started
+    stopped = threading.Event()
+
+    def publish(ds_path):
+        if stopped.is_set():
+            return
+        try:
+            res = list(_publish_dataset(
+                # otherwise up to jobs * jobs transfers at once
+                **dict(publish_kwargs[ds_path], jobs=None, **kwargs)))
+            completed.put((ds_path, res, None))
+        except Exception:
+            completed.put((ds_path, None, sys.exc_info()))
+
+    def schedule(ds_path):
+        if ds_path in ssh_errors:
+            completed.put((ds_path, [get_status_dict(
+                ds=publish_kwargs[ds_path]['ds'], status='error',
+                message=("Cannot connect to sibling: %s",
+                         ssh_errors[ds_path]),
+                **kwargs)], None))
+        else:
+            pool.apply_async(publish, (ds_path,))
+
+    from datalad.ui import ui
+    pbar = ui.get_progressbar(
+        label="Publishing", total=len(publish_kwargs), unit=' Datasets')
+    pool = ThreadPool(jobs)
+    try:
+        for ds_path in publish_kwargs:
+            if not pending[ds_path]:
+                schedule(ds_path)
+        for i in range(len(publish_kwargs)):
+            ds_path, res, exc_info = completed.get()
+            if exc_info:
+                try:
+                    reraise(*exc_info)
+                finally:
+                    exc_info = None
+            pbar.update(1, increment=True)
+            parent = superds.get(ds_path, None)
+            if parent:
+                pending[parent] -= 1
+                if not pending[parent]:
+                    schedule(parent)
+            for r in res:
+                yield r
+    finally:
+        pbar.finish()
+        # do not leave publications running behind our back, e.g. after
+        # one failed, but do not start any new ones either
+        stopped.set()
+        pool.close()
+        pool.join()
+
+
 def _get_remote_info(ds_path, ds_remote_info, to, missing):
     """Returns None if desired info was obtained, or a tuple (status, message)
     if not"""
@@ -528,9 +755,22 @@ def _get_remote_info(ds_path, ds_remote_info, to, missing):
 
 
 
-def _get_remote_diff(ds, current_commit, remote, remote_branch_name):
+def _get_remote_diff(ds, current_commit, remote, remote_branch_name, refs=None):
 #def _get_remote_diff(ds, paths, current_commit, remote, remote_branch_name):
-    """Helper to check if remote has different state of the branch"""
+    """Helper to check if remote has different state of the branch
+
+    If `refs` (as returned by `_get_refs`) are given, they are used instead
+    of querying the repository, and `current_commit` is a hexsha.
+    """
+    if refs is not None:
+        remote_ref = 'refs/remotes/{}/{}'.format(remote, remote_branch_name)
+        if remote_ref not in refs:
+            lgr.debug("Remote '%s' has no branch matching %r. Will publish",
+                      remote, remote_branch_name)
+            return True
+        if current_commit is None:
+            current_commit = refs.get('HEAD', None)
+        return current_commit != refs[remote_ref]
     if remote_branch_name in ds.repo.repo.remotes[remote].refs:
         lgr.debug("Testing for changes with respect to '%s' of remote '%s'",
                   remote_branch_name, remote)
@@ -581,6 +821,10 @@ class Publish(Interface):
     Only publication of saved changes is supported. Any unsaved changes in a
     dataset (hierarchy) have to be saved before publication.
 
+    If more than one job is requested, multiple datasets of a hierarchy are
+    published in parallel, with subdatasets always published before their
+    superdatasets.
+
     .. note::
       Power-user info: This command uses :command:`git push`, and :command:`git annex copy`
       to publish a dataset. Publication targets are either configured remote
@@ -783,6 +1027,7 @@ class Publish(Interface):
         )
 
         lgr.debug("Attempt to publish %i datasets", len(content_by_ds))
+        publish_kwargs = OrderedDict()
         for ds_path in content_by_ds:
             remote_info = ds_remote_info.get(ds_path, None)
             if remote_info is None:
@@ -804,22 +1049,40 @@ class Publish(Interface):
                 remote_info = ds_remote_info[ds_path]
                 # condition above must catch all other cases
                 assert remote_info
-            # and publish
-            ds = Dataset(ds_path)
-            for r in _publish_dataset(
-                    ds,
-                    remote=remote_info['remote'],
-                    refspec=remote_info.get('refspec', None),
-                    # only send paths that were explicitly requested
-                    paths=[p for p in content_by_ds[ds_path]
-                           # do not feed (sub)dataset paths into the beast
-                           # makes no sense to try to annex copy them
-                           # for the base dataset itself let `transfer_data`
-                           # decide
-                           if p.get('type', None) != 'dataset'],
-                    annex_copy_options=annex_copy_opts,
-                    force=force,
-                    jobs=jobs,
-                    transfer_data=transfer_data,
-                    **res_kwargs):
-                yield r
+            publish_kwargs[ds_path] = dict(
+                ds=Dataset(ds_path),
+                remote=remote_info['remote'],
+                refspec=remote_info.get('refspec', None),
+                # only send paths that were explicitly requested
+                paths=[p for p in content_by_ds[ds_path]
+                       # do not feed (sub)dataset paths into the beast
+                       # makes no sense to try to annex copy them
+                       # for the base dataset itself let `transfer_data`
+                       # decide
+                       if p.get('type', None) != 'dataset'],
+                annex_copy_options=annex_copy_opts,
+                force=force,
+                jobs=jobs,
+                transfer_data=transfer_data)
+
+        if not force:
+            # inspect the state of all datasets and their remote tracking
+            # branches upfront, instead of querying them piece by piece
+            # when deciding whether a dataset needs to be published
+            refs = _get_refs_parallel(
+                [kwargs['ds'] for kwargs in publish_kwargs.values()],
+                jobs=jobs if isinstance(jobs, int) else None)
+            for ds_path, kwargs in publish_kwargs.items():
+                kwargs['refs'] = refs[ds_path]
+
+        # and publish
+        if isinstance(jobs, int) and jobs > 1 and len(publish_kwargs) > 1:
+            results = _publish_datasets_parallel(
+                publish_kwargs, jobs, **res_kwargs)
+        else:
+            results = (
+                r
+                for kwargs in publish_kwargs.values()
+                for r in _publish_dataset(**dict(kwargs, **res_kwargs)))
+        for r in results:
+            yield r
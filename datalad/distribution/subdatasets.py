@@ -31,6 +31,8 @@ from datalad.support.constraints import EnsureNone
 from datalad.support.param import Parameter
 from datalad.support.gitrepo import InvalidGitRepositoryError
 from datalad.support.exceptions import CommandError
+from datalad.support.statecache import load_state
+from datalad.support.statecache import save_state
 from datalad.interface.common_opts import recursion_flag
 from datalad.interface.common_opts import recursion_limit
 from datalad.distribution.dataset import Dataset
@@ -77,13 +79,11 @@ def _parse_gitmodules(dspath):
     return mods
 
 
-def _parse_git_submodules(dspath):
-    """All known ones with some properties"""
-    if not exists(opj(dspath, ".gitmodules")):
-        # easy way out. if there is no .gitmodules file
-        # we cannot have (functional) subdatasets
-        return
+def _get_gitlinks(dspath):
+    """Return (revision, path) of all gitlinks in the index of a repository
 
+    Paths are POSIX paths relative to the repository root.
+    """
     # this will not work in direct mode, need better way #1422
     cmd = ['git', 'ls-files', '--stage', '-z']
 
@@ -103,13 +103,37 @@ def _parse_git_submodules(dspath):
     except CommandError as e:
         raise InvalidGitRepositoryError(exc_str(e))
 
+    gitlinks = []
     for line in stdout.split('\0'):
         if not line or not line.startswith('160000'):
             continue
-        sm = {}
         props = submodule_full_props.match(line)
-        sm['revision'] = props.group(2)
-        subpath = _path_(dspath, props.group(4))
+        gitlinks.append((props.group(2), props.group(4)))
+    return gitlinks
+
+
+def _parse_git_submodules(dspath):
+    """All known ones with some properties"""
+    if not exists(opj(dspath, ".gitmodules")):
+        # easy way out. if there is no .gitmodules file
+        # we cannot have (functional) subdatasets
+        return
+
+    gitlinks = None
+    use_cache = Dataset(dspath).config.obtain('datalad.repo.state-cache')
+    # the list of gitlinks can only change with the index
+    statefiles = [opj(dspath, '.gitmodules'), opj(dspath, '.git', 'index')]
+    if use_cache:
+        gitlinks = load_state(dspath, 'gitlinks', files=statefiles)
+    if gitlinks is None:
+        gitlinks = _get_gitlinks(dspath)
+        if use_cache:
+            save_state(dspath, 'gitlinks', statefiles, gitlinks)
+
+    for revision, path in gitlinks:
+        sm = {}
+        sm['revision'] = revision
+        subpath = _path_(dspath, path)
         sm['path'] = subpath
         if not exists(subpath) or not GitRepo.is_valid_repo(subpath):
             sm['state'] = 'absent'
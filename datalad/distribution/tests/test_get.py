@@ -15,6 +15,7 @@ from datalad.tests.utils import known_failure_direct_mode
 
 from os import curdir
 from os.path import join as opj, basename
+from os.path import relpath
 from glob import glob
 
 from datalad.api import create
@@ -511,3 +512,30 @@ def test_get_in_unavailable_subdataset(src, path):
     ok_(sub2.is_installed())
     ok_(sub2.repo.file_has_content('file_in_annex.txt') is True)
     ok_(not Dataset(opj(targetabspath, 'sub3')).is_installed())
+
+
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+def test_get_recurse_subdatasets_parallel(src, path):
+    origin = create(src)
+    for i in range(3):
+        sub = origin.create('sub{}'.format(i))
+        sub.create('subsub')
+        origin.add('sub{}'.format(i))
+    ok_clean_git(origin.path)
+
+    serial = install(opj(path, 'serial'), source=src)
+    res_serial = serial.get(curdir, recursive=True, get_data=False)
+    parallel = install(opj(path, 'parallel'), source=src)
+    res_parallel = parallel.get(curdir, recursive=True, get_data=False,
+                                jobs=3)
+    assert_result_count(res_parallel, 6, type='dataset', status='ok')
+    eq_(sorted(relpath(r['path'], parallel.path) for r in res_parallel),
+        sorted(relpath(r['path'], serial.path) for r in res_serial))
+    # parents were installed (and reported) before their subdatasets
+    paths = [r['path'] for r in res_parallel]
+    for i in range(3):
+        subpath = opj(parallel.path, 'sub{}'.format(i))
+        ok_(paths.index(subpath) < paths.index(opj(subpath, 'subsub')))
+    eq_(parallel.subdatasets(recursive=True, fulfilled=False), [])
+    ok_clean_git(parallel.path)
@@ -15,6 +15,7 @@ from datalad.tests.utils import known_failure_direct_mode
 
 import logging
 import os
+import time
 from os.path import join as opj
 from os.path import exists
 from os.path import lexists
@@ -601,6 +602,112 @@ def test_gh1426(origin_path, target_path):
     eq_(origin.repo.get_hexsha(), target.get_hexsha())
 
 
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+@known_failure_direct_mode  #FIXME
+def test_publish_parallel(origin_path, target_path):
+    origin = create(origin_path)
+    sub1 = origin.create('sub1')
+    sub2 = sub1.create('sub2')
+    sub3 = origin.create('sub3')
+    origin.save(recursive=True)
+    ok_clean_git(origin.path)
+    dss = [origin, sub1, sub2, sub3]
+    targets = []
+    for i, ds in enumerate(dss):
+        target = AnnexRepo(opj(target_path, str(i)), create=True)
+        target.config.set(
+            'receive.denyCurrentBranch', 'updateInstead', where='local')
+        ds.siblings('add', name='target', url=target.path)
+        targets.append(target)
+
+    res = origin.publish(to='target', recursive=True, jobs=2)
+    assert_status('ok', res)
+    assert_result_count(res, 4, type='dataset')
+    # subdatasets are published before their superdatasets
+    published = [r['path'] for r in res]
+    ok_(published.index(sub2.path) < published.index(sub1.path)
+        < published.index(origin.path))
+    ok_(published.index(sub3.path) < published.index(origin.path))
+    for ds, target in zip(dss, targets):
+        eq_(ds.repo.get_hexsha(), target.get_hexsha())
+
+    # nothing left to publish
+    res = origin.publish(to='target', recursive=True, jobs=2)
+    assert_result_count(res, 4, status='notneeded', type='dataset')
+
+
+@with_tempfile(mkdir=True)
+def test_publish_datasets_parallel(path):
+    from mock import patch
+    from ..publish import _publish_datasets_parallel
+    top = Dataset(path)
+    fail, slow, other = [Dataset(opj(path, n)) for n in ('fail', 'slow', 'o')]
+    publish_kwargs = dict((ds.path, {'ds': ds, 'jobs': 2})
+                          for ds in (top, fail, slow, other))
+    started = []
+    finished = []
+
+    def publish_dataset(ds, jobs=None, **kwargs):
+        started.append(ds)
+        if ds is fail:
+            raise RuntimeError("failed")
+        if ds is slow:
+            time.sleep(1)
+        finished.append(ds)
+        yield dict(path=ds.path, status='ok', jobs=jobs)
+
+    with patch('datalad.distribution.publish._publish_dataset',
+               publish_dataset):
+        # a dataset without connection to its sibling yields an error
+        with patch('datalad.distribution.publish._open_ssh_connections',
+                   return_value={other.path: 'no connection'}):
+            res = list(_publish_datasets_parallel(
+                dict((k, v) for k, v in publish_kwargs.items()
+                     if k != fail.path), 2, action='publish'))
+        assert_result_count(res, 1, status='error', path=other.path)
+        # the superdataset is still published
+        assert_result_count(res, 2, status='ok')
+        # no parallel transfers within the datasets on top
+        eq_(set(r.get('jobs') for r in res if r['status'] == 'ok'), {None})
+
+        del started[:]
+        del finished[:]
+        with patch('datalad.distribution.publish._open_ssh_connections',
+                   return_value={}):
+            with assert_raises(RuntimeError):
+                list(_publish_datasets_parallel(publish_kwargs, 2))
+        # publications that were already running are waited for, but
+        # nothing new is started
+        ok_(slow in finished)
+        ok_(top not in started)
+
+
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+@known_failure_direct_mode  #FIXME
+def test_get_refs(origin_path, target_path):
+    from ..publish import _get_refs
+    from ..publish import _get_refs_parallel
+    origin = create(origin_path)
+    target = AnnexRepo(target_path, create=True)
+    target.config.set(
+        'receive.denyCurrentBranch', 'updateInstead', where='local')
+    origin.siblings('add', name='target', url=target_path)
+    refs = _get_refs(origin)
+    eq_(refs['HEAD'], origin.repo.get_hexsha())
+    eq_(refs['refs/heads/master'], origin.repo.get_hexsha())
+    eq_(refs['refs/heads/git-annex'], origin.repo.get_hexsha('git-annex'))
+    assert_not_in('refs/remotes/target/master', refs)
+    origin.publish(to='target')
+    refs = _get_refs_parallel([origin, Dataset(target_path)])
+    eq_(refs[origin.path]['refs/remotes/target/master'],
+        origin.repo.get_hexsha())
+    eq_(refs[target_path]['HEAD'], origin.repo.get_hexsha())
+    # no refs in a repository without commits
+    eq_(_get_refs(Dataset(GitRepo(opj(origin_path, 'empty')).path)), {})
+
+
 @skip_if_on_windows  # create_sibling incompatible with win servers
 @skip_ssh
 @with_testrepos('submodule_annex', flavors=['local'])  #TODO: Use all repos after fixing them
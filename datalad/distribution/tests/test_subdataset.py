@@ -10,14 +10,19 @@
 from datalad.tests.utils import known_failure_direct_mode
 
 import os
+from os.path import exists
 from os.path import join as opj
 from os.path import relpath
 from os.path import pardir
+from time import time
+
+from mock import patch
 
 from ..dataset import Dataset
 from datalad.api import subdatasets
 
 from nose.tools import eq_
+from nose.tools import ok_
 from datalad.tests.utils import with_testrepos
 from datalad.tests.utils import with_tempfile
 from datalad.tests.utils import assert_result_count
@@ -202,3 +207,29 @@ def test_get_subdatasets_types(path):
     ds.create('true')
     # no types casting should happen
     eq_(ds.subdatasets(result_xfm='relpaths'), ['1', 'true'])
+
+
+@with_tempfile
+def test_state_cache(path):
+    ds = Dataset.create(path)
+    sub = ds.create('sub')
+    ds.config.set('datalad.repo.state-cache', 'yes', where='local')
+
+    def _age_statefiles():
+        # freshly modified files are never cached
+        for fname in ('.gitmodules', opj('.git', 'index')):
+            os.utime(opj(path, fname), (time() - 10, time() - 10))
+
+    _age_statefiles()
+    eq_(ds.subdatasets(result_xfm='relpaths'), ['sub'])
+    ok_(exists(opj(path, '.git', 'datalad', 'cache', 'gitlinks.json')))
+    with patch('datalad.distribution.subdatasets._get_gitlinks',
+               side_effect=AssertionError('must not call git')):
+        eq_(ds.subdatasets(result_xfm='relpaths'), ['sub'])
+        # the state is still determined from the work tree
+        ds.uninstall('sub')
+        assert_result_count(
+            ds.subdatasets(), 1, path=sub.path, state='absent')
+    # any change of the index invalidates the cache
+    ds.create('sub2')
+    eq_(ds.subdatasets(result_xfm='relpaths'), ['sub', 'sub2'])
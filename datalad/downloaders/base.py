@@ -15,6 +15,7 @@ __docformat__ = 'restructuredtext'
 import msgpack
 import os
 import sys
+import threading
 import time
 
 from abc import ABCMeta, abstractmethod
@@ -45,6 +46,9 @@ class DownloaderSession(object):
     .download method
     """
 
+    # whether .resume and .download_segments can be used
+    supports_ranges = False
+
     def __init__(self, size=None, filename=None, url=None, headers=None):
         self.size = size
         self.filename = filename
@@ -56,6 +60,24 @@ class DownloaderSession(object):
 
         # TODO: get_status ?
 
+    def resume(self, f, pbar=None, offset=0):
+        """Download the content past the first `offset` bytes into `f`
+
+        `f` is expected to contain the first `offset` bytes already. If the
+        content can only be obtained from its beginning, `f` must be
+        truncated and populated from scratch.
+        """
+        raise NotImplementedError("must be implemented in subclases")
+
+    def download_segments(self, f, pbar=None, segments=2):
+        """Download the content into `f` as `segments` concurrent byte ranges
+        """
+        raise NotImplementedError("must be implemented in subclases")
+
+    def close(self):
+        """Release resources if the content is not going to be downloaded"""
+        pass
+
 
 @auto_repr
 @add_metaclass(ABCMeta)
@@ -64,6 +86,8 @@ class BaseDownloader(object):
 
     _DEFAULT_AUTHENTICATOR = None
     _DOWNLOAD_SIZE_TO_VERIFY_AUTH = 10000
+    # do not split downloads into segments smaller than that
+    _DOWNLOAD_SEGMENT_MIN_SIZE = 4 * 1024 ** 2
 
     def __init__(self, credential=None, authenticator=None):
         """
@@ -96,6 +120,9 @@ class BaseDownloader(object):
         self.credential = credential
         self.authenticator = authenticator
         self._cache = None  # for fetches, not downloads
+        # downloads could run in multiple threads, but must establish
+        # a session only once
+        self._session_lock = threading.Lock()
 
     def access(self, method, url, allow_old_session=True, **kwargs):
         """Generic decorator to manage access to the URL via some method
@@ -130,7 +157,9 @@ class BaseDownloader(object):
             try:
                 used_old_session = False
                 access_denied = False
-                used_old_session = self._establish_session(url, allow_old=allow_old_session)
+                with self._session_lock:
+                    used_old_session = self._establish_session(
+                        url, allow_old=allow_old_session)
                 if not allow_old_session:
                     assert(not used_old_session)
                 lgr.log(5, "Calling out into %s for %s" % (method, url))
@@ -211,6 +240,17 @@ class BaseDownloader(object):
         # TODO: might better reside somewhere under .datalad/tmp or .git/datalad/tmp
         return filepath + ".datalad-download-temp"
 
+    def get_connection_stats(self):
+        """Return numbers of connections opened and requests sent so far
+
+        Returns
+        -------
+        dict or None
+          with 'connections' and 'requests' counts, or None if the downloader
+          does not keep track of them
+        """
+        return None
+
     @abstractmethod
     def get_downloader_session(self, url):
         """
@@ -299,25 +339,49 @@ class BaseDownloader(object):
 
         existed = exists(filepath)
         if existed and not overwrite:
+            downloader_session.close()
             raise DownloadError("File %s already exists" % filepath)
 
         # FETCH CONTENT
         # TODO: pbar = ui.get_progressbar(size=response.headers['size'])
+        # An interrupted download could be resumed later on, if the content
+        # can be requested in ranges, and we can tell whether it changed
+        resumable = downloader_session.supports_ranges \
+            and size is None and target_size and status.mtime
+        offset = 0
+        segments = 1
+        partial = False
         try:
             temp_filepath = self._get_temp_download_filename(filepath)
             if exists(temp_filepath):
-                # eventually we might want to continue the download
-                lgr.warning(
-                    "Temporary file %s from the previous download was found. "
-                    "It will be overriden" % temp_filepath)
-                # TODO.  also logic below would clean it up atm
-
-            with open(temp_filepath, 'wb') as fp:
+                temp_stat = os.stat(temp_filepath)
+                if resumable and 0 < temp_stat.st_size < target_size \
+                        and temp_stat.st_mtime == status.mtime:
+                    offset = temp_stat.st_size
+                else:
+                    lgr.warning(
+                        "Temporary file %s from the previous download was "
+                        "found. It will be overriden" % temp_filepath)
+            if resumable and not offset:
+                segments = min(
+                    cfg.obtain('datalad.download.segments'),
+                    target_size // self._DOWNLOAD_SEGMENT_MIN_SIZE)
+                # a download with holes cannot be resumed
+                resumable = segments <= 1
+
+            with open(temp_filepath, 'ab' if offset else 'wb') as fp:
                 # TODO: url might be a bit too long for the beast.
                 # Consider to improve to make it animated as well, or shorten here
                 pbar = ui.get_progressbar(label=url, fill_text=filepath, total=target_size)
                 t0 = time.time()
-                downloader_session.download(fp, pbar, size=size)
+                if offset:
+                    lgr.info("Resuming download of %s at byte %d", url, offset)
+                    downloader_session.resume(fp, pbar, offset)
+                elif segments > 1:
+                    lgr.debug("Downloading %s in %d segments", url, segments)
+                    downloader_session.download_segments(fp, pbar, segments)
+                else:
+                    downloader_session.download(fp, pbar, size=size)
                 downloaded_time = time.time() - t0
                 pbar.finish()
             downloaded_size = os.stat(temp_filepath).st_size
@@ -339,7 +403,10 @@ class BaseDownloader(object):
                 stats.overwritten += int(existed)
                 stats.downloaded_size += downloaded_size
                 stats.downloaded_time += downloaded_time
-        except (AccessDeniedError, IncompleteDownloadError) as e:
+        except IncompleteDownloadError:
+            partial = resumable
+            raise
+        except AccessDeniedError:
             raise
         except Exception as e:
             e_str = exc_str(e, limit=5)
@@ -349,9 +416,15 @@ class BaseDownloader(object):
             raise DownloadError(exc_str(e))  # for now
         finally:
             if exists(temp_filepath):
-                # clean up
-                lgr.debug("Removing a temporary download %s", temp_filepath)
-                os.unlink(temp_filepath)
+                if partial:
+                    # mark it with the mtime of the content it is a part of,
+                    # so we know whether it could be completed later on
+                    lgr.debug("Keeping a partial download %s", temp_filepath)
+                    os.utime(temp_filepath, (time.time(), status.mtime))
+                else:
+                    # clean up
+                    lgr.debug("Removing a temporary download %s", temp_filepath)
+                    os.unlink(temp_filepath)
 
         return filepath
 
@@ -375,7 +448,15 @@ class BaseDownloader(object):
         # but then it might require sending request anyways for Content-Disposition
         # so probably nah
         lgr.info("Downloading %r into %r", url, path)
-        return self.access(self._download, url, path=path, **kwargs)
+        stats = kwargs.get('stats')
+        connections = self.get_connection_stats() if stats else None
+        try:
+            return self.access(self._download, url, path=path, **kwargs)
+        finally:
+            if connections:
+                stats.connections += \
+                    self.get_connection_stats()['connections'] \
+                    - connections['connections']
 
     @property
     def cache(self):
@@ -439,6 +520,7 @@ class BaseDownloader(object):
         if size is not None:
             if size == 0:
                 # no download of the content was requested -- just return headers and be done
+                downloader_session.close()
                 return None, downloader_session.headers
             target_size = min(size, target_size)
 
@@ -556,7 +638,9 @@ class BaseDownloader(object):
         return self.access(self._get_target_url, url)
 
     def _get_target_url(self, url):
-        return self.get_downloader_session(url).url
+        downloader_session = self.get_downloader_session(url)
+        downloader_session.close()
+        return downloader_session.url
 
 
 # Exceptions.  might migrate elsewhere
@@ -12,14 +12,20 @@
 import re
 import requests
 import requests.auth
+from requests.adapters import HTTPAdapter
 # at some point was trying to be too specific about which exceptions to
 # catch for a retry of a download.
 # from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 import io
+import threading
+from multiprocessing.pool import ThreadPool
 from six import BytesIO
+from six.moves import zip
 from time import sleep
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 
+from .. import cfg
 from ..utils import assure_list_from_str, assure_dict_from_str
 from ..dochelpers import borrowkwargs
 
@@ -35,6 +41,7 @@ from ..support.status import FileStatus
 from .base import Authenticator
 from .base import BaseDownloader, DownloaderSession
 from .base import DownloadError, AccessDeniedError, AccessFailedError, UnhandledRedirectError
+from .base import IncompleteDownloadError
 
 from logging import getLogger
 from ..log import LoggerHelper
@@ -314,31 +321,45 @@ class HTTPBearerTokenAuthenticator(HTTPRequestsAuthenticator):
         return DummyResponse()
 
 
+def _get_range_start(response):
+    """Return the first byte position of a 206 response, or None"""
+    content_range = response.headers.get('Content-Range', '')
+    match = re.match(r'bytes\s+(\d+)-', content_range)
+    return int(match.group(1)) if match else None
+
+
 @auto_repr
 class HTTPDownloaderSession(DownloaderSession):
+    # read up to that many bytes of an unneeded response to keep its
+    # connection alive
+    _DRAIN_SIZE = 64 * 1024
+
     def __init__(self, size=None, filename=None,  url=None, headers=None,
-                 response=None, chunk_size=1024 ** 2):
+                 response=None, chunk_size=1024 ** 2, session=None):
         super(HTTPDownloaderSession, self).__init__(
             size=size, filename=filename, url=url, headers=headers,
         )
         self.chunk_size = chunk_size
         self.response = response
-
-    def download(self, f=None, pbar=None, size=None):
-        response = self.response
-        # content_gzipped = 'gzip' in response.headers.get('content-encoding', '').split(',')
-        # if content_gzipped:
-        #     raise NotImplemented("We do not support (yet) gzipped content")
-        #     # see https://rationalpie.wordpress.com/2010/06/02/python-streaming-gzip-decompression/
-        #     # for ways to implement in python 2 and 3.2's gzip is working better with streams
-
-        total = 0
-        return_content = f is None
-        if f is None:
-            # no file to download to
-            # TODO: actually strange since it should have been decoded then...
-            f = BytesIO()
-
+        self.session = session
+
+    @property
+    def supports_ranges(self):
+        headers = self.headers or {}
+        # ranges of encoded content would not match the bytes we store
+        return self.session is not None \
+            and not self.url.startswith('ftp://') \
+            and headers.get('Accept-Ranges', '').strip().lower() == 'bytes' \
+            and not headers.get('Content-Encoding', '').strip()
+
+    def _iter_chunks(self, response, size=None):
+        """Yield chunks of the response's content, up to `size` bytes
+
+        Raises
+        ------
+        IncompleteDownloadError
+          if the connection breaks, so the download could be tried again
+        """
         # must use .raw to be able avoiding decoding/decompression while downloading
         # to a file
         chunk_size_ = min(self.chunk_size, size) if size is not None else self.chunk_size
@@ -364,31 +385,157 @@ class HTTPDownloaderSession(DownloaderSession):
             decode_content = not response.url.startswith('ftp://')
             stream = response.raw.stream(chunk_size_, decode_content=decode_content)
 
-        for chunk in stream:
-            if chunk:  # filter out keep-alive new chunks
-                chunk_len = len(chunk)
-                if size is not None and total + chunk_len > size:
-                    # trim the download to match target size
-                    chunk = chunk[:size - total]
-                    chunk_len = len(chunk)
-                total += chunk_len
-                f.write(chunk)
-                try:
-                    # TODO: pbar is not robust ATM against > 100% performance ;)
-                    if pbar:
-                        pbar.update(total)
-                except Exception as e:
-                    lgr.warning("Failed to update progressbar: %s" % exc_str(e))
-                # TEMP
-                # see https://github.com/niltonvolpato/python-progressbar/pull/44
-                ui.out.flush()
-                if size is not None and total >= size:
-                    break  # we have done as much as we were asked
+        total = 0
+        try:
+            for chunk in stream:
+                if chunk:  # filter out keep-alive new chunks
+                    if size is not None and total + len(chunk) > size:
+                        # trim the download to match target size
+                        chunk = chunk[:size - total]
+                    total += len(chunk)
+                    yield chunk
+                    if size is not None and total >= size:
+                        break  # we have done as much as we were asked
+        except (Urllib3HTTPError, requests.exceptions.RequestException) as exc:
+            raise IncompleteDownloadError(
+                "Connection broke after %d bytes of %s: %s"
+                % (total, response.url, exc_str(exc)))
+        finally:
+            response.close()
+
+    def _write_stream(self, response, f, pbar=None, size=None, offset=0):
+        total = offset
+        for chunk in self._iter_chunks(response, size=size):
+            total += len(chunk)
+            f.write(chunk)
+            try:
+                # TODO: pbar is not robust ATM against > 100% performance ;)
+                if pbar:
+                    pbar.update(total)
+            except Exception as e:
+                lgr.warning("Failed to update progressbar: %s" % exc_str(e))
+            # TEMP
+            # see https://github.com/niltonvolpato/python-progressbar/pull/44
+            ui.out.flush()
+
+    def _get_range(self, session, start, end=None):
+        """Request bytes `start` to `end` (inclusive) of the content
+
+        The request is conditional on the content to be unchanged, i.e.
+        the whole (changed) content is returned otherwise.
+        """
+        headers = {
+            'Accept-Encoding': '',
+            'Range': 'bytes=%d-%s' % (start, '' if end is None else end)}
+        last_modified = self.headers.get('Last-Modified')
+        if last_modified:
+            headers['If-Range'] = last_modified
+        response = session.get(self.url, stream=True, headers=headers)
+        if response.status_code != 206:
+            check_response_status(response, session=session)
+        elif _get_range_start(response) != start:
+            response.close()
+            raise AccessFailedError(
+                "Requested range starting at %d of %s but got %r"
+                % (start, self.url, response.headers.get('Content-Range')))
+        return response
+
+    def download(self, f=None, pbar=None, size=None):
+        response = self.response
+        # content_gzipped = 'gzip' in response.headers.get('content-encoding', '').split(',')
+        # if content_gzipped:
+        #     raise NotImplemented("We do not support (yet) gzipped content")
+        #     # see https://rationalpie.wordpress.com/2010/06/02/python-streaming-gzip-decompression/
+        #     # for ways to implement in python 2 and 3.2's gzip is working better with streams
+
+        return_content = f is None
+        if f is None:
+            # no file to download to
+            # TODO: actually strange since it should have been decoded then...
+            f = BytesIO()
+
+        self._write_stream(response, f, pbar, size=size)
 
         if return_content:
             out = f.getvalue()
             return out
 
+    def close(self):
+        """Release the connection of the response
+
+        A connection can only be returned to the pool (and reused) after its
+        response was read completely. So a small remainder of the content gets
+        read, while the connection is dropped otherwise.
+        """
+        response = self.response
+        if response is None:
+            return
+        raw = response.raw
+        remaining = getattr(raw, 'length_remaining', None)
+        if remaining is not None and remaining <= self._DRAIN_SIZE \
+                and not raw.closed:
+            try:
+                raw.read(decode_content=False)
+            except Exception as exc:
+                lgr.debug("Failed to read the remainder of %s: %s",
+                          self.url, exc_str(exc))
+        response.close()
+
+    def resume(self, f, pbar=None, offset=0):
+        # we will not need the content from the beginning
+        self.close()
+        response = self._get_range(self.session, offset)
+        if response.status_code == 206:
+            self._write_stream(response, f, pbar, offset=offset)
+        else:
+            lgr.debug(
+                "Content of %s has changed, downloading from the beginning",
+                self.url)
+            f.seek(0)
+            f.truncate()
+            self._write_stream(response, f, pbar)
+
+    def download_segments(self, f, pbar=None, segments=2):
+        self.close()
+        bounds = [self.size * i // segments for i in range(segments + 1)]
+        lock = threading.Lock()
+        progress = [0]
+
+        def _download_segment(start_end):
+            start, end = start_end
+            # each request takes a connection of its own from the pool
+            response = self._get_range(self.session, start, end - 1)
+            if response.status_code != 206:
+                response.close()
+                raise IncompleteDownloadError(
+                    "Content of %s has changed while downloading it"
+                    % self.url)
+            pos = start
+            for chunk in self._iter_chunks(response, size=end - start):
+                with lock:
+                    f.seek(pos)
+                    f.write(chunk)
+                    progress[0] += len(chunk)
+                    try:
+                        if pbar:
+                            pbar.update(progress[0])
+                    except Exception as e:
+                        lgr.warning(
+                            "Failed to update progressbar: %s" % exc_str(e))
+                pos += len(chunk)
+            if pos != end:
+                # the file would be of full size, but with a hole
+                raise IncompleteDownloadError(
+                    "Got only %d out of %d bytes of a segment of %s"
+                    % (pos - start, end - start, self.url))
+
+        pool = ThreadPool(segments)
+        try:
+            pool.map(_download_segment, list(zip(bounds[:-1], bounds[1:])))
+        finally:
+            pool.close()
+            pool.join()
+
 
 @auto_repr
 class HTTPDownloader(BaseDownloader):
@@ -400,6 +547,43 @@ class HTTPDownloader(BaseDownloader):
         super(HTTPDownloader, self).__init__(**kwargs)
         self._session = None
         self._headers = headers
+        # counts of the sessions we have let go already
+        self._connection_stats = {'connections': 0, 'requests': 0}
+
+    def _new_session(self):
+        """Replace the session with a fresh one
+
+        Connections to a host are kept alive in a pool of the session, so they
+        are reused across downloads and fetches of this downloader.
+        """
+        if self._session is not None:
+            for k, v in self.get_connection_stats().items():
+                self._connection_stats[k] = v
+            self._session.close()
+        session = requests.Session()
+        adapter_kwargs = dict(
+            pool_maxsize=cfg.obtain('datalad.download.pool-size'))
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, HTTPAdapter(**adapter_kwargs))
+        self._session = session
+        return session
+
+    def get_connection_stats(self):
+        stats = self._connection_stats.copy()
+        if self._session is None:
+            return stats
+        for adapter in set(self._session.adapters.values()):
+            pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+            if pools is None:
+                continue
+            # statistics of pools which were evicted already are lost
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['connections'] += pool.num_connections
+                stats['requests'] += pool.num_requests
+        return stats
 
     def _establish_session(self, url, allow_old=True):
         """
@@ -422,7 +606,7 @@ class HTTPDownloader(BaseDownloader):
             elif url in cookies_db:
                 cookie_dict = cookies_db[url]
                 lgr.debug("http session: Creating new with old cookies %s", list(cookie_dict.keys()))
-                self._session = requests.Session()
+                self._new_session()
                 # not sure what happens if cookie is expired (need check to that or exception will prolly get thrown)
 
                 # TODO dict_to_cookiejar doesn't preserve all fields when reversed
@@ -433,7 +617,7 @@ class HTTPDownloader(BaseDownloader):
                 return True
 
         lgr.debug("http session: Creating brand new session")
-        self._session = requests.Session()
+        self._new_session()
         if self.authenticator:
             self.authenticator.authenticate(url, self.credential, self._session)
 
@@ -486,7 +670,8 @@ class HTTPDownloader(BaseDownloader):
             url=response.url,
             filename=url_filename,
             headers=headers,
-            response=response
+            response=response,
+            session=self._session,
         )
 
     @classmethod
@@ -14,6 +14,7 @@ from logging import getLogger
 from six import iteritems
 
 import re
+import threading
 from os.path import dirname, abspath, join as pathjoin
 from six.moves.urllib.parse import urlparse
 from collections import OrderedDict
@@ -99,6 +100,7 @@ class Provider(object):
         self.credential = credential
         self.authenticator = authenticator
         self._downloader = downloader
+        self._lock = threading.Lock()
 
     @property
     def downloader(self):
@@ -134,18 +136,19 @@ class Provider(object):
         If one is known -- verifies its appropriateness for the given url.
         ATM we do not support multiple types of downloaders per single provider
         """
-        if self._downloader is None:
-            # we need to create a new one
-            Downloader = self._get_downloader_class(url)
-            # we might need to provide it with credentials and authenticator
-            # Let's do via kwargs so we could accomodate cases when downloader does not necessarily
-            # cares about those... duck typing or what it is in action
-            kwargs = kwargs.copy()
-            if self.credential:
-                kwargs['credential'] = self.credential
-            if self.authenticator:
-                kwargs['authenticator'] = self.authenticator
-            self._downloader = Downloader(**kwargs)
+        with self._lock:
+            if self._downloader is None:
+                # we need to create a new one
+                Downloader = self._get_downloader_class(url)
+                # we might need to provide it with credentials and authenticator
+                # Let's do via kwargs so we could accomodate cases when downloader does not necessarily
+                # cares about those... duck typing or what it is in action
+                kwargs = kwargs.copy()
+                if self.credential:
+                    kwargs['credential'] = self.credential
+                if self.authenticator:
+                    kwargs['authenticator'] = self.authenticator
+                self._downloader = Downloader(**kwargs)
         return self._downloader
 
 
@@ -168,6 +171,7 @@ class Providers(object):
         # a set of providers to handle connections without authentication.
         # Will be setup one per each protocol schema
         self._default_providers = {}
+        self._lock = threading.Lock()
 
     def __repr__(self):
         return "%s(%s)" % (self.__class__.__name__, "" if not self._providers else repr(self._providers))
@@ -329,10 +333,11 @@ class Providers(object):
         # None matched -- so we should get a default one per each of used
         # protocols
         scheme = Provider.get_scheme_from_url(url)
-        if scheme not in self._default_providers:
-            lgr.debug("Initializing default provider for %s" % scheme)
-            self._default_providers[scheme] = Provider(name="", url_res=["%s://.*" % scheme])
-        provider = self._default_providers[scheme]
+        with self._lock:
+            if scheme not in self._default_providers:
+                lgr.debug("Initializing default provider for %s" % scheme)
+                self._default_providers[scheme] = Provider(name="", url_res=["%s://.*" % scheme])
+            provider = self._default_providers[scheme]
         lgr.debug("No dedicated provider, returning default one for %s: %s",
                   scheme, provider)
         return provider
@@ -348,6 +353,20 @@ class Providers(object):
     def get_status(self, url, *args, **kwargs):
         return self.get_provider(url).get_downloader(url).get_status(url, *args, **kwargs)
 
+    def get_connection_stats(self):
+        """Return numbers of connections opened and requests sent so far
+
+        Totals across the downloaders of all providers, which keep track
+        of them.
+        """
+        stats = {'connections': 0, 'requests': 0}
+        for provider in self._providers + list(self._default_providers.values()):
+            downloader_stats = provider.downloader.get_connection_stats() \
+                if provider.downloader else None
+            for k, v in (downloader_stats or {}).items():
+                stats[k] += v
+        return stats
+
     def needs_authentication(self, url):
         provider = self.get_provider(url, only_nondefault=True)
         if provider is None:
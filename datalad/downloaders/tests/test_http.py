@@ -8,9 +8,15 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Tests for http downloader"""
 
+import re
+import threading
 import time
 from calendar import timegm
+from contextlib import contextmanager
 from six import PY3
+from six.moves.BaseHTTPServer import BaseHTTPRequestHandler
+from six.moves.BaseHTTPServer import HTTPServer
+from six.moves.socketserver import ThreadingMixIn
 
 import os
 import six.moves.builtins as __builtin__
@@ -54,6 +60,7 @@ from ...tests.utils import assert_greater
 from ...tests.utils import assert_false
 from ...tests.utils import assert_raises
 from ...tests.utils import ok_file_has_content
+from ...tests.utils import patch_config
 from ...tests.utils import serve_path_via_http, with_tree
 from ...tests.utils import swallow_logs
 from ...tests.utils import swallow_outputs
@@ -61,6 +68,7 @@ from ...tests.utils import with_tempfile
 from ...tests.utils import use_cassette
 from ...tests.utils import skip_if
 from ...tests.utils import without_http_proxy
+from ...support.stats import ActivityStats
 from ...support.status import FileStatus
 from ...support.network import get_url_disposition_filename
 
@@ -150,6 +158,158 @@ def test_HTTPDownloader_basic(toppath, topurl):
     # TODO: access denied detection
 
 
+class RangeHTTPRequestHandler(BaseHTTPRequestHandler):
+    """Serves server.content, supporting (conditional) range requests
+
+    If server.break_after is set, the connection of the next response with a
+    status in server.break_on is dropped after this many bytes of content. If server.modified is set,
+    conditional range requests are answered as if the content had changed.
+    """
+    # keep connections alive
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requested_ranges.append(self.headers.get('Range'))
+        content = server.content
+        last_modified = self.date_time_string(server.mtime)
+        start, end = 0, len(content) - 1
+        range_ = self.headers.get('Range')
+        if range_ and not server.modified \
+                and self.headers.get('If-Range', last_modified) == last_modified:
+            start, end_ = re.match(r'bytes=(\d+)-(\d*)$', range_).groups()
+            start = int(start)
+            end = int(end_) if end_ else end
+            status = 206
+            self.send_response(status)
+            self.send_header(
+                'Content-Range', 'bytes %d-%d/%d' % (start, end, len(content)))
+        else:
+            status = 200
+            self.send_response(status)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        content = content[start:end + 1]
+        if server.break_after is not None and status in server.break_on:
+            content = content[:server.break_after]
+            server.break_after = None
+            self.close_connection = True
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RangeHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@contextmanager
+def serve_with_ranges(content):
+    server = RangeHTTPServer(('127.0.0.1', 0), RangeHTTPRequestHandler)
+    server.content = content
+    server.mtime = 1500000000
+    server.break_after = None
+    server.break_on = (200, 206)
+    server.modified = False
+    server.requested_ranges = []
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield server, 'http://127.0.0.1:%d/file.dat' % server.server_port
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@with_tempfile(mkdir=True)
+def test_HTTPDownloader_resume(path):
+    content = ''.join('%04d' % i for i in range(2500))
+    fpath = opj(path, 'file.dat')
+    tpath = BaseDownloader._get_temp_download_filename(fpath)
+    downloader = HTTPDownloader()
+    with serve_with_ranges(content.encode()) as (server, url):
+        # connection breaks, the next attempt continues where it stopped
+        server.break_after = 3000
+        with swallow_logs():
+            downloader.download(url, fpath)
+        ok_file_has_content(fpath, content)
+        assert_equal(server.requested_ranges[-1], 'bytes=3000-')
+        assert_false(os.path.exists(tpath))
+        assert_equal(os.stat(fpath).st_mtime, server.mtime)
+
+        # a left over partial download of the same content gets completed
+        with open(tpath, 'wb') as f:
+            f.write(content[:5000].encode())
+        os.utime(tpath, (time.time(), server.mtime))
+        downloader.download(url, fpath, overwrite=True)
+        ok_file_has_content(fpath, content)
+        assert_equal(server.requested_ranges[-1], 'bytes=5000-')
+
+        # but not if it might be of different content
+        with open(tpath, 'wb') as f:
+            f.write(b'x' * 5000)
+        with swallow_logs():
+            downloader.download(url, fpath, overwrite=True)
+        ok_file_has_content(fpath, content)
+        assert_equal(server.requested_ranges[-1], None)
+
+        # or the content has changed meanwhile
+        with open(tpath, 'wb') as f:
+            f.write(b'x' * 5000)
+        os.utime(tpath, (time.time(), server.mtime))
+        server.modified = True
+        downloader.download(url, fpath, overwrite=True)
+        ok_file_has_content(fpath, content)
+        assert_equal(server.requested_ranges[-1], 'bytes=5000-')
+
+
+@with_tempfile(mkdir=True)
+def test_HTTPDownloader_connection_reuse(path):
+    content = ''.join('%04d' % i for i in range(2500))
+    fpath = opj(path, 'file.dat')
+    downloader = HTTPDownloader()
+    stats = ActivityStats()
+    with serve_with_ranges(content.encode()) as (server, url):
+        for i in range(3):
+            downloader.download(url, fpath, overwrite=True, stats=stats)
+            ok_file_has_content(fpath, content)
+            assert_equal(downloader.fetch(url), content)
+            assert(downloader.get_status(url).size)
+    assert_equal(
+        downloader.get_connection_stats(), {'connections': 1, 'requests': 9})
+    assert_equal(stats.connections, 1)
+    assert_equal(stats.downloaded, 3)
+
+
+@with_tempfile(mkdir=True)
+def test_HTTPDownloader_segments(path):
+    content = ''.join('%04d' % i for i in range(2500))
+    fpath = opj(path, 'file.dat')
+    downloader = HTTPDownloader()
+    with serve_with_ranges(content.encode()) as (server, url), \
+            patch.object(BaseDownloader, '_DOWNLOAD_SEGMENT_MIN_SIZE', 3000), \
+            patch_config({'datalad.download.segments': 4}):
+        downloader.download(url, fpath)
+        ok_file_has_content(fpath, content)
+        # limited by the minimal segment size
+        assert_equal(
+            sorted(server.requested_ranges[1:]),
+            ['bytes=0-3332', 'bytes=3333-6665', 'bytes=6666-9999'])
+
+        # a broken segment fails the download, to be tried again
+        server.break_after = 1000
+        server.break_on = (206,)
+        del server.requested_ranges[:]
+        with swallow_logs():
+            downloader.download(url, fpath, overwrite=True)
+        ok_file_has_content(fpath, content)
+        assert_equal(len(server.requested_ranges), 8)
+
+
 @with_tempfile(mkdir=True)
 def check_download_external_url(url, failed_str, success_str, d, url_final=None):
     fpath = opj(d, get_url_straight_filename(url))
@@ -18,6 +18,8 @@ import re
 import os
 import shlex
 import tempfile
+import time
+from collections import OrderedDict
 
 from os.path import join as opj, realpath, curdir, exists, lexists, relpath, basename
 from os.path import commonprefix
@@ -30,11 +32,13 @@ from os.path import normpath
 from .base import Interface
 from datalad.interface.base import build_doc
 from .common_opts import allow_dirty
+from .common_opts import jobs_opt
 from ..consts import ARCHIVES_SPECIAL_REMOTE
 from ..support.param import Parameter
 from ..support.constraints import EnsureStr, EnsureNone
 
 from ..support.annexrepo import AnnexRepo
+from ..support.exceptions import AnnexBatchCommandError
 from ..support.strings import apply_replacement_rules
 from ..support.stats import ActivityStats
 from ..cmdline.helpers import get_repo_instance
@@ -54,6 +58,9 @@ lgr = logging.getLogger('datalad.interfaces.add_archive_content')
 _KEY_OPT = "[PY: `key=True` PY][CMD: --key CMD]"
 _KEY_OPT_NOTE = "Note that it will be of no effect if %s is given" % _KEY_OPT
 
+# how many files to collect before passing them on to annex addurl
+ADDURL_CHUNK_SIZE = 1000
+
 # TODO: may be we could enable separate logging or add a flag to enable
 # all but by default to print only the one associated with this given action
 
@@ -174,6 +181,7 @@ class AddArchiveContent(Interface):
              be used to "index" files within annex without actually creating corresponding
              files under git.  Note that `annex dropunused` would later remove that load"""),
 
+        jobs=jobs_opt,
         # TODO: interaction with archives cache whenever we make it persistent across runs
         archive=Parameter(
             doc="archive file or a key (if %s specified)" % _KEY_OPT,
@@ -198,7 +206,7 @@ class AddArchiveContent(Interface):
                  use_current_dir=False,
                  delete=False, key=False, exclude=None, rename=None, existing='fail',
                  annex_options=None, copy=False, commit=True, allow_dirty=False,
-                 stats=None, drop_after=False, delete_after=False):
+                 stats=None, drop_after=False, delete_after=False, jobs=None):
         """
         Returns
         -------
@@ -329,6 +337,36 @@ class AddArchiveContent(Interface):
             outside_stats = stats
             stats = ActivityStats()
 
+            # urls of the files to be added, by their path within annex.
+            # They are fed to annex in chunks, so it could fetch and hash
+            # up to `jobs` files in parallel (if annex supports -J in batch
+            # mode)
+            pending = OrderedDict()
+
+            def add_pending():
+                for out_json in annex.add_urls_to_files(
+                        [(url, f) for f, url in pending.items()],
+                        options=annex_options, jobs=jobs):
+                    if not out_json.get('success', False):
+                        raise AnnexBatchCommandError(
+                            cmd="addurl",
+                            msg="Error, annex reported failure for addurl "
+                                "(file='%s'): %s"
+                                % (out_json.get('file'), str(out_json)))
+                    if out_json.get('key') is not None:
+                        # due to http://git-annex.branchable.com/bugs/annex_drop_is_not___34__in_effect__34___for_load_which_was___34__addurl_--batch__34__ed_but_not_yet_committed/?updated
+                        # we need to maintain a list of those to be dropped files
+                        if drop_after:
+                            annex.drop_key(out_json['key'], batch=True)
+                            stats.dropped += 1
+                        stats.add_annex += 1
+                    else:
+                        lgr.debug("File {} was added to git, not adding url"
+                                  .format(out_json.get('file')))
+                        stats.add_git += 1
+                pending.clear()
+
+            start = time.time()
             for extracted_file in earchive.get_extracted_files():
                 stats.files += 1
                 extracted_path = opj(earchive.path, extracted_file)
@@ -381,6 +419,11 @@ class AddArchiveContent(Interface):
 
                 target_file_path = opj(annex.path, target_file_path)
 
+                if relpath(target_file_path, annex.path) in pending:
+                    # another file from the archive is to be placed there.
+                    # Add it first, so the collision is handled as usual
+                    add_pending()
+
                 if lexists(target_file_path):
                     handle_existing = True
                     if md5sum(target_file_path) == md5sum(extracted_path):
@@ -448,21 +491,9 @@ class AddArchiveContent(Interface):
                 lgr.debug("Adding %s to annex pointing to %s and with options %r",
                           target_file_path, url, annex_options)
 
-                out_json = annex.add_url_to_file(
-                    target_file_path,
-                    url, options=annex_options,
-                    batch=True)
-
-                if 'key' in out_json and out_json['key'] is not None:  # annex.is_under_annex(target_file, batch=True):
-                    # due to http://git-annex.branchable.com/bugs/annex_drop_is_not___34__in_effect__34___for_load_which_was___34__addurl_--batch__34__ed_but_not_yet_committed/?updated
-                    # we need to maintain a list of those to be dropped files
-                    if drop_after:
-                        annex.drop_key(out_json['key'], batch=True)
-                        stats.dropped += 1
-                    stats.add_annex += 1
-                else:
-                    lgr.debug("File {} was added to git, not adding url".format(target_file_path))
-                    stats.add_git += 1
+                pending[relpath(target_file_path, annex.path)] = url
+                if len(pending) >= ADDURL_CHUNK_SIZE:
+                    add_pending()
 
                 if delete_after:
                     # delayed removal so it doesn't interfer with batched processes since any pure
@@ -484,6 +515,12 @@ class AddArchiveContent(Interface):
 
                 del target_file  # Done with target_file -- just to have clear end of the loop
 
+            add_pending()
+            duration = time.time() - start
+            lgr.info("Added %d files from %s in %.1f seconds (%.1f/s)",
+                     stats.files, archive, duration,
+                     stats.files / duration if duration else float(stats.files))
+
             if delete and archive and origin != 'key':
                 lgr.debug("Removing the original archive {}".format(archive))
                 # force=True since some times might still be staged and fail
@@ -12,8 +12,10 @@ __docformat__ = 'restructuredtext'
 
 from os.path import join as opj
 from glob import glob
+from humanize import naturalsize
 from .base import Interface
 from ..utils import rmtree
+from ..utils import get_path_size
 from ..support.param import Parameter
 from ..consts import ARCHIVES_TEMP_DIR
 from ..consts import ANNEX_TEMP_DIR
@@ -111,8 +113,10 @@ class Clean(Interface):
                         path=topdir, status='notneeded', type='directory', **res_kwargs)
                     continue
                 pl = len(paths) > 1
-                message = ("Removed %d %s %s: %s",
+                size = get_path_size(topdir)
+                message = ("Removed %d %s %s (%s): %s",
                            len(paths), msg, sing_pl[int(pl)],
+                           naturalsize(size),
                            ", ".join(sorted([x[len(topdir) + 1:] for x in paths])))
                 rmtree(topdir)
                 yield get_status_dict(
@@ -23,6 +23,13 @@ dirs = AppDirs("datalad", "datalad.org")
 
 
 definitions = {
+    'datalad.archives.cache-size': {
+        'ui': ('question', {
+               'title': 'Size limit of the cache of extracted archives',
+               'text': 'Size in bytes. Whenever the cache grows beyond it, least recently used archives are removed from it. 0 for no limit'}),
+        'default': 0,
+        'type': EnsureInt(),
+    },
     # this is actually used in downloaders, but kept cfg name original
     'datalad.crawl.cache': {
         'ui': ('yesno', {
@@ -31,6 +38,20 @@ definitions = {
         'destination': 'local',
         'type': bool,
     },
+    'datalad.download.pool-size': {
+        'ui': ('question', {
+               'title': 'Number of connections kept alive per host',
+               'text': 'Connections to a web server are kept open and reused for subsequent downloads from the same host within a process, up to this many per host'}),
+        'default': 10,
+        'type': EnsureInt(),
+    },
+    'datalad.download.segments': {
+        'ui': ('question', {
+               'title': 'Number of connections per download',
+               'text': 'Large files are downloaded in this many byte ranges over concurrent connections, if the server supports range requests. 1 downloads over a single connection'}),
+        'default': 1,
+        'type': EnsureInt(),
+    },
     'datalad.externals.nda.dbserver': {
         'ui': ('question', {
                'title': 'NDA database server',
@@ -226,6 +247,20 @@ definitions = {
         'type': EnsureInt(),
         'default': 5,
     },
+    'datalad.repo.state-cache': {
+        'ui': ('yesno', {
+               'title': 'Persistent repository state cache',
+               'text': 'Set this flag to cache information that is expensive to obtain from a repository (configuration, list of subdatasets) in .git/datalad/cache, and to reuse it in subsequent calls for as long as the relevant files (e.g. .git/config, .datalad/config, .gitmodules, .git/index) remain unmodified'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.repo.transfer-preflight': {
+        'ui': ('yesno', {
+               'title': 'Determine content to transfer in advance',
+               'text': "Set this flag to have git-annex find the files to get or copy, and their sizes, before transferring any. It provides an accurate total for progress reporting, but doubles the traversal of the annex. If disabled, the total grows as transfers are reported"}),
+        'type': EnsureBool(),
+        'default': True,
+    },
     'datalad.metadata.maxfieldsize': {
         'ui': ('question', {
                'title': 'Maximum metadata field size',
@@ -238,6 +273,13 @@ definitions = {
                'title': 'Native dataset metadata scheme',
                'text': 'Set this label to engage a particular metadata extraction parser'}),
     },
+    'datalad.metadata.query-cache-size': {
+        'ui': ('question', {
+               'title': 'Content metadata cache size',
+               'text': 'Maximum number of content metadata records (one per file) that are kept in memory while querying aggregated metadata. Metadata objects with more records are read from disk on every access'}),
+        'default': 100000,
+        'type': EnsureInt(),
+    },
     'datalad.metadata.store-aggregate-content': {
         'ui': ('question', {
                'title': 'Aggregated content metadata storage',
@@ -245,6 +287,13 @@ definitions = {
         'type': EnsureBool(),
         'default': True,
     },
+    'datalad.metadata.aggregate-content-format': {
+        'ui': ('question', {
+               'title': 'Aggregated content metadata format',
+               'text': "Storage format for aggregated content metadata objects. 'jsonxz' writes xz-compressed JSON lines that need to be read entirely for any query. 'msgpack' (requires the msgpack Python package) writes block-compressed msgpack records with a path index, which allows for reading the metadata of individual files without decompressing the entire object. Both formats can always be read"}),
+        'type': EnsureChoice('jsonxz', 'msgpack'),
+        'default': 'jsonxz',
+    },
     'datalad.search.default-mode': {
         'ui': ('question', {
                'title': 'Default search mode',
@@ -252,6 +301,13 @@ definitions = {
         'type': EnsureChoice('egrep', 'textblob', 'autofield'),  # graph,...
         'default': 'egrep',
     },
+    'datalad.search.egrep-index': {
+        'ui': ('yesno', {
+               'title': 'Precomputed documents for egrep search',
+               'text': 'If enabled, flattened metadata records are stored on disk for the egrep search mode and only recomputed when the aggregated metadata changes. This speeds up repeated queries on large metadata collections'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.search.index-default-documenttype': {
         'ui': ('question', {
                'title': 'Type of search index documents',
@@ -286,4 +342,11 @@ definitions = {
         'default': 256,
         'type': EnsureInt(),
     },
+    'datalad.search.index-jobs': {
+        'ui': ('question', {
+               'title': 'Number of processes for building a search index',
+               'text': "Metadata of individual datasets is loaded and converted into search index documents by this many processes in parallel. 'auto' uses one process per CPU"}),
+        'default': 1,
+        'type': EnsureInt() | EnsureChoice('auto'),
+    },
 }
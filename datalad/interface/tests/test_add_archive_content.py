@@ -491,6 +491,22 @@ class TestAddArchiveOptions():
             []
         )
 
+    def test_add_jobs_colliding_names(self):
+        # both files get renamed into the same one, while being added
+        # in parallel
+        with swallow_logs(new_level=logging.INFO) as cml:
+            add_archive_content(
+                '1.tar', annex=self.annex, strip_leading_dirs=True,
+                rename=['/.*/same.txt'], existing='numeric-suffix', jobs=2,
+            )
+            assert_re_in(r".*Added 2 files from 1.tar in .* seconds \(.*/s\)",
+                         cml.out, match=False)
+        ok_file_under_git(self.annex.path, 'same.txt', annexed=True)
+        ok_file_under_git(self.annex.path, 'same.1.txt', annexed=True)
+        eq_(sorted(open(opj(self.annex.path, f)).read()
+                   for f in ('same.txt', 'same.1.txt')),
+            ['load', 'load2'])
+
     def test_override_existing_under_git(self):
         create_tree(self.annex.path, {'1.dat': 'load2'})
         self.annex.add('1.dat', git=True)
@@ -41,7 +41,7 @@ def test_clean(d):
                 result_filter=lambda x: x['status'] == 'ok')
     assert_equal(res['path'], opj(d, ARCHIVES_TEMP_DIR))
     assert_equal(res['message'][0] % tuple(res['message'][1:]),
-                 "Removed 1 temporary archive directory: somebogus")
+                 "Removed 1 temporary archive directory (0 Bytes): somebogus")
 
     # relative path
     makedirs(opj(d, ARCHIVES_TEMP_DIR, 'somebogus'))
@@ -50,7 +50,8 @@ def test_clean(d):
         res = clean(return_type='item-or-list',
                     result_filter=lambda x: x['status'] == 'ok')
         assert_equal(res['message'][0] % tuple(res['message'][1:]),
-                     "Removed 2 temporary archive directories: somebogus, somebogus2")
+                     "Removed 2 temporary archive directories (0 Bytes): "
+                     "somebogus, somebogus2")
 
     # and what about git annex temporary files?
     makedirs(opj(d, ANNEX_TEMP_DIR))
@@ -61,7 +62,7 @@ def test_clean(d):
                     result_filter=lambda x: x['status'] == 'ok')
         assert_equal(res['path'], opj(d, ANNEX_TEMP_DIR))
         assert_equal(res['message'][0] % tuple(res['message'][1:]),
-                     "Removed 1 temporary annex file: somebogus")
+                     "Removed 1 temporary annex file (4 Bytes): somebogus")
 
     # search index
     sidir = opj(d, '.git', SEARCH_INDEX_DOTGITDIR)
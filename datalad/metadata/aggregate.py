@@ -42,6 +42,7 @@ from datalad.interface.save import Save
 from datalad.interface.base import build_doc
 from datalad.interface.common_opts import recursion_limit, recursion_flag
 from datalad.interface.common_opts import nosave_opt
+from datalad.interface.common_opts import jobs_opt
 from datalad.interface.results import get_status_dict
 from datalad.distribution.dataset import Dataset
 from datalad.metadata.metadata import agginfo_relpath
@@ -60,6 +61,7 @@ from datalad.support.constraints import EnsureChoice
 from datalad.support.gitrepo import GitRepo
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support import json_py
+from datalad.support.packed_stream import dump2packstream
 
 from datalad.utils import path_is_subpath
 from datalad.utils import assure_list
@@ -70,6 +72,13 @@ lgr = logging.getLogger('datalad.metadata.aggregate')
 # TODO filepath_info is obsolete
 location_keys = ('dataset_info', 'content_info', 'filepath_info')
 
+# dumper and file name suffix for each supported format of content metadata
+# objects (see datalad.metadata.aggregate-content-format)
+_content_dumpers = {
+    'jsonxz': (json_py.dump2xzstream, '.xz'),
+    'msgpack': (dump2packstream, '.msgpack'),
+}
+
 
 def _get_dsinfo_from_aggmetadata(ds_path, path, recursive, db):
     """Grab info on aggregated metadata for a path from a given dataset.
@@ -134,7 +143,8 @@ def _get_dsinfo_from_aggmetadata(ds_path, path, recursive, db):
     return hits
 
 
-def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extraction):
+def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extraction,
+                              jobs=None, cache_content=False):
     """Dump metadata from a dataset into object in the metadata store of another
 
     Info on the metadata objects is placed into a DB dict under the
@@ -213,10 +223,13 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
                 'datalad.metadata.store-aggregate-content',
                 default=True,
                 valtype=EnsureBool()):
+            dumper, suffix = _content_dumpers[agginto_ds.config.obtain(
+                'datalad.metadata.aggregate-content-format')]
             metasources['cn'] = {
                 'type': 'content',
                 'targetds': agginto_ds,
-                'dumper': json_py.dump2xzstream}
+                'dumper': dumper,
+                'suffix': suffix}
 
     # check if we have the extracted metadata for this state already
     # either in the source or in the destination dataset
@@ -250,7 +263,9 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
             objid,
             metasources,
             refcommit,
-            subds_relpaths)
+            subds_relpaths,
+            jobs=jobs,
+            cache_content=cache_content)
 
     # we did not actually run an extraction, so we need to
     # assemble an aggregation record from the existing pieces
@@ -305,7 +320,8 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
         return False
 
 
-def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources, refcommit, subds_relpaths):
+def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources, refcommit, subds_relpaths,
+                      jobs=None, cache_content=False):
     # we will replace any conflicting info on this dataset with fresh stuff
     agginfo = db.get(aggfrom_ds.path, {})
     # paths to extract from
@@ -324,7 +340,9 @@ def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources, r
         # on by default
         global_meta=None,
         content_meta=None,
-        paths=relevant_paths)
+        paths=relevant_paths,
+        jobs=jobs,
+        cache_content=cache_content)
 
     meta = {
         'ds': dsmeta,
@@ -348,8 +366,7 @@ def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources, r
             continue
         # only write to disk if there is something
         objrelpath = _get_obj_location(objid, label)
-        if props['dumper'] is json_py.dump2xzstream:
-            objrelpath += '.xz'
+        objrelpath += props.get('suffix', '')
         # place metadata object into the source dataset
         objpath = opj(dest.path, dirname(agginfo_relpath), objrelpath)
 
@@ -768,7 +785,12 @@ class AggregateMetaData(Interface):
             doc="""If set, all information on metadata records of subdatasets
             that have not been (re-)aggregated in this run will be kept unchanged.
             This is useful when (re-)aggregation only a subset of a dataset hierarchy,
-            for example, because not all subdatasets are locally available."""),
+            for example, because not all subdatasets are locally available.
+            Moreover, content metadata of extractors that process each file
+            independently is taken from, and recorded in a persistent cache,
+            keyed by the extractor version and a file's annex key or git blob
+            SHA. Only files with new or modified content need to be processed
+            by such extractors."""),
         force_extraction=Parameter(
             args=('--force-extraction',),
             action='store_true',
@@ -776,6 +798,7 @@ class AggregateMetaData(Interface):
             whether change detection indicates that metadata has already been
             extracted for a given dataset state."""),
         save=nosave_opt,
+        jobs=jobs_opt,
     )
 
     @staticmethod
@@ -789,7 +812,8 @@ class AggregateMetaData(Interface):
             update_mode='target',
             incremental=False,
             force_extraction=False,
-            save=True):
+            save=True,
+            jobs=None):
         refds_path = Interface.get_refds_path(dataset)
 
         # it really doesn't work without a dataset
@@ -875,7 +899,9 @@ class AggregateMetaData(Interface):
                     Dataset(aggsrc),
                     agginfo_db,
                     to_save,
-                    force_extraction)
+                    force_extraction,
+                    jobs=jobs,
+                    cache_content=incremental)
                 if errored:
                     yield get_status_dict(
                         status='error',
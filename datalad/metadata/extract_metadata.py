@@ -21,6 +21,7 @@ from datalad.distribution.dataset import datasetmethod
 from datalad.distribution.dataset import EnsureDataset
 from datalad.distribution.dataset import require_dataset
 from datalad.support.param import Parameter
+from datalad.interface.common_opts import jobs_opt
 from datalad.support.constraints import EnsureNone, EnsureStr
 from datalad.metadata.metadata import _get_metadata
 from datalad.metadata.metadata import _get_metadatarelevant_paths
@@ -65,12 +66,13 @@ class ExtractMetadata(Interface):
             doc=""""Dataset to extract metadata from. If no `file` is given,
             metadata is extracted from all files of the dataset.""",
             constraints=EnsureDataset() | EnsureNone()),
+        jobs=jobs_opt,
     )
 
     @staticmethod
     @datasetmethod(name='extract_metadata')
     @eval_results
-    def __call__(types, files=None, dataset=None):
+    def __call__(types, files=None, dataset=None, jobs=None):
         dataset = require_dataset(dataset or curdir,
                                   purpose="extract metadata",
                                   check_installed=not files)
@@ -84,7 +86,8 @@ class ExtractMetadata(Interface):
             types,
             global_meta=True,
             content_meta=bool(files),
-            paths=files)
+            paths=files,
+            jobs=jobs)
 
         if dataset is not None and dataset.is_installed():
             res = get_status_dict(
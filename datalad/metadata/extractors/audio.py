@@ -36,6 +36,7 @@ vocab_map = {
 class MetadataExtractor(BaseMetadataExtractor):
 
     _unique_exclude = {'bitrate'}
+    _content_per_file = True
 
     def get_metadata(self, dataset, content):
         if not content:
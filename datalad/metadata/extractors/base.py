@@ -10,6 +10,11 @@
 
 
 class BaseMetadataExtractor(object):
+    # set to True, if content metadata of a file is extracted independently
+    # of any other file, which allows for parallel extraction on subsets
+    # of the paths
+    _content_per_file = False
+
     def __init__(self, ds, paths):
         """
         Parameters
@@ -32,6 +32,9 @@ def _return_as_appropriate_dtype(val):
 
 
 class MetadataExtractor(BaseMetadataExtractor):
+
+    _content_per_file = True
+
     def get_metadata(self, dataset, content):
         if not content:
             return {}, []
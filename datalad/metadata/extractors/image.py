@@ -47,6 +47,8 @@ mode_map = {
 
 class MetadataExtractor(BaseMetadataExtractor):
 
+    _content_per_file = True
+
     _extractors = {
         'format': lambda x: x.format_description,
         'dcterms:SizeOrDuration': lambda x: x.size,
@@ -27,6 +27,9 @@ xmp_field_re = re.compile('^([^\[\]]+)(\[\d+\]|)(/?.*|)')
 
 
 class MetadataExtractor(BaseMetadataExtractor):
+
+    _content_per_file = True
+
     def get_metadata(self, dataset, content):
         if not content:
             return {}, []
@@ -15,18 +15,26 @@ import glob
 import logging
 import re
 import os
+import stat
+from contextlib import closing
+from contextlib import contextmanager
+from functools import partial
+from os.path import basename
 from os.path import dirname
 from os.path import relpath
 from os.path import normpath
 from os.path import curdir
 from os.path import exists
 from os.path import lexists
+from os.path import islink
 from os.path import join as opj
 from collections import OrderedDict
 from collections import Mapping
 from six import binary_type, string_types
 from six import iteritems
+from six import PY2
 
+import datalad
 from datalad import cfg
 from datalad.interface.annotate_paths import AnnotatePaths
 from datalad.interface.base import Interface
@@ -39,10 +47,17 @@ from datalad.support.constraints import EnsureBool
 from datalad.support.constraints import EnsureStr
 from datalad.support.gitrepo import GitRepo
 from datalad.support.annexrepo import AnnexRepo
+from datalad.support.exceptions import FileInGitError
+from datalad.support.exceptions import FileNotInAnnexError
+from datalad.support.locking import lock_if_check_fails
 from datalad.support.param import Parameter
+from datalad.support.cache import LRUCache
 import datalad.support.ansi_colors as ac
 from datalad.support.json_py import load as jsonload
 from datalad.support.json_py import load_xzstream
+from datalad.support.json_py import json_dumps
+from datalad.support.json_py import json_loads
+from datalad.support.packed_stream import load_packstream
 from datalad.interface.common_opts import recursion_flag
 from datalad.interface.common_opts import reporton_opt
 from datalad.distribution.dataset import Dataset
@@ -114,16 +129,71 @@ def _load_json_object(fpath, cache=None):
     return obj
 
 
-def _load_xz_json_stream(fpath, cache=None):
-    if cache is None:
-        cache = {}
-    obj = cache.get(
-        fpath,
-        {s['path']: {k: v for k, v in iteritems(s) if k != 'path'}
-         # take out the 'path' from the payload
-         for s in load_xzstream(fpath)} if lexists(fpath) else {})
-    cache[fpath] = obj
-    return obj
+def _iter_xz_json_stream(fpath, cache=None):
+    """Yield (path, metadata) tuples from a content metadata object
+
+    The object is never loaded into memory as a whole, unless it can be
+    kept in the given cache.
+
+    Parameters
+    ----------
+    fpath : str
+      Path to the metadata object.
+    cache : LRUCache, optional
+      Cache for loaded objects, with a size limit in number of records.
+      Objects with more records than the limit are read from disk
+      every time.
+    """
+    if cache is not None and fpath in cache:
+        for r in iteritems(cache[fpath]):
+            yield r
+        return
+    if not lexists(fpath):
+        return
+    # collect records for the cache, as long as it makes sense
+    obj = {} if cache is not None else None
+    for s in load_xzstream(fpath):
+        # take out the 'path' from the payload
+        path = s.pop('path')
+        if obj is not None:
+            if len(obj) < cache.size_limit:
+                obj[path] = s
+            else:
+                # too large to be cached, stop collecting
+                obj = None
+        yield path, s
+    if obj is not None:
+        cache[fpath] = obj
+
+
+def _iter_content_metadata(fpath, path=None, cache=None):
+    """Yield (path, metadata) tuples from a content metadata object
+
+    Dispatches on the object format (see
+    datalad.metadata.aggregate-content-format). Objects in the packed
+    format are indexed by path and are read selectively, hence they
+    are not cached.
+
+    Parameters
+    ----------
+    fpath : str
+      Path to the metadata object.
+    path : str, optional
+      Relative path (within the aggregated dataset) of a file or directory.
+      If given, only packed objects make use of it to limit reading to
+      the matching records. Callers must still filter the results.
+    cache : LRUCache, optional
+      Passed on to `_iter_xz_json_stream()`.
+    """
+    if not fpath.endswith('.msgpack'):
+        for r in _iter_xz_json_stream(fpath, cache=cache):
+            yield r
+        return
+    if not lexists(fpath):
+        return
+    for s in load_packstream(
+            fpath, path=None if path in (None, curdir) else path):
+        yield s.pop('path'), s
 
 
 def _get_metadatarelevant_paths(ds, subds_relpaths):
@@ -228,6 +298,11 @@ def query_aggregated_metadata(reporton, ds, aps, recursive=False,
     # if done, cache under relpath, not abspath key
     cache = {
         'objcache': {},
+        # content metadata objects can be huge, only keep a limited
+        # number of records around
+        'contentcache': LRUCache(
+            size_limit=cfg.obtain('datalad.metadata.query-cache-size'),
+            sizeof=len),
         'subds_relpaths': None,
     }
     reported = set()
@@ -372,15 +447,16 @@ def _query_aggregated_metadata_singlepath(
     rparentpath = relpath(rpath, start=containing_ds)
 
     # so we have some files to query, and we also have some content metadata
-    contentmeta = _load_xz_json_stream(
+    contentmeta = _iter_content_metadata(
         opj(agg_base_path, contentinfo_objloc),
-        cache=cache['objcache']) if contentinfo_objloc else {}
+        path=rparentpath,
+        cache=cache['contentcache']) if contentinfo_objloc else []
 
-    for fpath in [f for f in contentmeta.keys()
-                  if rparentpath == curdir or
-                  path_startswith(f, rparentpath)]:
+    for fpath, fmeta in contentmeta:
+        if not (rparentpath == curdir or path_startswith(fpath, rparentpath)):
+            continue
         # we might be onto something here, prepare result
-        metadata = MetadataDict(contentmeta.get(fpath, {}))
+        metadata = MetadataDict(fmeta)
 
         # we have to pull out the context for each extractor from the dataset
         # metadata
@@ -445,14 +521,222 @@ def _ok_metadata(meta, mtype, ds, loc):
     return False
 
 
-def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
+def _extract_content_chunk(args):
+    """Worker for _get_content_metadata_parallel()
+
+    Runs a single extractor on a subset of the paths of a dataset
+    and returns its content metadata as a list.
+    """
+    dspath, mtype, paths = args
+    from pkg_resources import iter_entry_points  # delayed heavy import
+    extractor_cls = [ep for ep in iter_entry_points('datalad.metadata.extractors')
+                     if ep.name == mtype][0].load()
+    _, contentmeta = extractor_cls(Dataset(dspath), paths=paths).get_metadata(
+        dataset=False, content=True)
+    return list(contentmeta or [])
+
+
+def _get_content_metadata_parallel(ds, mtype, paths, jobs):
+    """Run the content metadata extraction of an extractor in a process pool
+
+    Paths are split into chunks that are processed by individual workers.
+    Results are reported in the order of `paths`, regardless of which worker
+    finishes first.
+    """
+    from multiprocessing import Pool
+    # several chunks per worker to balance files of different complexity
+    chunksize = max(1, -(-len(paths) // (jobs * 4)))
+    chunks = [(ds.path, mtype, paths[i:i + chunksize])
+              for i in range(0, len(paths), chunksize)]
+    lgr.debug('Extracting %s metadata from %s in %i jobs',
+              mtype, single_or_plural('file', 'files', len(paths), True), jobs)
+    pool = Pool(processes=jobs)
+    try:
+        # imap() maintains the order of the chunks
+        for contentmeta in pool.imap(_extract_content_chunk, chunks):
+            for r in contentmeta:
+                yield r
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _get_extraction_cache_path():
+    cache_dir = opj(cfg.obtain('datalad.locations.cache'), 'metadata')
+    if not exists(cache_dir):
+        os.makedirs(cache_dir)
+    return opj(cache_dir, 'extraction.dbm')
+
+
+@contextmanager
+def _open_extraction_cache(path):
+    """Open the persistent cache of per-file metadata extraction results
+
+    The cache is locked while it is open, as not all dbm implementations
+    (e.g. dbm.dumb) support concurrent writers.
+    """
+    if PY2:
+        import anydbm as dbm
+    else:
+        import dbm
+    with lock_if_check_fails(False, path, operation='metadata'):
+        with closing(dbm.open(path, 'c')) as db:
+            yield db
+
+
+# annex backends whose keys are hashes of the content. Keys of others
+# (e.g. WORM, URL) can stay the same while the content changes
+_HASH_BACKEND_REGEX = re.compile(r'^(SHA|SKEIN|BLAKE2|MD5)')
+# what an unlocked file without content starts with
+_ANNEX_POINTER = b'/annex/objects/'
+
+
+def _get_annex_content_id(key, path):
+    """Return `key` if it identifies the content present at `path`"""
+    if not _HASH_BACKEND_REGEX.match(key):
+        return None
+    if not exists(path):
+        # dangling symlink
+        return None
+    if not islink(path):
+        # an unlocked file is just a pointer if its content is not present
+        with open(path, 'rb') as f:
+            if f.read(len(_ANNEX_POINTER)) == _ANNEX_POINTER:
+                return None
+    return key
+
+
+def _get_content_ids(ds, paths):
+    """Map paths to an identifier of their content
+
+    This is the annex key for annexed files, and the SHA of the git blob
+    for any other file. Files with modifications in the work tree, annexed
+    files without their content, and annexed files with a key that is not
+    a content hash have no such identifier, and are not reported.
+    """
+    repo = ds.repo
+    annex = isinstance(repo, AnnexRepo)
+    if annex and repo.is_direct_mode():
+        # the index does not describe the work tree
+        return {}
+    modified = set(repo.repo.git.diff('--name-only', '-z').split('\0'))
+    entries = {e.path: e for e in repo.get_index_entries()}
+    # files can only be annexed without being a symlink in v6+ repos
+    with_unlocked = annex and 'annex.version' in repo.config and \
+        repo.config.getint("annex", "version") >= 6
+    ids = {}
+    unlocked = []
+    for p in paths:
+        e = entries.get(p, None)
+        if e is None or p in modified:
+            continue
+        fpath = opj(ds.path, p)
+        if annex and stat.S_ISLNK(e.mode):
+            target = os.readlink(fpath) if islink(fpath) else ''
+            if '/annex/objects/' in target:
+                key = _get_annex_content_id(basename(target), fpath)
+                if key:
+                    ids[p] = key
+                continue
+        elif with_unlocked:
+            unlocked.append(p)
+            continue
+        ids[p] = e.hexsha
+    if len(unlocked) == 1:
+        try:
+            keys = [repo.get_file_key(unlocked)]
+        except (FileInGitError, FileNotInAnnexError):
+            keys = ['']
+    else:
+        keys = repo.get_file_key(unlocked) if unlocked else []
+    for p, key in zip(unlocked, keys):
+        if not key:
+            # in git
+            ids[p] = entries[p].hexsha
+            continue
+        key = _get_annex_content_id(key, opj(ds.path, p))
+        if key:
+            ids[p] = key
+    return ids
+
+
+def _get_cached_content_metadata(cachekey, paths, content_ids, extract):
+    """Report content metadata, only extracting it for files not yet in cache
+
+    Parameters
+    ----------
+    cachekey : str
+      Identifier of the extractor and its version.
+    paths : list
+      Paths to report metadata for.
+    content_ids : dict
+      Content identifiers of the files (see _get_content_ids()). Files
+      without an identifier are always extracted, and never cached.
+    extract : callable
+      Called with a list of paths, must return an iterable of
+      (path, metadata) tuples.
+
+    Returns
+    -------
+    generator
+      (path, metadata) tuples, in the order of `paths`
+    """
+    keys = {p: '{}:{}'.format(cachekey, content_ids[p]).encode('utf-8')
+            for p in paths if p in content_ids}
+    try:
+        dbpath = _get_extraction_cache_path()
+        with _open_extraction_cache(dbpath) as db:
+            cached = {p: json_loads(db[k])
+                      for p, k in iteritems(keys) if k in db}
+    except Exception as e:
+        lgr.warning('Cannot use metadata extraction cache: %s', exc_str(e))
+        for r in extract(paths):
+            yield r
+        return
+    todo = [p for p in paths if p not in cached]
+    lgr.debug('Found cached %s metadata for %s, extracting from %s',
+              cachekey,
+              single_or_plural('file', 'files', len(cached), True),
+              single_or_plural('file', 'files', len(todo), True))
+    # the cache is not locked during the extraction
+    fresh = dict(extract(todo)) if todo else {}
+    if any(p in keys for p in todo):
+        with _open_extraction_cache(dbpath) as db:
+            for p in todo:
+                if p in keys:
+                    # files without metadata are cached too, as None. Only
+                    # files with their content present have a key
+                    db[keys[p]] = json_dumps(fresh.get(p, None))
+    for p in paths:
+        meta = cached[p] if p in cached else fresh.get(p, None)
+        if meta is not None:
+            yield p, meta
+
+
+def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None,
+                  jobs=None, cache_content=False):
     """Make a direct query of a dataset to extract its metadata.
 
     Parameters
     ----------
     ds : Dataset
     types : list
+    jobs : int or 'auto', optional
+      Number of processes to run content metadata extraction in. Only
+      extractors that declare to process files independently of each other
+      (`_content_per_file`) are parallelized. 'auto' uses one process per
+      CPU.
+    cache_content : bool, optional
+      If True, content metadata of extractors that process files
+      independently of each other is looked up in, and added to a persistent
+      cache, keyed by extractor version and file content (annex key or git
+      blob SHA). Only files without a cache entry are passed to an extractor.
     """
+    content_ids = None
+    if jobs == 'auto':
+        from multiprocessing import cpu_count
+        jobs = cpu_count()
     errored = False
     dsmeta = MetadataDict()
     # each item in here will be a MetadataDict, but not the whole thing
@@ -516,9 +800,20 @@ def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
             raise ValueError(
                 'Enable metadata extractor %s is not available in this installation',
                 mtype_key)
+        content_flag = content_meta if content_meta is not None else ds.config.obtain(
+            'datalad.metadata.aggregate-content-{}'.format(mtype.replace('_', '-')),
+            default=True,
+            valtype=EnsureBool())
         try:
             extractor_cls = extractors[mtype_key].load()
-            extractor = extractor_cls(ds, paths=paths)
+            per_file = content_flag and paths and \
+                getattr(extractor_cls, '_content_per_file', False)
+            parallel = per_file and jobs and jobs > 1
+            cached = per_file and cache_content
+            # with parallel or cached extraction, this instance is only used
+            # to report dataset metadata, content is handled separately
+            extractor = extractor_cls(
+                ds, paths=[] if parallel or cached else paths)
         except Exception as e:
             log_progress(
                 lgr.error,
@@ -536,10 +831,24 @@ def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
                     'datalad.metadata.aggregate-dataset-{}'.format(mtype.replace('_', '-')),
                     default=True,
                     valtype=EnsureBool()),
-                content=content_meta if content_meta is not None else ds.config.obtain(
-                    'datalad.metadata.aggregate-content-{}'.format(mtype.replace('_', '-')),
-                    default=True,
-                    valtype=EnsureBool()))
+                content=content_flag)
+            if cached:
+                if content_ids is None:
+                    content_ids = _get_content_ids(ds, paths)
+                dist = extractors[mtype_key].dist
+                contentmeta_t = _get_cached_content_metadata(
+                    '{}-{}'.format(
+                        mtype_key,
+                        dist.version if dist else datalad.__version__),
+                    paths,
+                    content_ids,
+                    partial(_get_content_metadata_parallel, ds, mtype_key,
+                            jobs=jobs) if parallel else
+                    lambda p, cls=extractor_cls: cls(ds, paths=p).get_metadata(
+                        dataset=False, content=True)[1] or [])
+            elif parallel:
+                contentmeta_t = _get_content_metadata_parallel(
+                    ds, mtype_key, paths, jobs)
         except Exception as e:
             lgr.error('Failed to get dataset metadata ({}): {}'.format(
                 mtype, exc_str(e)))
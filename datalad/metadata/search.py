@@ -15,13 +15,18 @@ import logging
 from datalad.log import log_progress
 lgr = logging.getLogger('datalad.metadata.search')
 
+import io
 import os
 import re
 from functools import partial
 from os.path import join as opj, exists
 from os.path import relpath
 from os.path import normpath
+from os.path import dirname
+from os.path import curdir
 import sys
+from multiprocessing import cpu_count
+from multiprocessing import Pool
 from six import reraise
 from six import iteritems
 from time import time
@@ -35,6 +40,10 @@ from datalad.distribution.dataset import datasetmethod, EnsureDataset, \
     require_dataset
 from datalad.distribution.utils import get_git_dir
 from datalad.support.param import Parameter
+from datalad.support import json_py
+from datalad.support.json_py import load as jsonload
+from datalad.support.json_py import json_dumps
+from datalad.support.json_py import compressed_json_dump_kwargs
 from datalad.support.constraints import EnsureNone
 from datalad.support.constraints import EnsureInt
 
@@ -42,6 +51,7 @@ from datalad.consts import LOCAL_CENTRAL_PATH
 from datalad.consts import SEARCH_INDEX_DOTGITDIR
 from datalad.utils import assure_list, assure_iter, unicode_srctypes, as_unicode
 from datalad.utils import assure_unicode
+from datalad.utils import path_is_subpath
 from datalad.support.exceptions import NoDatasetArgumentFound
 from datalad.ui import ui
 from datalad.dochelpers import single_or_plural
@@ -152,6 +162,28 @@ def _meta2autofield_dict(meta, val2str=True, schema=None, consider_ucn=True):
     }
 
 
+def _get_aggregated_objects(ds):
+    """Return the metadata object locations for all datasets aggregated in `ds`
+
+    Object file names are derived from the state of the metadata they
+    contain, hence any change in the metadata of a dataset leads to a
+    change in its record.
+
+    Returns
+    -------
+    dict
+      Keys are dataset paths relative to `ds`, values are lists with the
+      object locations of the dataset and content metadata.
+    """
+    from .metadata import agginfo_relpath
+    from .metadata import _load_json_object
+    return {
+        dsrpath: [info.get(k, None) for k in ('dataset_info', 'content_info')]
+        for dsrpath, info in iteritems(
+            _load_json_object(opj(ds.path, agginfo_relpath)))
+    }
+
+
 def _search_from_virgin_install(dataset, query):
     #
     # this is to be nice to newbies
@@ -215,6 +247,17 @@ class _Search(object):
         self.documenttype = self.ds.config.obtain(
             'datalad.search.index-{}-documenttype'.format(self._mode_label),
             default=self._default_documenttype)
+        # where does the bunny have the eggs?
+        self.index_dir = opj(self.ds.path, get_git_dir(self.ds.path), SEARCH_INDEX_DOTGITDIR)
+
+    def _store_index_state(self, fname, metadata_state, **kwargs):
+        """Record what state of aggregated metadata an index was built from"""
+        json_py.dump(
+            dict(
+                kwargs,
+                metadata_state=metadata_state,
+                documenttype=self.documenttype),
+            fname)
 
     def __call__(self, query, max_nresults=None):
         raise NotImplementedError
@@ -226,13 +269,33 @@ class _Search(object):
         raise NotImplementedError
 
 
+# searcher instance used by the document building worker processes
+_index_worker_searcher = None
+
+
+def _init_index_worker(searcher):
+    global _index_worker_searcher
+    _index_worker_searcher = searcher
+
+
+def _get_index_documents(ap):
+    """Return all index documents for a single dataset (in a worker process)"""
+    searcher = _index_worker_searcher
+    return [
+        searcher._res2doc(res)
+        for res in query_aggregated_metadata(
+            reporton=searcher.documenttype,
+            ds=searcher.ds,
+            aps=[ap],
+            # each dataset is a task of its own
+            recursive=False)]
+
+
 class _WhooshSearch(_Search):
     def __init__(self, ds, force_reindex=False, **kwargs):
         super(_WhooshSearch, self).__init__(ds, **kwargs)
 
         self.idx_obj = None
-        # where does the bunny have the eggs?
-        self.index_dir = opj(self.ds.path, get_git_dir(self.ds.path), SEARCH_INDEX_DOTGITDIR)
         self._mk_search_index(force_reindex)
 
     def show_keys(self, mode):
@@ -272,20 +335,28 @@ class _WhooshSearch(_Search):
         from .metadata import agginfo_relpath
         # what is the lastest state of aggregated metadata
         metadata_state = self.ds.repo.get_last_commit_hash(agginfo_relpath)
-        # use location common to all index types, they would all invalidate
-        # simultaneously
-        stamp_fname = opj(self.index_dir, 'datalad_metadata_state')
+        # which metadata objects are describing which dataset in this state
+        metadata_objects = _get_aggregated_objects(self.ds)
+        # each index type keeps its own record of what it was built from,
+        # so it can be updated independently of the others
+        state_fname = opj(self.index_dir, '{}_state.json'.format(self._mode_label))
         index_dir = opj(self.index_dir, self._mode_label)
 
-        if (not force_reindex) and \
-                exists(index_dir) and \
-                exists(stamp_fname) and \
-                open(stamp_fname).read() == metadata_state:
+        idx_state = jsonload(state_fname) \
+            if (not force_reindex) and exists(state_fname) else {}
+        if idx_state.get('documenttype', None) == self.documenttype and \
+                exists(index_dir):
             try:
                 # TODO check that the index schema is the same
                 # as the one we would have used for reindexing
-                # TODO support incremental re-indexing, whoosh can do it
                 idx = widx.open_dir(index_dir)
+                if idx_state.get('metadata_state', None) != metadata_state:
+                    self._update_search_index(
+                        idx,
+                        idx_state.get('objects', {}),
+                        metadata_objects)
+                    self._store_index_state(
+                        state_fname, metadata_state, objects=metadata_objects)
                 lgr.debug(
                     'Search index contains %i documents',
                     idx.doc_count())
@@ -345,6 +416,90 @@ class _WhooshSearch(_Search):
 
         # load metadata of the base dataset and what it knows about all its subdatasets
         # (recursively)
+        idx_size = self._add_documents(
+            idx,
+            [dict(path=self.ds.path, type='dataset')],
+            # MIH: I cannot see a case when we would not want recursion (within
+            # the metadata)
+            recursive=True,
+            total=len(dsinfo))
+
+        lgr.debug("Committing index")
+        idx.commit(optimize=True)
+        log_progress(
+            lgr.info, 'autofieldidxbuild', 'Done building search index')
+
+        # "timestamp" the search index to allow for automatic invalidation
+        # and incremental updates
+        self._store_index_state(
+            state_fname, metadata_state, objects=metadata_objects)
+
+        lgr.info('Search index contains %i documents', idx_size)
+        self.idx_obj = idx_obj
+
+    def _update_search_index(self, idx_obj, old_objects, new_objects):
+        """Update an existing index to match a new state of aggregated metadata
+
+        Only documents on datasets whose metadata objects differ between
+        `old_objects` and `new_objects` are removed and (re-)added.
+        """
+        changed = sorted(
+            p for p in new_objects if old_objects.get(p, None) != new_objects[p])
+        removed = sorted(p for p in old_objects if p not in new_objects)
+        # the index itself is the authoritative source for the schema from
+        # now on
+        self.schema = idx_obj.schema
+        if not changed and not removed:
+            # e.g. only the aggregation record of a dataset changed
+            lgr.debug('No change in metadata objects, search index is up-to-date')
+            return
+
+        lgr.info(
+            'Updating search index for %s',
+            single_or_plural(
+                'dataset', 'datasets', len(changed) + len(removed),
+                include_count=True))
+        aps = [dict(path=normpath(opj(self.ds.path, p)), type='dataset')
+               for p in changed]
+        idx = idx_obj.writer(
+            limitmb=cfg.obtain('datalad.search.indexercachesize'))
+        try:
+            self._update_schema(idx, aps)
+            ndeleted = 0
+            for dsrpath in changed + removed:
+                dsrpath = assure_unicode(dsrpath)
+                # the dataset document itself
+                ndeleted += idx.delete_by_term('path', dsrpath)
+                # and all documents on files in this dataset
+                ndeleted += idx.delete_by_term('parentds', dsrpath)
+            lgr.debug('Removed %i outdated documents from search index', ndeleted)
+            # no recursion, subdatasets carry their own object records and
+            # are in `changed` if they need to be updated too
+            idx_size = self._add_documents(
+                idx, aps, recursive=False, total=len(aps))
+        except Exception:
+            idx.cancel()
+            raise
+        lgr.debug("Committing index")
+        idx.commit()
+        log_progress(
+            lgr.info, 'autofieldidxbuild', 'Done building search index')
+        lgr.info('Updated %i documents in search index', idx_size)
+
+    def _add_documents(self, idx, aps, recursive, total):
+        """Inject documents on aggregated metadata for `aps` into the index
+
+        Returns
+        -------
+        int
+          Number of added documents.
+        """
+        jobs = self.ds.config.obtain('datalad.search.index-jobs')
+        if jobs == 'auto':
+            jobs = cpu_count()
+        if jobs > 1:
+            return self._add_documents_parallel(idx, aps, recursive, total, jobs)
+
         old_idx_size = 0
         old_ds_rpath = ''
         idx_size = 0
@@ -352,29 +507,20 @@ class _WhooshSearch(_Search):
             lgr.info,
             'autofieldidxbuild',
             'Start building search index',
-            total=len(dsinfo),
+            total=total,
             label='Building search index',
             unit=' Datasets',
         )
         for res in query_aggregated_metadata(
                 reporton=self.documenttype,
                 ds=self.ds,
-                aps=[dict(path=self.ds.path, type='dataset')],
-                # MIH: I cannot see a case when we would not want recursion (within
-                # the metadata)
-                recursive=True):
+                aps=aps,
+                recursive=recursive):
             # this assumes that files are reported after each dataset report,
             # and after a subsequent dataset report no files for the previous
             # dataset will be reported again
-            meta = res.get('metadata', {})
-            doc = self._meta2doc(meta)
-            admin = {
-                'type': res['type'],
-                'path': relpath(res['path'], start=self.ds.path),
-            }
-            if 'parentds' in res:
-                admin['parentds'] = relpath(res['parentds'], start=self.ds.path)
-            if admin['type'] == 'dataset':
+            doc = self._res2doc(res)
+            if doc['type'] == 'dataset':
                 if old_ds_rpath:
                     lgr.debug(
                         'Added %s on dataset %s',
@@ -388,10 +534,8 @@ class _WhooshSearch(_Search):
                              'Indexed dataset at %s', old_ds_rpath,
                              update=1, increment=True)
                 old_idx_size = idx_size
-                old_ds_rpath = admin['path']
-                admin['id'] = res.get('dsid', None)
+                old_ds_rpath = doc['path']
 
-            doc.update({k: assure_unicode(v) for k, v in admin.items()})
             lgr.debug("Adding document to search index: {}".format(doc))
             # inject into index
             idx.add_document(**doc)
@@ -406,18 +550,131 @@ class _WhooshSearch(_Search):
                     idx_size - old_idx_size,
                     include_count=True),
                 old_ds_rpath)
+        return idx_size
 
-        lgr.debug("Committing index")
-        idx.commit(optimize=True)
+    def _add_documents_parallel(self, idx, aps, recursive, total, jobs):
+        """Like _add_documents(), but documents are built by a process pool
+
+        Loading the metadata objects of a dataset and flattening its records
+        into documents is done by worker processes, one dataset at a time.
+        The documents are added to the index in the order of the datasets,
+        hence the result is identical to a serial build.
+        """
+        from .metadata import agginfo_relpath
+        # one task per dataset
+        agginfos = _get_aggregated_objects(self.ds)
+        dsaps = []
+        for ap in aps:
+            dsaps.append(dict(ap, type='dataset'))
+            if not recursive:
+                continue
+            rpath = relpath(ap['path'], start=self.ds.path)
+            dsaps.extend(
+                dict(path=normpath(opj(self.ds.path, sub)), type='dataset')
+                for sub in sorted(agginfos)
+                if (rpath == curdir and sub != curdir) or
+                path_is_subpath(sub, rpath))
+        # obtain all needed metadata objects upfront, we do not want
+        # workers to compete for access to the annex
+        agg_base_path = dirname(opj(self.ds.path, agginfo_relpath))
+        objfiles = set(
+            objloc
+            for ap in dsaps
+            for i, objloc in enumerate(agginfos.get(
+                relpath(ap['path'], start=self.ds.path), []))
+            # only the first location is dataset metadata
+            if objloc and (i == 0 or self.documenttype != 'datasets'))
+        if objfiles:
+            from datalad.coreapi import get
+            get(path=[dict(path=opj(agg_base_path, of),
+                           parentds=self.ds.path, type='file')
+                      for of in objfiles],
+                dataset=self.ds,
+                result_renderer='disabled')
+
+        lgr.debug(
+            'Building search index documents for %s with %s',
+            single_or_plural('dataset', 'datasets', len(dsaps),
+                             include_count=True),
+            single_or_plural('process', 'processes', jobs,
+                             include_count=True))
+        idx_size = 0
         log_progress(
-            lgr.info, 'autofieldidxbuild', 'Done building search index')
+            lgr.info,
+            'autofieldidxbuild',
+            'Start building search index',
+            total=total,
+            label='Building search index',
+            unit=' Datasets',
+        )
+        pool = Pool(
+            processes=jobs,
+            initializer=_init_index_worker,
+            initargs=(self,))
+        try:
+            for ap, docs in zip(dsaps, pool.imap(_get_index_documents, dsaps)):
+                for doc in docs:
+                    lgr.debug("Adding document to search index: {}".format(doc))
+                    idx.add_document(**doc)
+                idx_size += len(docs)
+                ds_rpath = relpath(ap['path'], start=self.ds.path)
+                lgr.debug(
+                    'Added %s on dataset %s',
+                    single_or_plural(
+                        'document',
+                        'documents',
+                        len(docs),
+                        include_count=True),
+                    ds_rpath)
+                log_progress(lgr.info, 'autofieldidxbuild',
+                             'Indexed dataset at %s', ds_rpath,
+                             update=1, increment=True)
+            pool.close()
+        except:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        return idx_size
+
+    def _res2doc(self, res):
+        """Turn a metadata query result into a document for the index"""
+        meta = res.get('metadata', {})
+        doc = self._meta2doc(meta)
+        admin = {
+            'type': res['type'],
+            'path': relpath(res['path'], start=self.ds.path),
+        }
+        if 'parentds' in res:
+            admin['parentds'] = relpath(res['parentds'], start=self.ds.path)
+        if admin['type'] == 'dataset':
+            admin['id'] = res.get('dsid', None)
+        doc.update({k: assure_unicode(v) for k, v in admin.items()})
+        return doc
+
+    def __getstate__(self):
+        # only what is needed to build documents in a worker process,
+        # datasets and open indices do not travel well
+        state = {k: v for k, v in self.__dict__.items()
+                 if k not in ('ds', 'idx_obj', 'parser')}
+        state['ds'] = self.ds.path
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.ds = Dataset(self.ds)
+        self.idx_obj = None
 
-        # "timestamp" the search index to allow for automatic invalidation
-        with open(stamp_fname, 'w') as f:
-            f.write(metadata_state)
+    def _update_schema(self, idx, aps):
+        """Hook to extend the schema of an existing index prior an update
 
-        lgr.info('Search index contains %i documents', idx_size)
-        self.idx_obj = idx_obj
+        Parameters
+        ----------
+        idx : IndexWriter
+        aps : list
+          Annotated paths of the datasets that are about to be (re-)indexed.
+        """
+        pass
 
     def __call__(self, query, max_nresults=None, force_reindex=False, full_record=False):
         with self.idx_obj.searcher() as searcher:
@@ -598,6 +855,27 @@ class _AutofieldSearch(_WhooshSearch):
 
         self.schema = wf.Schema(**schema_fields)
 
+    def _update_schema(self, idx, aps):
+        from whoosh import fields as wf
+        from whoosh.analysis import SimpleAnalyzer
+
+        # any key in the to-be-updated datasets that the index does not know
+        # yet must be added as a field, keys that are no longer in use remain
+        # until the next full rebuild
+        for res in query_aggregated_metadata(
+                reporton='datasets',
+                ds=self.ds,
+                aps=aps,
+                recursive=False):
+            idxd = _meta2autofield_dict(res.get('metadata', {}), val2str=False)
+            for k in idxd:
+                if k in idx.schema:
+                    continue
+                lgr.debug('Adding field %s to search index', k)
+                idx.add_field(k, wf.TEXT(stored=False,
+                                         analyzer=SimpleAnalyzer()))
+        self.schema = idx.schema
+
     def _mk_parser(self):
         from whoosh import qparser as qparse
 
@@ -618,26 +896,30 @@ class _EGrepSearch(_Search):
     _mode_label = 'egrep'
     _default_documenttype = 'datasets'
 
+    def __init__(self, ds, force_reindex=False, **kwargs):
+        super(_EGrepSearch, self).__init__(ds, **kwargs)
+        self.force_reindex = force_reindex
+
     # If there were custom "per-search engine" options, we could expose
     # --consider_ucn - search through unique content properties of the dataset
     #    which might be more computationally demanding
     def __call__(self, query, max_nresults=None, consider_ucn=False, full_record=True):
-        query_re = re.compile(self.get_query(query))
+        querystr = self.get_query(query)
+        query_re = re.compile(querystr)
+        # a single search across all values of a document can rule out
+        # a match much faster than testing each value separately. This
+        # is only a filter, actual matches are still determined per value.
+        # MULTILINE makes ^ and $ also match at the boundaries of the
+        # concatenated values. Lookarounds could see across these boundaries
+        # and cannot be handled this way.
+        prefilter_re = None \
+            if any(i in querystr for i in ('(?=', '(?!', '(?<')) \
+            else re.compile(querystr, re.MULTILINE)
 
         nhits = 0
-        for res in query_aggregated_metadata(
-                reporton=self.documenttype,
-                ds=self.ds,
-                aps=[dict(path=self.ds.path, type='dataset')],
-                # MIH: I cannot see a case when we would not want recursion (within
-                # the metadata)
-                recursive=True):
-            # this assumes that files are reported after each dataset report,
-            # and after a subsequent dataset report no files for the previous
-            # dataset will be reported again
-            meta = res.get('metadata', {})
-            # produce a flattened metadata dict to search through
-            doc = _meta2autofield_dict(meta, val2str=True, consider_ucn=consider_ucn)
+        for doc, get_res in self._get_documents(consider_ucn):
+            if prefilter_re and not prefilter_re.search(u'\n'.join(doc.values())):
+                continue
             # use search instead of match to not just get hits at the start of the string
             # this will be slower, but avoids having to use actual regex syntax at the user
             # side even for simple queries
@@ -645,7 +927,7 @@ class _EGrepSearch(_Search):
             # be able to match content coming for a later field
             lgr.log(7, "Querying %s among %d items", query_re, len(doc))
             t0 = time()
-            matches = {k: query_re.search(v.lower())
+            matches = {k: query_re.search(v)
                        for k, v in iteritems(doc)}
             dt = time() - t0
             lgr.log(7, "Finished querying in %f sec", dt)
@@ -653,7 +935,7 @@ class _EGrepSearch(_Search):
             matches = {k: match.group() for k, match in matches.items() if match}
             if matches:
                 hit = dict(
-                    res,
+                    get_res(),
                     action='search',
                     query_matched=matches,
                 )
@@ -671,6 +953,105 @@ class _EGrepSearch(_Search):
                     )
                     break
 
+    def _get_documents(self, consider_ucn):
+        """Yield flattened and lower-cased metadata documents to be searched
+
+        Yields
+        ------
+        tuple
+          The document dict, and a callable returning the associated
+          metadata query result.
+        """
+        if consider_ucn or not self.ds.config.obtain('datalad.search.egrep-index'):
+            for res in self._query_metadata():
+                doc = self._res2doc(res, consider_ucn)
+                yield doc, lambda: res
+            return
+
+        store_fname = self._mk_document_store()
+        with io.open(store_fname, 'r', encoding='utf-8') as f:
+            for line in f:
+                docstr, resstr = line.rstrip(u'\n').split(u'\t', 1)
+                yield json_py.loads(docstr), partial(self._load_res, resstr)
+
+    def _query_metadata(self):
+        return query_aggregated_metadata(
+            reporton=self.documenttype,
+            ds=self.ds,
+            aps=[dict(path=self.ds.path, type='dataset')],
+            # MIH: I cannot see a case when we would not want recursion (within
+            # the metadata)
+            recursive=True)
+
+    @staticmethod
+    def _res2doc(res, consider_ucn=False):
+        # produce a flattened metadata dict to search through
+        doc = _meta2autofield_dict(
+            res.get('metadata', {}), val2str=True, consider_ucn=consider_ucn)
+        # queries are lower case too
+        return {k: v.lower() for k, v in iteritems(doc)}
+
+    def _load_res(self, resstr):
+        res = json_py.loads(resstr)
+        # paths are stored relative to make the store relocatable
+        for k in ('path', 'parentds'):
+            if k in res:
+                res[k] = normpath(opj(self.ds.path, res[k]))
+        return res
+
+    def _mk_document_store(self):
+        """Create or update the on-disk store of flattened documents
+
+        The store is a text file with one line per metadata record. Each
+        line contains the JSON-serialized flattened document and, separated
+        by a TAB, the JSON-serialized metadata query result. Compact JSON
+        never contains a literal TAB.
+
+        Returns
+        -------
+        str
+          Path of the document store.
+        """
+        from .metadata import agginfo_relpath
+        metadata_state = self.ds.repo.get_last_commit_hash(agginfo_relpath)
+        state_fname = opj(self.index_dir, '{}_state.json'.format(self._mode_label))
+        store_fname = opj(self.index_dir, '{}.json'.format(self._mode_label))
+
+        idx_state = jsonload(state_fname) \
+            if (not self.force_reindex) and exists(state_fname) else {}
+        if exists(store_fname) and \
+                idx_state.get('documenttype', None) == self.documenttype and \
+                idx_state.get('metadata_state', None) == metadata_state:
+            return store_fname
+
+        lgr.info('{} search document store'.format(
+            'Rebuilding' if exists(store_fname) else 'Building'))
+        if not exists(self.index_dir):
+            os.makedirs(self.index_dir)
+        ndocs = 0
+        # write to a temporary file first, an interrupted build must not
+        # leave a partial store behind
+        tmp_fname = store_fname + '.tmp'
+        with io.open(tmp_fname, 'w', encoding='utf-8') as f:
+            for res in self._query_metadata():
+                doc = self._res2doc(res)
+                if not doc:
+                    # nothing that could ever match
+                    continue
+                res = {k: relpath(v, start=self.ds.path)
+                       if k in ('path', 'parentds') else v
+                       for k, v in iteritems(res)
+                       # not JSON-serializable and set again on yield
+                       if k != 'logger'}
+                f.write(u'{}\t{}\n'.format(
+                    assure_unicode(json_dumps(doc, **compressed_json_dump_kwargs)),
+                    assure_unicode(json_dumps(res, **compressed_json_dump_kwargs))))
+                ndocs += 1
+        os.rename(tmp_fname, store_fname)
+        self._store_index_state(state_fname, metadata_state)
+        lgr.info('Search document store contains %i documents', ndocs)
+        return store_fname
+
     def show_keys(self, mode=None):
         maxl = 100  # maximal line length for unique values in mode=short
         # use a dict already, later we need to map to a definition
@@ -796,6 +1177,11 @@ class Search(Interface):
     search mode only considers datasets and does not investigate records
     for individual files for speed reasons.
 
+    For repeated queries on large metadata collections, the configuration
+    variable 'datalad.search.egrep-index' can be enabled. With this setting
+    a flattened representation of all metadata records is stored on disk,
+    and is only regenerated when the aggregated metadata changes.
+
     Search results are reported in the order in which they were discovered.
 
     Examples:
@@ -875,7 +1261,10 @@ class Search(Interface):
     a huge structure that can easily take an hour or more to build and require
     more than a GB of storage. However, limiting it to documents on datasets
     (see above) retains the enhanced expressiveness of queries while
-    dramatically reducing the resource demands.
+    dramatically reducing the resource demands. Building the index can be
+    distributed across multiple processes by setting the configuration
+    variable 'datalad.search.index-jobs' to the desired number of processes
+    (or 'auto' for one process per CPU).
 
     Examples:
 
@@ -929,9 +1318,9 @@ class Search(Interface):
             args=("--reindex",),
             dest='force_reindex',
             action='store_true',
-            doc="""force rebuilding the search index, even if no change in the
-            dataset's state has been detected, for example, when the index
-            documenttype configuration has changed."""),
+            doc="""force rebuilding the search index from scratch. By default,
+            an existing index is only updated for datasets whose aggregated
+            metadata has changed since the index was built."""),
         max_nresults=Parameter(
             args=("--max-nresults",),
             doc="""maxmimum number of search results to report. Setting this
@@ -251,3 +251,123 @@ def test_bf2458(src, dst):
     clone.metadata('.', on_failure='ignore')
     # XXX whereis says nothing in direct mode
     eq_(clone.repo.whereis('dummy'), [ds.config.get('annex.uuid')])
+
+
+@with_tempfile(mkdir=True)
+def test_iter_xz_json_stream(path):
+    from datalad.support.json_py import dump2xzstream
+    from datalad.support.cache import LRUCache
+    from datalad.metadata.metadata import _iter_xz_json_stream
+    objs = [{'path': 'f{}'.format(i), 'ext': {'i': i}} for i in range(5)]
+    small = opj(path, 'small.xz')
+    dump2xzstream(objs[:2], small)
+    large = opj(path, 'large.xz')
+    dump2xzstream(objs, large)
+    target = [('f{}'.format(i), {'ext': {'i': i}}) for i in range(5)]
+
+    # no cache
+    eq_(list(_iter_xz_json_stream(large)), target)
+    # non-existing object
+    eq_(list(_iter_xz_json_stream(opj(path, 'absent.xz'))), [])
+
+    cache = LRUCache(size_limit=3, sizeof=len)
+    eq_(list(_iter_xz_json_stream(small, cache=cache)), target[:2])
+    assert_in(small, cache)
+    # large object is streamed, but not cached
+    eq_(list(_iter_xz_json_stream(large, cache=cache)), target)
+    assert_true(large not in cache)
+    eq_(cache.size, 2)
+    # cached object comes out the same
+    os.unlink(small)
+    eq_(sorted(_iter_xz_json_stream(small, cache=cache)), target[:2])
+
+
+@with_tempfile(mkdir=True)
+def test_iter_content_metadata(path):
+    from datalad.support.json_py import dump2xzstream
+    from datalad.support.packed_stream import dump2packstream
+    from datalad.metadata.metadata import _iter_content_metadata
+    objs = [{'path': p, 'ext': {'i': i}}
+            for i, p in enumerate(('d/f1', 'd/f2', 'f3'))]
+    xz = opj(path, 'obj.xz')
+    dump2xzstream(objs, xz)
+    packed = opj(path, 'obj.msgpack')
+    dump2packstream(objs, packed)
+    target = [(o['path'], {'ext': o['ext']}) for o in objs]
+    for fpath in (xz, packed):
+        eq_(list(_iter_content_metadata(fpath)), target)
+        eq_(list(_iter_content_metadata(fpath, path=os.curdir)), target)
+    # packed objects only report matching records
+    eq_(list(_iter_content_metadata(packed, path='d')), target[:2])
+    eq_(list(_iter_content_metadata(packed, path='f3')), target[2:])
+    eq_(list(_iter_content_metadata(opj(path, 'absent.msgpack'))), [])
+
+
+@with_tree(tree={'a': 'same', 'b': 'none', 'c': 'other', 'd': 'same'})
+@with_tempfile(mkdir=True)
+def test_cached_content_metadata(path, cachedir):
+    from datalad.tests.utils import patch_config
+    from datalad.metadata.metadata import _get_content_ids
+    from datalad.metadata.metadata import _get_cached_content_metadata
+    repo = GitRepo(path, create=True)
+    repo.add('.')
+    repo.commit('initial')
+    ds = Dataset(path)
+    ids = _get_content_ids(ds, ['a', 'b', 'c', 'd'])
+    # content-addressed
+    eq_(ids['a'], ids['d'])
+    assert_true(ids['a'] != ids['c'])
+    # modified files have no identity
+    with open(opj(path, 'c'), 'w') as f:
+        f.write('modified')
+    eq_(sorted(_get_content_ids(ds, ['a', 'b', 'c'])), ['a', 'b'])
+
+    extracted = []
+
+    def extract(paths):
+        extracted.extend(paths)
+        # no metadata for 'b'
+        return [(p, {'p': p}) for p in paths if p != 'b']
+
+    with patch_config({'datalad.locations.cache': cachedir}):
+        target = [('a', {'p': 'a'}), ('c', {'p': 'c'})]
+        eq_(list(_get_cached_content_metadata('ex-1', ['a', 'b', 'c'], ids, extract)),
+            target)
+        eq_(extracted, ['a', 'b', 'c'])
+        del extracted[:]
+        # nothing to extract the second time
+        eq_(list(_get_cached_content_metadata('ex-1', ['a', 'b', 'c'], ids, extract)),
+            target)
+        eq_(extracted, [])
+        # files without an identity are always extracted
+        eq_(list(_get_cached_content_metadata(
+            'ex-1', ['a', 'c'], {'a': ids['a']}, extract)), target)
+        eq_(extracted, ['c'])
+        del extracted[:]
+        # different extractor version
+        list(_get_cached_content_metadata('ex-2', ['a'], ids, extract))
+        eq_(extracted, ['a'])
+
+
+@skip_direct_mode
+@with_tree(tree={'present': 'present', 'absent': 'absent', 'worm': 'worm',
+                 'ingit': 'ingit'})
+def test_cached_content_ids_annex(path):
+    from datalad.metadata.metadata import _get_content_ids
+    repo = AnnexRepo(path, create=True)
+    repo.add(['present', 'absent'])
+    repo.add(['worm'], backend='WORM')
+    repo.add(['ingit'], git=True)
+    repo.commit('initial')
+    repo.drop(['absent'], options=['--force'])
+    ds = Dataset(path)
+    ids = _get_content_ids(ds, ['present', 'absent', 'worm', 'ingit'])
+    # only files with their content present, and identified by its hash
+    eq_(sorted(ids), ['ingit', 'present'])
+    eq_(ids['present'], repo.get_file_key('present'))
+    if 'annex.version' in repo.config and \
+            repo.config.getint("annex", "version") >= 6:
+        # unlocked files are just pointers without their content
+        repo.unlock(['present', 'absent'])
+        ids = _get_content_ids(ds, ['present', 'absent', 'ingit'])
+        eq_(sorted(ids), ['ingit', 'present'])
@@ -23,6 +23,7 @@ from datalad.tests.utils import with_tempfile
 from datalad.tests.utils import assert_raises
 from datalad.tests.utils import assert_result_count
 from datalad.tests.utils import assert_in
+from datalad.tests.utils import eq_
 
 from datalad.support.exceptions import IncompleteResultsError
 
@@ -91,3 +92,26 @@ def test_file_extraction(path):
             files=[testpath])
         assert_result_count(res, 1, type='file', status='ok', action='metadata', path=testpath)
         assert_in('xmp', res[0]['metadata'])
+
+
+@with_tempfile(mkdir=True)
+def test_parallel_extraction(path):
+    from datalad.tests.utils import SkipTest
+    try:
+        import exifread
+    except ImportError:
+        raise SkipTest
+
+    ds = Dataset(path).create()
+    exifpath = opj(dirname(testpath), 'exif.jpg')
+    for i in range(10):
+        copy(exifpath, opj(path, 'pic{}.jpg'.format(i)))
+    ds.add('.')
+    ok_clean_git(ds.path)
+
+    serial = extract_metadata(types=['exif'], dataset=ds)
+    assert_result_count(serial, 11)
+    assert_in('exif', serial[0]['metadata'])
+    parallel = extract_metadata(types=['exif'], dataset=ds, jobs=3)
+    # identical results, in identical order
+    eq_(parallel, serial)
@@ -9,6 +9,8 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Some additional tests for search command (some are within test_base)"""
 
+import logging
+import os
 from shutil import copy
 from mock import patch
 from os import makedirs
@@ -18,10 +20,14 @@ from datalad.api import Dataset, install
 from nose.tools import assert_equal, assert_raises
 from datalad.utils import chpwd
 from datalad.utils import swallow_outputs
+from datalad.utils import swallow_logs
 from datalad.tests.utils import assert_in
 from datalad.tests.utils import assert_result_count
 from datalad.tests.utils import assert_is_generator
 from datalad.tests.utils import with_tempfile
+from datalad.tests.utils import with_tree
+from datalad.tests.utils import skip_direct_mode
+from datalad.tests.utils import assert_not_in
 from datalad.tests.utils import with_testsui
 from datalad.tests.utils import ok_clean_git
 from datalad.tests.utils import SkipTest
@@ -284,6 +290,121 @@ type
         assert_equal(res[-1]['query_matched'][matched_key], matched_val)
 
 
+@skip_direct_mode  #FIXME
+@with_tree(tree={
+    'datapackage.json': '{"name": "mother"}',
+    'sub1': {'datapackage.json': '{"name": "firstchild"}'},
+    'sub2': {'datapackage.json': '{"name": "secondchild"}'},
+})
+def test_incremental_reindex(path):
+    ds = Dataset(path).create(force=True)
+    for d in (ds,
+              ds.create('sub1', force=True),
+              ds.create('sub2', force=True)):
+        d.config.add('datalad.metadata.nativetype', 'frictionless_datapackage',
+                     where='dataset')
+    ds.add('.', recursive=True)
+    ds.aggregate_metadata(recursive=True, update_mode='all')
+    ok_clean_git(ds.path)
+    assert_result_count(
+        ds.search('firstchild', mode='textblob'), 1, type='dataset',
+        path=opj(ds.path, 'sub1'))
+
+    # change the metadata of a single subdataset
+    with open(opj(path, 'sub1', 'datapackage.json'), 'w') as f:
+        f.write('{"name": "renamedchild"}')
+    ds.add('.', recursive=True)
+    ds.aggregate_metadata(recursive=True, update_mode='all')
+    ok_clean_git(ds.path)
+    with swallow_logs(new_level=logging.INFO) as cml:
+        res = ds.search('renamedchild', mode='textblob')
+        # only the affected dataset was updated, no full rebuild
+        assert_in('Updating search index for', cml.out)
+        assert_not_in('Rebuilding search index', cml.out)
+    assert_result_count(res, 1, type='dataset', path=opj(ds.path, 'sub1'))
+    # outdated documents are gone, untouched ones are still there
+    assert_result_count(ds.search('firstchild', mode='textblob'), 0)
+    assert_result_count(
+        ds.search('secondchild', mode='textblob'), 1, type='dataset',
+        path=opj(ds.path, 'sub2'))
+    # forced rebuild yields the same
+    assert_result_count(
+        ds.search('renamedchild', mode='textblob', force_reindex=True), 1)
+
+
+@skip_direct_mode  #FIXME
+@with_tree(tree={
+    'datapackage.json': '{"name": "mother"}',
+    'sub1': {'datapackage.json': '{"name": "child one"}'},
+    'sub2': {'datapackage.json': '{"name": "child two"}',
+             'sub3': {'datapackage.json': '{"name": "child three"}'}},
+})
+def test_parallel_index_build(path):
+    ds = Dataset(path).create(force=True)
+    for d in (ds,
+              ds.create('sub1', force=True),
+              ds.create('sub2', force=True),
+              ds.create(opj('sub2', 'sub3'), force=True)):
+        d.config.add('datalad.metadata.nativetype', 'frictionless_datapackage',
+                     where='dataset')
+    ds.add('.', recursive=True)
+    ds.aggregate_metadata(recursive=True, update_mode='all')
+    ok_clean_git(ds.path)
+
+    def _hits(res):
+        return sorted((r['path'], r['type']) for r in res)
+
+    for mode in ('textblob', 'autofield'):
+        serial = ds.search('child', mode=mode, force_reindex=True)
+        ds.config.set('datalad.search.index-jobs', '2', where='local')
+        parallel = ds.search('child', mode=mode, force_reindex=True)
+        ds.config.unset('datalad.search.index-jobs', where='local')
+        assert_result_count(parallel, 3)
+        eq_(_hits(serial), _hits(parallel))
+
+
+@skip_direct_mode  #FIXME
+@with_tree(tree={
+    'datapackage.json': '{"name": "Mother", "description": "first line\\nsecond line"}',
+    'sub1': {'datapackage.json': '{"name": "firstchild"}'},
+})
+def test_egrep_document_store(path):
+    ds = Dataset(path).create(force=True)
+    for d in (ds, ds.create('sub1', force=True)):
+        d.config.add('datalad.metadata.nativetype', 'frictionless_datapackage',
+                     where='dataset')
+    ds.add('.', recursive=True)
+    ds.aggregate_metadata(recursive=True, update_mode='all')
+    ok_clean_git(ds.path)
+    store_fpath = opj(ds.repo.path, '.git', 'datalad', 'search_index', 'egrep.json')
+
+    queries = ('mother', 'child', 'firstchild$', '^first', '^second',
+               'first.*second', 'nothing to find')
+    plain = {q: ds.search(q, mode='egrep') for q in queries}
+    assert not os.path.exists(store_fpath)
+    ds.config.set('datalad.search.egrep-index', 'yes', where='local')
+    for q in queries:
+        res = ds.search(q, mode='egrep')
+        eq_(plain[q], res)
+    assert os.path.exists(store_fpath)
+    assert_result_count(plain['mother'], 1, type='dataset', path=ds.path)
+    assert_result_count(plain['child'], 1, type='dataset',
+                        path=opj(ds.path, 'sub1'))
+    # matching is done per value, without MULTILINE or DOTALL
+    assert_result_count(plain['^first'], 2)
+    assert_result_count(plain['^second'], 0)
+    assert_result_count(plain['first.*second'], 0)
+    assert_result_count(plain['nothing to find'], 0)
+
+    # store is invalidated by a metadata update
+    with open(opj(path, 'sub1', 'datapackage.json'), 'w') as f:
+        f.write('{"name": "renamedchild"}')
+    ds.add('.', recursive=True)
+    ds.aggregate_metadata(recursive=True, update_mode='all')
+    assert_result_count(ds.search('renamedchild', mode='egrep'), 1)
+    assert_result_count(ds.search('firstchild', mode='egrep'), 0)
+
+
 def test_listdict2dictlist():
     f = _listdict2dictlist
     l1 = [1, 3, [1, 'a']]
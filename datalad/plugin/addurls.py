@@ -10,23 +10,29 @@
 """
 
 from collections import Mapping
+from collections import OrderedDict
 from functools import partial
 from itertools import dropwhile
+from multiprocessing.pool import ThreadPool
 import logging
 import os
 import re
 import string
+import time
 
 from six import string_types
+from six.moves import zip
+from six.moves.queue import Queue
 from six.moves.urllib.parse import urlparse
 
 from datalad.dochelpers import exc_str
+from datalad.dochelpers import single_or_plural
 from datalad.log import log_progress, with_result_progress
 from datalad.interface.base import Interface
 from datalad.interface.base import build_doc
 from datalad.interface.results import annexjson2result, get_status_dict
+from datalad.interface.common_opts import jobs_opt
 from datalad.interface.common_opts import nosave_opt
-from datalad.support.exceptions import AnnexBatchCommandError
 from datalad.support.network import get_url_filename
 from datalad.support.s3 import get_versioned_url
 from datalad.utils import assure_list
@@ -475,14 +481,78 @@ def extract(stream, input_type, url_format="{0}", filename_format="{1}",
     return infos, subpaths
 
 
+def _iter_concurrently(funcs, jobs=None):
+    """Yield the items of the generators returned by `funcs`
+
+    Up to `jobs` generators are consumed at the same time, each in its own
+    thread. Items are yielded as soon as they are available.
+    """
+    if len(funcs) < 2 or not jobs or jobs == 1:
+        for func in funcs:
+            for item in func():
+                yield item
+        return
+
+    items = Queue()
+
+    def _feed(func):
+        try:
+            for item in func():
+                items.put((True, item))
+        except Exception as exc:
+            items.put((False, exc))
+        finally:
+            items.put(None)
+
+    pool = ThreadPool(processes=min(jobs, len(funcs)))
+    try:
+        for func in funcs:
+            pool.apply_async(_feed, (func,))
+        pool.close()
+        remaining = len(funcs)
+        while remaining:
+            item = items.get()
+            if item is None:
+                remaining -= 1
+            elif item[0]:
+                yield item[1]
+            else:
+                raise item[1]
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _group_by_dataset(rows):
+    """Return lists of rows with the same dataset, in order of appearance
+    """
+    groups = OrderedDict()
+    for row in rows:
+        groups.setdefault(row["ds"].path, []).append(row)
+    return list(groups.values())
+
+
+def _log_throughput(what, count, start):
+    duration = time.time() - start
+    lgr.info("%s %s in %.1f seconds (%.1f/s)",
+             what, single_or_plural("file", "files", count, True),
+             duration, count / duration if duration else float(count))
+
+
 @with_result_progress("Adding URLs")
-def add_urls(rows, ifexists=None, options=None):
+def add_urls(rows, ifexists=None, options=None, jobs=None):
     """Call `git annex addurl` using information in `rows`.
+
+    There is a single batched annex process per dataset. URLs for different
+    (sub)datasets are added concurrently, for up to `jobs` datasets at a
+    time. With a single dataset, its annex process performs up to `jobs`
+    downloads at the same time instead.
     """
+    start = time.time()
+    to_add = []
     for row in rows:
         filename_abs = row["filename_abs"]
-        ds, filename = row["ds"], row["ds_filename"]
-        lgr.debug("Adding metadata to %s in %s", filename, ds.path)
+        ds = row["ds"]
 
         if os.path.exists(filename_abs) or os.path.islink(filename_abs):
             if ifexists == "skip":
@@ -497,43 +567,67 @@ def add_urls(rows, ifexists=None, options=None):
                 os.unlink(filename_abs)
             else:
                 lgr.debug("File %s already exists", filename_abs)
-
-        try:
-            out_json = ds.repo.add_url_to_file(filename, row["url"],
-                                               batch=True, options=options)
-        except AnnexBatchCommandError as exc:
-            yield get_status_dict(action="addurls",
-                                  ds=ds,
-                                  type="file",
-                                  path=filename_abs,
-                                  message=exc_str(exc),
-                                  status="error")
-            continue
-
+        to_add.append(row)
+
+    groups = _group_by_dataset(to_add)
+    # parallelize either across datasets or within the dataset, but not
+    # both, which would make it up to jobs * jobs downloads
+    ds_jobs = None if len(groups) > 1 else jobs
+
+    def _add_to_dataset(dsrows):
+        # the annex process is started in the thread calling this
+        repo = dsrows[0]["ds"].repo
+        lgr.debug("Adding %d URLs to %s", len(dsrows), repo.path)
+        return zip(dsrows, repo.add_urls_to_files(
+            [(row["url"], row["ds_filename"]) for row in dsrows],
+            options=options, jobs=ds_jobs))
+
+    for dsrows in groups:
+        # instantiate repositories outside of the threads
+        dsrows[0]["ds"].repo
+
+    for row, out_json in _iter_concurrently(
+            [partial(_add_to_dataset, dsrows) for dsrows in groups],
+            jobs=jobs):
         # In the case of an error, the json object has file=None.
         if out_json["file"] is None:
-            out_json["file"] = filename_abs
-        yield annexjson2result(out_json, ds, action="addurls",
+            out_json["file"] = row["filename_abs"]
+        if not out_json.get("success") and "note" not in out_json and \
+                out_json.get("error-messages"):
+            out_json["note"] = "\n".join(out_json["error-messages"])
+        yield annexjson2result(out_json, row["ds"], action="addurls",
                                type="file", logger=lgr)
+    _log_throughput("Added URLs for", len(to_add), start)
 
 
 @with_result_progress("Adding metadata")
-def add_meta(rows):
-    """Call `git annex metadata --set` using information in `rows`.
+def add_meta(rows, jobs=None):
+    """Call `git annex metadata` using information in `rows`.
+
+    A single batched annex process is used per dataset, and the metadata of
+    up to `jobs` datasets is added concurrently.
     """
-    from mock import patch
+    start = time.time()
 
-    for row in rows:
-        ds, filename = row["ds"], row["ds_filename"]
+    def _add_to_dataset(dsrows):
+        repo = dsrows[0]["ds"].repo
+        lgr.debug("Adding metadata to %d files in %s", len(dsrows), repo.path)
+        return zip(dsrows, repo.add_metadata_batched(
+            [(row["ds_filename"], row["meta_args"]) for row in dsrows]))
+
+    groups = _group_by_dataset(rows)
+    for dsrows in groups:
+        dsrows[0]["ds"].repo
 
-        with patch.object(ds.repo, "always_commit", False):
-            lgr.debug("Adding metadata to %s in %s", filename, ds.path)
-            for a in ds.repo.set_metadata(filename, add=row["meta_args"]):
-                res = annexjson2result(a, ds, type="file", logger=lgr)
-                # Don't show all added metadata for the file because that
-                # could quickly flood the output.
-                del res["message"]
-                yield res
+    for row, a in _iter_concurrently(
+            [partial(_add_to_dataset, dsrows) for dsrows in groups],
+            jobs=jobs):
+        res = annexjson2result(a, row["ds"], type="file", logger=lgr)
+        # Don't show all added metadata for the file because that
+        # could quickly flood the output.
+        res.pop("message", None)
+        yield res
+    _log_throughput("Added metadata to", len(rows), start)
 
 
 @build_doc
@@ -709,6 +803,7 @@ class Addurls(Interface):
             action="store_true",
             doc="""Try to add a version ID to the URL. This currently only has
             an effect on URLs for AWS S3 buckets."""),
+        jobs=jobs_opt,
     )
 
     @staticmethod
@@ -717,7 +812,8 @@ class Addurls(Interface):
     def __call__(dataset, urlfile, urlformat, filenameformat,
                  input_type="ext", exclude_autometa=None, meta=None,
                  message=None, dry_run=False, fast=False, ifexists=None,
-                 missing_value=None, save=True, version_urls=False):
+                 missing_value=None, save=True, version_urls=False,
+                 jobs=None):
         # Temporarily work around gh-2269.
         url_file = urlfile
         url_format, filename_format = urlformat, filenameformat
@@ -729,9 +825,13 @@ class Addurls(Interface):
         from datalad.distribution.dataset import Dataset, require_dataset
         from datalad.interface.results import get_status_dict
         from datalad.support.annexrepo import AnnexRepo
+        from datalad.support.annexrepo import N_AUTO_JOBS
 
         lgr = logging.getLogger("datalad.plugin.addurls")
 
+        if jobs == "auto":
+            jobs = N_AUTO_JOBS
+
         dataset = require_dataset(dataset, check_installed=False)
         if dataset.repo and not isinstance(dataset.repo, AnnexRepo):
             yield get_status_dict(action="addurls",
@@ -838,7 +938,8 @@ class Addurls(Interface):
             log_progress(lgr.info, "addurls_versionurls", "Finished versioning URLs")
 
         files_to_add = set()
-        for r in add_urls(rows, ifexists=ifexists, options=annex_options):
+        for r in add_urls(rows, ifexists=ifexists, options=annex_options,
+                          jobs=jobs):
             if r["status"] == "ok":
                 files_to_add.add(r["path"])
             yield r
@@ -854,8 +955,10 @@ filename_format='{}'""".format(url_file, url_format, filename_format)
             for r in dataset.add(files_to_add, save=False):
                 yield r
 
-            meta_rows = [r for r in rows if r["filename_abs"] in files_to_add]
-            for r in add_meta(meta_rows):
+            meta_rows = [r for r in rows
+                         if r["filename_abs"] in files_to_add and
+                         r["meta_args"]]
+            for r in add_meta(meta_rows, jobs=jobs):
                 yield r
 
             # Save here rather than the add call above to trigger a metadata
@@ -20,11 +20,14 @@ from six.moves import StringIO
 
 from datalad.api import addurls, Dataset, subdatasets
 import datalad.plugin.addurls as au
+from datalad.support.annexrepo import AnnexRepo
 from datalad.support.exceptions import IncompleteResultsError
 from datalad.tests.utils import chpwd, slow, swallow_logs
 from datalad.tests.utils import assert_false, assert_true, assert_raises
 from datalad.tests.utils import assert_in, assert_re_in, assert_in_results
 from datalad.tests.utils import assert_dict_equal
+from datalad.tests.utils import assert_result_count
+from datalad.tests.utils import ok_clean_git
 from datalad.tests.utils import eq_, ok_exists
 from datalad.tests.utils import create_tree, with_tempfile, HTTPPath
 from datalad.utils import get_tempfile_kwargs, rmtemp
@@ -463,6 +466,38 @@ class TestAddurls(object):
                 ds.addurls(self.json_file, "{url}", "{subdir}-nosave//{name}")
                 assert_in("Not creating subdataset at existing path", cml.out)
 
+    @with_tempfile(mkdir=True)
+    def test_addurls_parallel(self, path):
+        ds = Dataset(path).create(force=True)
+        used_jobs = []
+        add_urls_to_files = AnnexRepo.add_urls_to_files
+
+        def add_urls_to_files_(self, *args, **kwargs):
+            used_jobs.append(kwargs.get("jobs"))
+            return add_urls_to_files(self, *args, **kwargs)
+
+        with chpwd(path), \
+                patch.object(AnnexRepo, "add_urls_to_files",
+                             add_urls_to_files_):
+            assert_result_count(
+                ds.addurls(self.json_file, "{url}", "{subdir}//{name}",
+                           jobs=2),
+                3, action="addurl", status="ok")
+            # datasets are processed in parallel, not their downloads
+            eq_(used_jobs, [None, None])
+            del used_jobs[:]
+            assert_result_count(
+                ds.addurls(self.json_file, "{url}", "top-{name}", jobs=2),
+                3, action="addurl", status="ok")
+            eq_(used_jobs, [2])
+            for fname in ["foo/a", "bar/b", "foo/c"]:
+                ok_exists(fname)
+            for sub, names in (("foo", ["a", "c"]), ("bar", ["b"])):
+                for fname, meta in Dataset(sub).repo.get_metadata(names):
+                    assert_dict_equal(meta,
+                                      {"subdir": [sub], "name": [fname]})
+            ok_clean_git(path)
+
     @with_tempfile(mkdir=True)
     def test_addurls_repindex(self, path):
         ds = Dataset(path).create(force=True)
@@ -509,13 +544,15 @@ class TestAddurls(object):
         ds = Dataset(path).create(force=True)
 
         # Force failure by passing a non-existent file name to annex.
-        fn = ds.repo.set_metadata
+        fn = ds.repo.add_metadata_batched
 
-        def set_meta(_, **kwargs):
-            for i in fn("wreaking-havoc-and-such", **kwargs):
-                yield i
+        def add_meta(files_metadata, **kwargs):
+            return fn([("wreaking-havoc-and-such", meta)
+                       for _, meta in files_metadata],
+                      **kwargs)
 
-        with chpwd(path), patch.object(ds.repo, 'set_metadata', set_meta):
+        with chpwd(path), \
+                patch.object(ds.repo, 'add_metadata_batched', add_meta):
             with assert_raises(IncompleteResultsError):
                 ds.addurls(self.json_file, "{url}", "{name}")
 
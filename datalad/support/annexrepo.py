@@ -18,7 +18,9 @@ import math
 import os
 import re
 import shlex
+import sys
 import tempfile
+import threading
 import time
 
 from itertools import chain
@@ -39,6 +41,8 @@ from weakref import WeakValueDictionary
 
 from six import string_types, PY2
 from six import iteritems
+from six import reraise
+from six.moves.queue import Queue, Full
 from six.moves import filter
 from git import InvalidGitRepositoryError
 
@@ -115,6 +119,15 @@ class AnnexRepo(GitRepo, RepoInterface):
     GIT_ANNEX_MIN_VERSION = '6.20170220'
     git_annex_version = None
 
+    # Commands which, given --batch, read files from stdin and output a line
+    # of json (empty if the file is not to be acted upon) per file, and the
+    # version of annex supporting it along with matching options and -J
+    _BATCH_JSON_COMMANDS = {'find', 'whereis', 'get', 'drop', 'copy', 'info'}
+    _BATCH_JSON_MIN_VERSION = '8.20200226'
+    # version of annex processing requests to a --batch command in parallel
+    # with -J
+    _BATCH_JOBS_MIN_VERSION = '8.20200226'
+
     def __init__(self, path, url=None, runner=None,
                  direct=None, backend=None, always_commit=True, create=True,
                  init=False, batch_size=None, version=None, description=None,
@@ -1259,7 +1272,8 @@ class AnnexRepo(GitRepo, RepoInterface):
         self.config.reload()
 
     @normalize_paths
-    def get(self, files, remote=None, options=None, jobs=None, key=False):
+    def get(self, files, remote=None, options=None, jobs=None, key=False,
+            stream=False):
         """Get the actual content of files
 
         Parameters
@@ -1275,6 +1289,9 @@ class AnnexRepo(GitRepo, RepoInterface):
             If not specified (None), then
         key : bool, optional
             If provided file value is actually a key
+        stream : bool, optional
+            If True, results are yielded as soon as annex reports them.
+            `files` must be a list then
 
         Returns
         -------
@@ -1295,13 +1312,16 @@ class AnnexRepo(GitRepo, RepoInterface):
         # analyze provided files to decide which actually are needed to be
         # fetched
 
-        if not key:
-            expected_downloads, fetch_files = self._get_expected_files(
-                files, ['--not', '--in', 'here'])
-        else:
+        if key:
             fetch_files = files
             assert len(files) == 1, "When key=True only a single file be provided"
             expected_downloads = {files[0]: AnnexRepo.get_size_from_key(files[0])}
+        elif self.config.obtain('datalad.repo.transfer-preflight'):
+            expected_downloads, fetch_files = self._get_expected_files(
+                files, ['--not', '--in', 'here'])
+        else:
+            # annex itself skips files which are present already
+            expected_downloads, fetch_files = True, files
 
         if not fetch_files:
             lgr.debug("No files found needing fetching.")
@@ -1322,17 +1342,16 @@ class AnnexRepo(GitRepo, RepoInterface):
             kwargs = {'opts': options + ['--key'] + files}
         else:
             kwargs = {'opts': options, 'files': files}
-        results = self._run_annex_command_json(
+        results = self._iter_annex_command_json(
             'get',
             # TODO: eventually make use of --batch mode
             jobs=jobs,
             expected_entries=expected_downloads,
             **kwargs
         )
-        results_list = list(results)
         # TODO:  should we here compare fetch_files against result_list
         # and vomit an exception of incomplete download????
-        return results_list
+        return results if stream else list(results)
 
     def _get_expected_files(self, files, expr):
         """Given a list of files, figure out what to be downloaded
@@ -1582,7 +1601,8 @@ class AnnexRepo(GitRepo, RepoInterface):
         if len(files) > 1:
             return self._batched.get('lookupkey',
                                      git_options=self._GIT_COMMON_OPTIONS,
-                                     path=self.path)(files)
+                                     path=self.path,
+                                     pipelined=True)(files)
         else:
             files = files[0]
             # single file
@@ -1764,7 +1784,9 @@ class AnnexRepo(GitRepo, RepoInterface):
         """
         objects = []
         if batch:
-            objects = self._batched.get('find', git_options=self._GIT_COMMON_OPTIONS, path=self.path)(files)
+            objects = self._batched.get(
+                'find', git_options=self._GIT_COMMON_OPTIONS, path=self.path,
+                pipelined=True)(files)
         else:
             for f in files:
                 try:
@@ -2077,6 +2099,171 @@ class AnnexRepo(GitRepo, RepoInterface):
                     % (url, str(out_json)))
         return out_json
 
+    def add_urls_to_files(self, urls_files, options=None, backend=None,
+                          jobs=None, chunksize=1000):
+        """Add files from URLs to the annex, downloading them in parallel
+
+        All pairs are fed to a single `git annex addurl --batch` process,
+        without waiting for a download to finish before sending the next
+        request. Annex downloads up to `jobs` URLs at the same time.
+
+        Parameters
+        ----------
+        urls_files : list of (str, str)
+          URL and file name (relative to the repository) pairs.
+        options : list, optional
+          Options to the annex command.
+        backend : str, optional
+        jobs : int or 'auto', optional
+          Number of parallel downloads. Downloads are serial with annex
+          versions not supporting -J in batch mode.
+        chunksize : int, optional
+          Number of requests after which the collected results are
+          reported.
+
+        Yields
+        ------
+        dict
+          JSON record for each pair, in the order of `urls_files`. Failures
+          are reported with 'success' being False.
+        """
+        if self.fake_dates_enabled:
+            lgr.debug("Not batching addurl calls because fake dates are "
+                      "enabled")
+            for url, file_ in urls_files:
+                try:
+                    yield self.add_url_to_file(
+                        file_, url, options=options, backend=backend)
+                except CommandError as exc:
+                    yield {'command': 'addurl', 'file': file_,
+                           'success': False, 'note': exc_str(exc)}
+            return
+
+        options = (options[:] if options else []) + ['--with-files']
+        if backend:
+            options += ['--backend=%s' % backend]
+        if jobs == 'auto':
+            jobs = N_AUTO_JOBS
+        if jobs and jobs != 1:
+            if external_versions['cmd:annex'] < self._BATCH_JOBS_MIN_VERSION:
+                lgr.debug(
+                    "git-annex %s does not support -J in batch mode, "
+                    "downloading one URL at a time",
+                    external_versions['cmd:annex'])
+            else:
+                options += ['-J%d' % jobs]
+        bcmd = self._batched.get(
+            'addurl_to_file_backend:%s' % backend,
+            annex_cmd='addurl',
+            git_options=self._GIT_COMMON_OPTIONS,
+            annex_options=options,
+            path=self.path,
+            json=True,
+            pipelined=True
+        )
+        for chunk in generate_chunks(list(urls_files), chunksize):
+            replies = bcmd([(url, file_) for url, file_ in chunk])
+            # with parallel downloads, replies come in order of completion
+            byfile = {}
+            unmatched = []
+            for reply in replies:
+                if not reply:
+                    continue
+                if reply.get('file') and reply['file'] not in byfile:
+                    byfile[reply['file']] = reply
+                else:
+                    unmatched.append(reply)
+            unmatched = iter(unmatched)
+            for url, file_ in chunk:
+                reply = byfile.pop(file_, None) or next(unmatched, None)
+                if reply is None:
+                    reply = {'command': 'addurl', 'success': False,
+                             'note': 'no reply from annex for %s' % url}
+                if reply.get('file') is None:
+                    reply['file'] = file_
+                yield reply
+
+    def add_metadata_batched(self, files_metadata, chunksize=1000):
+        """Add metadata values to files, using a persistent annex process
+
+        This is equivalent to calling `set_metadata(file, add=metadata)`
+        for each file, but uses a single `git annex metadata --batch`
+        process. Metadata changes are not committed to the git-annex
+        branch.
+
+        Parameters
+        ----------
+        files_metadata : list of (str, dict)
+          File name (relative to the repository) and metadata pairs. Values
+          are appended to any existing values of a key.
+        chunksize : int, optional
+          Number of files after which the collected results are reported.
+
+        Yields
+        ------
+        dict
+          JSON record for each file, in the order of `files_metadata`.
+        """
+        if external_versions['cmd:annex'] < '6.20180206':
+            # no batch mode for metadata
+            always_commit = self.always_commit
+            self.always_commit = False
+            try:
+                for file_, metadata in files_metadata:
+                    for jsn in self.set_metadata(file_, add=metadata):
+                        yield jsn
+            finally:
+                self.always_commit = always_commit
+            return
+
+        # Make sure that batch add/addurl operations are closed so that we can
+        # operate on files that were just added.
+        self.precommit()
+        bcmd = self._batched.get(
+            'metadata',
+            git_options=self._GIT_COMMON_OPTIONS +
+            ['-c', 'annex.alwayscommit=false'],
+            path=self.path,
+            json=True,
+            # there is an empty reply for files not in the annex
+            output_proc=readline_json_or_empty,
+            pipelined=True
+        )
+        for chunk in generate_chunks(list(files_metadata), chunksize):
+            # in batch mode fields can only be set, hence first get the
+            # values present already
+            current = bcmd([json.dumps({'file': file_})
+                            for file_, _ in chunk])
+            requests = []
+            for (file_, metadata), cur in zip(chunk, current):
+                if not cur:
+                    continue
+                # field names are case-insensitive
+                present = {k.lower(): (k, v)
+                           for k, v in cur.get('fields', {}).items()}
+                fields = {}
+                for k, vs in metadata.items():
+                    k, values = present.get(k.lower(), (k, []))
+                    fields[k] = values + [
+                        v for v in assure_list(vs) if v not in values]
+                requests.append(json.dumps({'file': file_, 'fields': fields}))
+            replies = iter(bcmd(requests)) if requests else iter([])
+            for i, (file_, _) in enumerate(chunk):
+                # fewer replies if annex died on the way
+                reply = current[i] if i < len(current) else None
+                if reply is not None and not reply:
+                    yield {'command': 'metadata', 'file': file_,
+                           'success': False, 'note': 'not an annexed file'}
+                    continue
+                if reply is not None:
+                    reply = next(replies, None)
+                if reply is None:
+                    reply = {'command': 'metadata', 'file': file_,
+                             'success': False,
+                             'note': 'no reply from annex for %s' % file_}
+                yield reply
+        bcmd.close()
+
     def add_urls(self, urls, options=None, backend=None, cwd=None,
                  jobs=None,
                  git_options=None, annex_options=None):
@@ -2138,7 +2325,7 @@ class AnnexRepo(GitRepo, RepoInterface):
         return self.whereis(file_, output='full', batch=batch)[AnnexRepo.WEB_UUID]['urls']
 
     @normalize_paths
-    def drop(self, files, options=None, key=False, jobs=None):
+    def drop(self, files, options=None, key=False, jobs=None, stream=False):
         """Drops the content of annexed files from this repository.
 
         Drops only if possible with respect to required minimal number of
@@ -2152,6 +2339,9 @@ class AnnexRepo(GitRepo, RepoInterface):
             commandline options for the git annex drop command
         jobs : int, optional
             how many jobs to run in parallel (passed to git-annex call)
+        stream : bool, optional
+            If True, results are yielded as soon as annex reports them.
+            `files` must be a list then
 
         Returns
         -------
@@ -2191,11 +2381,12 @@ class AnnexRepo(GitRepo, RepoInterface):
             else:
                 return res
         else:
-            return self._run_annex_command_json(
+            results = self._iter_annex_command_json(
                 'drop',
                 opts=options,
                 files=files,
                 jobs=jobs)
+            return results if stream else list(results)
 
     def drop_key(self, keys, options=None, batch=False):
         """Drops the content of annexed files from this repository referenced by keys
@@ -2245,156 +2436,278 @@ class AnnexRepo(GitRepo, RepoInterface):
             assert(remotes[self.WEB_UUID]['description'] == 'web')
         return remotes
 
-    def _run_annex_command_json(self, command,
-                                opts=None,
-                                jobs=None,
-                                files=None,
-                                expected_entries=None,
-                                **kwargs):
-        """Run an annex command with --json and load output results into a tuple of dicts
+    def _run_annex_command_json(self, command, opts=None, **kwargs):
+        """Run an annex command with --json and load output results into a list of dicts
+
+        See `_iter_annex_command_json` for the parameters
+        """
+        return list(self._iter_annex_command_json(command, opts=opts, **kwargs))
+
+    def _iter_annex_command_json(self, command,
+                                 opts=None,
+                                 jobs=None,
+                                 files=None,
+                                 expected_entries=None,
+                                 **kwargs):
+        """Run an annex command with --json and yield results as they come
+
+        Output of git-annex is parsed line by line while it runs (in a
+        separate thread), and is never accumulated, so records become
+        available before the command finishes, and memory consumption does
+        not grow with the number of files.
 
         Parameters
         ----------
-        expected_entries : dict, optional
+        expected_entries : dict or True, optional
           If provided `filename/key: size` dictionary, will be used to create
-          ProcessAnnexProgressIndicators to display progress
+          ProcessAnnexProgressIndicators to display progress.  If True,
+          progress is displayed for whatever annex reports on, without
+          knowing it in advance
         """
         progress_indicators = None
-        try:
-            if expected_entries:
-                progress_indicators = ProcessAnnexProgressIndicators(
-                    expected=expected_entries
-                )
-                kwargs = kwargs.copy()
-                kwargs.update(dict(
-                    log_stdout=progress_indicators,
-                    log_stderr='offline',  # False, # to avoid lock down
-                    log_online=True
-                ))
-            # TODO: refactor to account for possible --batch ones
-            annex_options = ['--json']
-            if jobs == 'auto':
-                jobs = N_AUTO_JOBS
-            if jobs and jobs != 1:
-                annex_options += ['-J%d' % jobs]
-            if opts:
-                annex_options += opts
-
-            # TODO: RF to use --batch where possible instead of splitting
-            # into multiple invocations
-            if not files:
+        if expected_entries is True:
+            progress_indicators = ProcessAnnexProgressIndicators(lazy=True)
+        elif expected_entries:
+            progress_indicators = ProcessAnnexProgressIndicators(
+                expected=expected_entries
+            )
+        annex_options = ['--json']
+        if jobs == 'auto':
+            jobs = N_AUTO_JOBS
+        if jobs and jobs != 1:
+            annex_options += ['-J%d' % jobs]
+        if opts:
+            annex_options += opts
+
+        batch_input = None
+        if not files:
+            file_chunks = [[]]
+        else:
+            files = assure_list(files)
+            if self._can_batch_json(command, files):
+                # a single invocation regardless of the number and length
+                # of paths
+                batch_input = tempfile.TemporaryFile()
+                for f in files:
+                    batch_input.write(assure_bytes(f) + b'\n')
+                batch_input.seek(0)
+                annex_options += ['--batch']
                 file_chunks = [[]]
             else:
-                files = assure_list(files)
                 maxl = max(map(len, files))
                 chunk_size = CMD_MAX_ARG // maxl
                 file_chunks = generate_chunks(files, chunk_size)
-            out, err = "", ""
-            for file_chunk in file_chunks:
-                out_, err_ = self._run_annex_command(
-                    command,
-                    annex_options=annex_options + ['--'] + file_chunk,
-                    **kwargs)
-                out += out_
-                err += err_
-        except CommandError as e:
-            # Note: A call might result in several 'failures', that can be or
-            # cannot be handled here. Detection of something, we can deal with,
-            # doesn't mean there's nothing else to deal with.
-
-            # OutOfSpaceError:
-            # Note:
-            # doesn't depend on anything in stdout. Therefore check this before
-            # dealing with stdout
-            out_of_space_re = re.search(
-                "not enough free space, need (.*) more", e.stderr
-            )
-            if out_of_space_re:
-                raise OutOfSpaceError(cmd="annex %s" % command,
-                                      sizemore_msg=out_of_space_re.groups()[0])
 
-            # RemoteNotAvailableError:
-            remote_na_re = re.search(
-                "there is no available git remote named \"(.*)\"", e.stderr
-            )
-            if remote_na_re:
-                raise RemoteNotAvailableError(cmd="annex %s" % command,
-                                              remote=remote_na_re.groups()[0])
-
-            # TEMP: Workaround for git-annex bug, where it reports success=True
-            # for annex add, while simultaneously complaining, that it is in
-            # a submodule:
-            # TODO: For now just reraise. But independently on this bug, it
-            # makes sense to have an exception for that case
-            in_subm_re = re.search(
-                "fatal: Pathspec '(.*)' is in submodule '(.*)'", e.stderr
-            )
-            if in_subm_re:
-                raise e
+        # bounded, so annex gets throttled by a slow consumer
+        records = Queue(maxsize=1000)
+        stopped = threading.Event()
+        # annex processes started, to terminate them once stopped
+        procs = []
+        procs_lock = threading.Lock()
+        # per invocation: number of records, and whether anything but
+        # json was output
+        output_stats = {}
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    return
+                except Full:
+                    pass
 
-            # Note: try to approach the covering of potential annex failures
-            # in a more general way:
-            # first check stdout:
-            if all([line.startswith('{') and line.endswith('}')
-                    for line in e.stdout.splitlines()]):
-                # we have the usual json output on stdout. Therefore we can
-                # probably return and don't need to raise; so get stdout
-                # for json loading:
-                out = e.stdout
-            else:
-                out = None
-
-            # Note: Workaround for not existing files as long as annex doesn't
-            # report it within JSON response:
-            # see http://git-annex.branchable.com/bugs/copy_does_not_reflect_some_failed_copies_in_--json_output/
-            not_existing = [
-                line.split()[1] for line in e.stderr.splitlines()
-                if line.startswith('git-annex:') and
-                   line.endswith('not found')
-            ]
-            if not_existing:
-                if out is None:
-                    # we create the error reporting herein. If all files were
-                    # not found, there is nothing on stdout and we don't need
-                    # anything
-                    out = ""
-                if not out.endswith(linesep):
-                    out += linesep
-                out += linesep.join(
-                    ['{{"command": "{cmd}", "file": "{path}", '
-                     '"note": "{note}",'
-                     '"success":false}}'.format(
-                         cmd=command, path=f, note="not found")
-                     for f in not_existing])
-
-            # Note: insert additional code here to analyse failure and possibly
-            # raise a custom exception
-
-            # if we didn't raise before, just depend on whether or not we seem
-            # to have some json to return. It should contain information on
-            # failure in keys 'success' and 'note'
-            # TODO: This is not entirely true. 'annex status' may return empty,
-            # while there was a 'fatal:...' in stderr, which should be a
-            # failure/exception
-            # Or if we had empty stdout but there was stderr
-            if out is None or (not out and e.stderr):
-                raise e
-            if e.stderr:
-                # else just warn about present errors
-                shorten = lambda x: x[:1000] + '...' if len(x) > 1000 else x
-                lgr.warning(
-                    "Running %s resulted in stderr output: %s",
-                    command, shorten(e.stderr)
-                )
+        def process_line(line):
+            if progress_indicators:
+                line = progress_indicators(line)
+                if line is None:
+                    return
+            line = line.rstrip('\r\n')
+            if line.startswith('{') and line.endswith('}'):
+                j = json_loads(line)
+                # protect against progress leakage
+                if 'byte-progress' not in j:
+                    output_stats['records'] += 1
+                    put(j)
+            elif line:
+                output_stats['non_json'] = True
+            # nothing is to be collected by the runner
+
+        def started(proc):
+            with procs_lock:
+                procs.append(proc)
+                if stopped.is_set():
+                    proc.terminate()
+
+        run_kwargs = dict(kwargs, log_stdout=process_line, log_online=True,
+                          on_start=started)
+        run_kwargs.setdefault('log_stderr', 'offline')
+        if batch_input:
+            run_kwargs['stdin'] = batch_input
+
+        def run():
+            try:
+                for file_chunk in file_chunks:
+                    if stopped.is_set():
+                        break
+                    output_stats.update(records=0, non_json=False)
+                    try:
+                        out, _ = self._run_annex_command(
+                            command,
+                            annex_options=annex_options + ['--'] + file_chunk,
+                            **run_kwargs)
+                        # whatever did not pass through process_line yet
+                        for line in (out or '').splitlines():
+                            process_line(line)
+                    except CommandError as e:
+                        for line in (e.stdout or '').splitlines():
+                            process_line(line)
+                        failures = self._get_annex_json_failures(
+                            command, e, **output_stats)
+                        if failures is None:
+                            raise
+                        for j in failures:
+                            put(j)
+                        break
+            except BaseException:
+                put(sys.exc_info())
+            finally:
+                if batch_input:
+                    batch_input.close()
+                put(None)
+
+        thread = threading.Thread(
+            target=run, name="annex %s" % command)
+        thread.daemon = True
+        thread.start()
+        try:
+            while True:
+                item = records.get()
+                if item is None:
+                    break
+                if isinstance(item, tuple):
+                    try:
+                        reraise(*item)
+                    finally:
+                        # do not keep the traceback referencing this frame
+                        item = None
+                yield item
         finally:
+            # if we were not consumed to the end, there is no point in
+            # letting annex finish what it is doing
+            with procs_lock:
+                stopped.set()
+                for proc in procs:
+                    if proc.poll() is None:
+                        lgr.debug("Terminating annex %s, its results are "
+                                  "not needed anymore", command)
+                        proc.terminate()
+            thread.join()
             if progress_indicators:
                 progress_indicators.finish()
 
-        json_objects = (json_loads(line)
-                        for line in out.splitlines() if line.startswith('{'))
-        # protect against progress leakage
-        json_objects = [j for j in json_objects if 'byte-progress' not in j]
-        return json_objects
+    def _can_batch_json(self, command, files):
+        """Either `files` could be passed to annex `command` via --batch
+
+        Besides being supported by annex, it requires all the files to be
+        present and not directories, since in batch mode annex neither
+        reports missing files nor recurses into directories.
+        """
+        if command not in self._BATCH_JSON_COMMANDS or \
+                external_versions['cmd:annex'] < self._BATCH_JSON_MIN_VERSION:
+            return False
+        for f in files:
+            if '\n' in f:
+                return False
+            path = opj(self.path, f)
+            if not lexists(path) or isdir(path):
+                return False
+        return True
+
+    def _get_annex_json_failures(self, command, e, records=0, non_json=False):
+        """Analyze failed annex --json call to either raise or report failures
+
+        Parameters
+        ----------
+        e : CommandError
+        records : int
+          Number of json records annex output before failing
+        non_json : bool
+          Whether annex output anything but json records to stdout
+
+        Returns
+        -------
+        list of dict or None
+          Records for failures annex did not report in its json output, or
+          None if `e` itself should be re-raised by the caller
+        """
+        # Note: A call might result in several 'failures', that can be or
+        # cannot be handled here. Detection of something, we can deal with,
+        # doesn't mean there's nothing else to deal with.
+
+        # OutOfSpaceError:
+        # Note:
+        # doesn't depend on anything in stdout. Therefore check this before
+        # dealing with stdout
+        out_of_space_re = re.search(
+            "not enough free space, need (.*) more", e.stderr
+        )
+        if out_of_space_re:
+            raise OutOfSpaceError(cmd="annex %s" % command,
+                                  sizemore_msg=out_of_space_re.groups()[0])
+
+        # RemoteNotAvailableError:
+        remote_na_re = re.search(
+            "there is no available git remote named \"(.*)\"", e.stderr
+        )
+        if remote_na_re:
+            raise RemoteNotAvailableError(cmd="annex %s" % command,
+                                          remote=remote_na_re.groups()[0])
+
+        # TEMP: Workaround for git-annex bug, where it reports success=True
+        # for annex add, while simultaneously complaining, that it is in
+        # a submodule:
+        # TODO: For now just reraise. But independently on this bug, it
+        # makes sense to have an exception for that case
+        in_subm_re = re.search(
+            "fatal: Pathspec '(.*)' is in submodule '(.*)'", e.stderr
+        )
+        if in_subm_re:
+            return None
+
+        # Note: Workaround for not existing files as long as annex doesn't
+        # report it within JSON response:
+        # see http://git-annex.branchable.com/bugs/copy_does_not_reflect_some_failed_copies_in_--json_output/
+        not_existing = [
+            line.split()[1] for line in e.stderr.splitlines()
+            if line.startswith('git-annex:') and
+               line.endswith('not found')
+        ]
+        failures = [
+            {"command": command, "file": f, "note": "not found",
+             "success": False}
+            for f in not_existing]
+
+        # Note: insert additional code here to analyse failure and possibly
+        # raise a custom exception
+
+        # if we didn't raise before, just depend on whether or not we seem
+        # to have some json to return. It should contain information on
+        # failure in keys 'success' and 'note'
+        # TODO: This is not entirely true. 'annex status' may return empty,
+        # while there was a 'fatal:...' in stderr, which should be a
+        # failure/exception
+        # Or if we had empty stdout but there was stderr
+        if (non_json and not failures) or \
+                (not (records or failures) and e.stderr):
+            return None
+        if e.stderr:
+            # else just warn about present errors
+            shorten = lambda x: x[:1000] + '...' if len(x) > 1000 else x
+            lgr.warning(
+                "Running %s resulted in stderr output: %s",
+                command, shorten(e.stderr)
+            )
+        return failures
 
     # TODO: reconsider having any magic at all and maybe just return a list/dict always
     @normalize_paths
@@ -2451,7 +2764,7 @@ class AnnexRepo(GitRepo, RepoInterface):
         else:
             kwargs = {'files': files}
 
-        json_objects = self._run_annex_command_json('whereis', **kwargs)
+        json_objects = self._iter_annex_command_json('whereis', **kwargs)
         if output in {'descriptions', 'uuids'}:
             return [
                 [remote.get(output[:-1]) for remote in j.get('whereis')]
@@ -2500,7 +2813,8 @@ class AnnexRepo(GitRepo, RepoInterface):
             json_objects = self._batched.get(
                 'info',
                 git_options=self._GIT_COMMON_OPTIONS,
-                annex_options=options, json=True, path=self.path
+                annex_options=options, json=True, path=self.path,
+                pipelined=True
             )(files)
 
         # Some aggressive checks. ATM info can be requested only per file
@@ -2973,7 +3287,7 @@ class AnnexRepo(GitRepo, RepoInterface):
 
     # We need --auto and --fast having exposed  TODO
     @normalize_paths(match_return_type=False)  # get a list even in case of a single item
-    def copy_to(self, files, remote, options=None, jobs=None):
+    def copy_to(self, files, remote, options=None, jobs=None, stream=False):
         """Copy the actual content of `files` to `remote`
 
         Parameters
@@ -2982,6 +3296,9 @@ class AnnexRepo(GitRepo, RepoInterface):
             path(s) to copy
         remote: str
             name of remote to copy `files` to
+        stream: bool, optional
+            If True, copied files are yielded as soon as annex reports them,
+            and IncompleteResultsError is raised only after all of them
 
         Returns
         -------
@@ -3012,13 +3329,16 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         # TODO: RF -- logic is duplicated with get() -- the only difference
         # is the verb (copy, copy) or (get, put) and remote ('here', remote)?
-        if '--key' not in options:
-            expected_copys, copy_files = self._get_expected_files(
-                files, ['--in', 'here', '--not', '--in', remote])
-        else:
+        if '--key' in options:
             copy_files = files
             assert(len(files) == 1)
             expected_copys = {files[0]: AnnexRepo.get_size_from_key(files[0])}
+        elif self.config.obtain('datalad.repo.transfer-preflight'):
+            expected_copys, copy_files = self._get_expected_files(
+                files, ['--in', 'here', '--not', '--in', remote])
+        else:
+            # annex itself skips files which the remote has already
+            expected_copys, copy_files = True, files
 
         if not copy_files:
             lgr.debug("No files found needing copying.")
@@ -3033,7 +3353,7 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         # TODO: provide more meaningful message (possibly aggregating 'note'
         #  from annex failed ones
-        results = self._run_annex_command_json(
+        results = self._iter_annex_command_json(
             'copy',
             opts=annex_options,
             files=files,  # copy_files,
@@ -3042,24 +3362,30 @@ class AnnexRepo(GitRepo, RepoInterface):
             #log_stdout=True, log_stderr=not log_online,
             #log_online=log_online, expect_stderr=True
         )
-        results_list = list(results)
+        good_copies = self._gen_copied_files(results)
+        return good_copies if stream else list(good_copies)
+
+    @staticmethod
+    def _gen_copied_files(results):
+        """Yield files which were copied according to annex copy `results`
+        """
         # XXX this is the only logic different ATM from get
         # check if any transfer failed since then we should just raise an Exception
         # for now to guarantee consistent behavior with non--json output
         # see https://github.com/datalad/datalad/pull/1349#discussion_r103639456
-        from operator import itemgetter
-        failed_copies = [e['file'] for e in results_list if not e['success']]
-        good_copies = [
-            e['file'] for e in results_list
-            if e['success'] and
-               e.get('note', '').startswith('to ')  # transfer did happen
-        ]
+        failed_copies = []
+        good_copies = []
+        for e in results:
+            if not e['success']:
+                failed_copies.append(e['file'])
+            elif e.get('note', '').startswith('to '):  # transfer did happen
+                good_copies.append(e['file'])
+                yield e['file']
         if failed_copies:
             # TODO: RF for new fancy scheme of outputs reporting
             raise IncompleteResultsError(
                 results=good_copies, failed=failed_copies,
                 msg="Failed to copy %d file(s)" % len(failed_copies))
-        return good_copies
 
     @property
     def uuid(self):
@@ -3337,6 +3663,11 @@ def readline_json(stdout):
     return json_loads(stdout.readline().strip())
 
 
+def readline_json_or_empty(stdout):
+    line = stdout.readline().strip()
+    return json_loads(line) if line else {}
+
+
 @auto_repr
 class BatchedAnnex(object):
     """Container for an annex process which would allow for persistent communication
@@ -3344,7 +3675,21 @@ class BatchedAnnex(object):
 
     def __init__(self, annex_cmd, git_options=None, annex_options=None, path=None,
                  json=False,
-                 output_proc=None):
+                 output_proc=None,
+                 pipelined=False,
+                 window=1000):
+        """
+        Parameters
+        ----------
+        pipelined : bool, optional
+          If True, multiple requests passed in a single call are sent to the
+          annex process from a separate thread, while replies are read, instead
+          of waiting for the reply to each request before sending the next
+          one. Only suitable for commands that reply to each request
+          immediately.
+        window : int, optional
+          Maximum number of requests without a reply in pipelined mode.
+        """
         if not isinstance(annex_cmd, list):
             annex_cmd = [annex_cmd]
         self.annex_cmd = annex_cmd
@@ -3355,6 +3700,8 @@ class BatchedAnnex(object):
         if output_proc is None:
             output_proc = readline_json if json else readline_rstripped
         self.output_proc = output_proc
+        self.pipelined = pipelined
+        self.window = window
         self._process = None
         self._stderr_out = None
         self._stderr_out_fname = None
@@ -3423,12 +3770,22 @@ class BatchedAnnex(object):
         if not input_multiple:
             cmds = [cmds]
 
+        entries = [
+            (entry if isinstance(entry, string_types) else ' '.join(entry)) + '\n'
+            for entry in cmds]
+
         output = []
+        if self.pipelined and len(entries) > 1:
+            self._check_process(restart=True)
+            output = self._call_pipelined(entries)
+            if len(output) < len(entries):
+                lgr.warning(
+                    "Process %s stopped responding after %d out of %d "
+                    "requests, sending the remaining ones one at a time",
+                    self._process, len(output), len(entries))
+                self.close()
 
-        for entry in cmds:
-            if not isinstance(entry, string_types):
-                entry = ' '.join(entry)
-            entry = entry + '\n'
+        for entry in entries[len(output):]:
             lgr.log(5, "Sending %r to batched annex %s" % (entry, self))
             # apparently communicate is just a one time show
             # stdout, stderr = self._process.communicate(entry)
@@ -3454,6 +3811,72 @@ class BatchedAnnex(object):
 
         return output if input_multiple else output[0]
 
+    def _call_pipelined(self, entries):
+        """Send all entries from a writer thread while reading the replies
+
+        Returns
+        -------
+        list
+          Replies in the order of the entries. Shorter than `entries`, if
+          the process died before all replies were received.
+        """
+        process = self._process
+        inflight = threading.Semaphore(self.window)
+        stop = threading.Event()
+
+        def _write():
+            try:
+                for entry in entries:
+                    inflight.acquire()
+                    if stop.is_set():
+                        return
+                    process.stdin.write(assure_bytes(entry) if PY2 else entry)
+                    process.stdin.flush()
+            except (IOError, OSError, ValueError) as e:
+                # the reader will notice the dead process
+                lgr.debug("Failed to send to %s: %s", process, exc_str(e))
+
+        writer = threading.Thread(target=_write, name='BatchedAnnexWriter')
+        writer.daemon = True
+        lgr.log(5, "Sending %d requests to batched annex %s",
+                len(entries), self)
+        writer.start()
+        output = []
+        killed = False
+        try:
+            for _ in entries:
+                try:
+                    stdout = self.output_proc(process.stdout) \
+                        if not process.stdout.closed else None
+                except ValueError:
+                    # unparsable (likely empty) output of a dead process
+                    if process.poll() is None:
+                        raise
+                    break
+                if not stdout and process.poll() is not None:
+                    break
+                output.append(assure_unicode(stdout))
+                inflight.release()
+        except BaseException:
+            # annex might be blocked writing replies nobody reads anymore,
+            # and the writer blocked sending it more requests.  Kill it, so
+            # neither hangs, and no later call would get the stale replies
+            lgr.debug("Killing %s after failing to process its output",
+                      process)
+            process.kill()
+            killed = True
+            raise
+        finally:
+            # make sure the writer does not wait forever for free slots
+            stop.set()
+            for _ in range(self.window):
+                inflight.release()
+            writer.join()
+            if killed:
+                self.close()
+        lgr.log(5, "Received %d replies", len(output))
+        return output
+
     def __del__(self):
         self.close()
 
@@ -3482,7 +3905,12 @@ class BatchedAnnex(object):
             process = self._process
             lgr.debug(
                 "Closing stdin of %s and waiting process to finish", process)
-            process.stdin.close()
+            try:
+                process.stdin.close()
+            except (IOError, OSError) as e:
+                # requests still buffered for a process that is gone
+                lgr.debug("Failed to close stdin of %s: %s",
+                          process, exc_str(e))
             process.stdout.close()
             process.wait()
             self._process = None
@@ -3497,30 +3925,43 @@ class ProcessAnnexProgressIndicators(object):
     for git-annex commands runner
     """
 
-    def __init__(self, expected=None):
+    def __init__(self, expected=None, lazy=False):
         """
 
         Parameters
         ----------
         expected: dict, optional
            key -> size, expected entries (e.g. downloads)
+        lazy: bool, optional
+           Entries are not known in advance.  Keys get added to `expected`,
+           and their sizes to the total, as annex reports them
         """
         # looking forward for multiple downloads at the same time
         self.pbars = {}
         self.total_pbar = None
-        self.expected = expected
+        self.lazy = lazy
+        self.expected = {} if lazy and expected is None else expected
         self._failed = 0
         self._succeeded = 0
         self.start()
 
     def start(self):
-        if self.expected:
+        if self.expected or self.lazy:
             from datalad.ui import ui
             total = sum(filter(bool, self.expected.values()))
             self.total_pbar = ui.get_progressbar(
-                label="Total", total=total)
+                label="Total", total=total or None)
             self.total_pbar.start()
 
+    def _add_expected(self, key, size=None):
+        """Account for an entry not known in advance, if lazy"""
+        if not self.lazy or key in self.expected:
+            return
+        size = int(size) if size else AnnexRepo.get_size_from_key(key)
+        self.expected[key] = size
+        if size and self.total_pbar:
+            self.total_pbar.set_total((self.total_pbar.total or 0) + size)
+
     def _update_pbar(self, pbar, new_value):
         """Updates pbar while also updating possibly total pbar"""
         old_value = getattr(pbar, '_old_value', 0)
@@ -3578,6 +4019,7 @@ class ProcessAnnexProgressIndicators(object):
         target_size = None
         if 'command' in j and 'key' in j:
             # might be the finish line message
+            self._add_expected(j['key'])
             j_download_id = (j['command'], j['key'])
             pbar = self.pbars.pop(j_download_id, None)
             if j.get('success') in {True, 'true'}:
@@ -3608,7 +4050,7 @@ class ProcessAnnexProgressIndicators(object):
                         self._succeeded,
                         failed_str,
                         len(self.expected)
-                        if self.expected
+                        if self.expected and not self.lazy
                         else self._succeeded + self._failed))
                 # seems to be of no effect to force it repaint
                 self.total_pbar.refresh()
@@ -3628,6 +4070,7 @@ class ProcessAnnexProgressIndicators(object):
         action = j['action']
         download_item = action.get('file') or action.get('key')
         download_id = (action['command'], action['key'])
+        self._add_expected(action['key'], j.get('total-size'))
         if download_id not in self.pbars:
             # New download!
             from datalad.ui import ui
@@ -11,6 +11,10 @@
 """
 
 import hashlib
+import json
+import shutil
+import tarfile
+import zipfile
 import patoolib
 from .external_versions import external_versions
 # There were issues, so let's stay consistently with recent version
@@ -18,7 +22,9 @@ assert(external_versions["patoolib"] >= "1.7")
 
 import os
 import tempfile
+from os.path import getsize
 from .path import join as opj, exists, abspath, isabs, normpath, relpath, pardir, isdir
+from .path import dirname
 from .path import sep as opsep
 from .path import realpath
 from six import next, PY2
@@ -26,17 +32,25 @@ from six.moves.urllib.parse import unquote as urlunquote
 
 import string
 import random
+import threading
 
 from .locking import lock_if_check_fails
+from ..dochelpers import exc_str
+from .. import cfg
 from ..utils import (
     any_re_search,
     assure_bytes,
+    get_path_size,
     rmdir,
 )
 
 import logging
 lgr = logging.getLogger('datalad.files')
 
+# swallow_outputs replaces sys.stdout and sys.stderr of the entire process,
+# so only a single thread at a time may decompress an archive
+_swallow_outputs_lock = threading.Lock()
+
 # Monkey-patch patoolib's logging, so it logs coherently with the rest of
 # datalad
 import patoolib.util
@@ -136,7 +150,7 @@ def decompress_file(archive, dir_, leading_directories='strip'):
         lgr.debug("Creating directory %s to extract archive into" % dir_)
         os.makedirs(dir_)
 
-    with swallow_outputs() as cmo:
+    with _swallow_outputs_lock, swallow_outputs() as cmo:
         archive = assure_bytes(archive)
         dir_ = assure_bytes(dir_)
         patoolib.util.check_existing_filename(archive)
@@ -241,6 +255,57 @@ def _get_cached_filename(archive):
     return archive_cached
 
 
+def _get_member_name(name):
+    """Normalize a path within an archive the way it would be extracted
+
+    Returns None for paths which would not end up within the extraction
+    directory (absolute or pointing outside)
+    """
+    name = normpath(assure_unicode(name))
+    if isabs(name) or name == pardir or name.startswith(pardir + opsep):
+        return None
+    return name
+
+
+def _build_members_index(archive):
+    """Scan headers of the `archive` and collect its regular files
+
+    Returns
+    -------
+    format, members
+      `format` is 'tar' or 'zip', or None if archive is of any other type,
+      thus extraction of individual files is not supported.
+      `members` is a dict mapping (normalized) paths of the regular files
+      within archive to (offset, size, name) of their content, where `name`
+      is the path as stored in the archive
+    """
+    members = {}
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                name = _get_member_name(info.filename)
+                if name and not info.filename.endswith('/'):
+                    members[name] = (info.header_offset, info.file_size,
+                                     info.filename)
+        return 'zip', members
+    if tarfile.is_tarfile(archive):
+        # for compressed tarballs it is a single sequential pass over
+        # decompressed content, but there is no need to store anything
+        with tarfile.open(archive, 'r:*') as tf:
+            tarinfo = tf.next()
+            while tarinfo is not None:
+                name = _get_member_name(tarinfo.name)
+                # sparse files and links are left to the full extraction
+                if name and tarinfo.isreg() and not tarinfo.issparse():
+                    members[name] = (tarinfo.offset_data, tarinfo.size,
+                                     tarinfo.name)
+                # do not accumulate all the TarInfo's of a huge tarball
+                del tf.members[:]
+                tarinfo = tf.next()
+        return 'tar', members
+    return None, members
+
+
 def _get_random_id(size=6, chars=string.ascii_uppercase + string.digits):
     """Return a random ID composed from digits and uppercase letters
 
@@ -259,11 +324,15 @@ class ArchivesCache(object):
       If not provided -- random tempdir is used
     persistent : bool, optional
       Passed over into generated ExtractedArchives
+    max_size : int, optional
+      Size (in bytes) the cache should not grow beyond.  Whenever exceeded
+      after extraction, least recently used archives are removed from the
+      cache.  0 for no limit, and if None -- taken from
+      `datalad.archives.cache-size` configuration
     """
-    # TODO: make caching persistent across sessions/runs, with cleanup
     # IDEA: extract under .git/annex/tmp so later on annex unused could clean it
     #       all up
-    def __init__(self, toppath=None, persistent=False):
+    def __init__(self, toppath=None, persistent=False, max_size=None):
 
         self._toppath = toppath
         if toppath:
@@ -279,10 +348,18 @@ class ArchivesCache(object):
             path = tempfile.mktemp(**get_tempfile_kwargs())
         self._path = path
         self.persistent = persistent
+        if max_size is None:
+            max_size = cfg.obtain('datalad.archives.cache-size')
+        self.max_size = max_size
         # TODO?  assure that it is absent or we should allow for it to persist a bit?
         #if exists(path):
         #    self._clean_cache()
         self._archives = {}
+        # number of threads using an extracted archive, by its path, so it
+        # does not get pruned from underneath them.  Guarded by _lock along
+        # with _archives
+        self._in_use = {}
+        self._lock = threading.RLock()
 
         # TODO: begging for a race condition
         if not exists(path):
@@ -303,9 +380,10 @@ class ArchivesCache(object):
         return self._path
 
     def clean(self, force=False):
-        for aname, a in list(self._archives.items()):
-            a.clean(force=force)
-            del self._archives[aname]
+        with self._lock:
+            for aname, a in list(self._archives.items()):
+                a.clean(force=force)
+                del self._archives[aname]
         # Probably we should not rely on _made_path and not bother if persistent removing it
         # if ((not self.persistent) or force) and self._made_path:
         #     lgr.debug("Removing the entire archives cache under %s" % self.path)
@@ -335,17 +413,115 @@ class ArchivesCache(object):
     def get_archive(self, archive):
         archive = self._get_normalized_archive_path(archive)
 
-        if archive not in self._archives:
-            self._archives[archive] = \
-                ExtractedArchive(archive,
-                                 opj(self.path, _get_cached_filename(archive)),
-                                 persistent=self.persistent)
+        with self._lock:
+            if archive not in self._archives:
+                self._archives[archive] = \
+                    ExtractedArchive(archive,
+                                     opj(self.path, _get_cached_filename(archive)),
+                                     persistent=self.persistent)
 
-        return self._archives[archive]
+            return self._archives[archive]
 
     def __getitem__(self, archive):
         return self.get_archive(archive)
 
+    def get_extracted_file(self, archive, afile):
+        """Return path to the extracted `afile` from the `archive`
+
+        Extracts it if necessary, and then removes least recently used
+        archives if the cache has grown beyond `max_size`
+        """
+        with self._lock:
+            earchive = self.get_archive(archive)
+            self._in_use[earchive.path] = self._in_use.get(earchive.path, 0) + 1
+        try:
+            extracted = exists(earchive.get_extracted_filename(afile))
+            path = earchive.get_extracted_file(afile)
+        finally:
+            with self._lock:
+                self._in_use[earchive.path] -= 1
+                if not self._in_use[earchive.path]:
+                    del self._in_use[earchive.path]
+        if not extracted and self.max_size:
+            self.prune(keep=earchive)
+        return path
+
+    def _get_cached_archives(self):
+        """Return (last access, size, ExtractedArchive) for all cached archives
+
+        Includes archives extracted by other processes, sorted from the
+        least recently used one
+        """
+        suffixes = (ExtractedArchive.STAMP_SUFFIX, ExtractedArchive.INDEX_SUFFIX)
+        paths = set()
+        for name in os.listdir(self.path):
+            for suffix in suffixes:
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+                    break
+            else:
+                if not isdir(opj(self.path, name)):
+                    # lock or temporary files
+                    continue
+            paths.add(opj(self.path, name))
+        earchives = {a.path: a for a in self._archives.values()}
+        cached = []
+        for path in paths:
+            earchive = earchives.get(path) \
+                or ExtractedArchive(None, path, persistent=True)
+            cached.append((earchive.last_access, earchive.size, earchive))
+        return sorted(cached, key=lambda x: x[0])
+
+    def prune(self, keep=None):
+        """Remove least recently used archives until cache fits into `max_size`
+
+        Archives which are being extracted by another process at the
+        moment are left alone.
+
+        Parameters
+        ----------
+        keep : ExtractedArchive, optional
+          Archive to not remove, e.g. the one which was just used
+
+        Returns
+        -------
+        int
+          Number of bytes freed
+        """
+        freed = 0
+        if not self.max_size:
+            return freed
+        with self._lock, \
+                lock_if_check_fails(False, self.path, operation="prune") \
+                as (check, lock):
+            cached = self._get_cached_archives()
+            total = sum(size for _, size, _ in cached)
+            for last_access, size, earchive in cached:
+                if total <= self.max_size:
+                    break
+                if keep is not None and earchive.path == keep.path:
+                    continue
+                if earchive.path in self._in_use:
+                    lgr.debug("Not removing %s from cache since it is in "
+                              "use by another thread", earchive)
+                    continue
+                with lock_if_check_fails(
+                        False, earchive.path, operation="extract",
+                        blocking=False) as (check, elock):
+                    if not elock.acquired:
+                        lgr.debug("Not removing %s from cache since it is in "
+                                  "use", earchive)
+                        continue
+                    lgr.debug("Removing least recently used %s of size %d "
+                              "from cache", earchive, size)
+                    earchive.clean(force=True)
+                total -= size
+                freed += size
+        if freed:
+            lgr.info("Removed %d bytes of least recently used archives from "
+                     "cache %s", freed, self.path)
+        return freed
+
     def __delitem__(self, archive):
         archive = self._get_normalized_archive_path(archive)
         self._archives[archive].clean()
@@ -366,6 +542,8 @@ class ExtractedArchive(object):
 
     # suffix to use for a stamp so we could guarantee that extracted archive is
     STAMP_SUFFIX = '.stamp'
+    # suffix for the index of the files within archive
+    INDEX_SUFFIX = '.index'
 
     def __init__(self, archive, path=None, persistent=False):
         self._archive = archive
@@ -378,6 +556,9 @@ class ExtractedArchive(object):
                                "persist" % path)
         self._persistent = persistent
         self._path = path
+        self._index = None
+        # the lock for extraction works only across processes
+        self._extract_lock = threading.Lock()
 
     def __repr__(self):
         return "%s(%r, path=%r)" % (self.__class__.__name__, self._archive, self.path)
@@ -389,9 +570,11 @@ class ExtractedArchive(object):
         #              % self._path)
         #     return
 
+        self._index = None
         for path, name in [
             (self._path, 'cache'),
-            (self.stamp_path, 'stamp file')
+            (self.stamp_path, 'stamp file'),
+            (self.index_path, 'index file'),
         ]:
             if exists(path):
                 if (not self._persistent) or force:
@@ -410,6 +593,35 @@ class ExtractedArchive(object):
     def stamp_path(self):
         return self._path + self.STAMP_SUFFIX
 
+    @property
+    def index_path(self):
+        return self._path + self.INDEX_SUFFIX
+
+    @property
+    def size(self):
+        """Size of the extracted content, including stamp and index files
+        """
+        return sum(get_path_size(p)
+                   for p in (self._path, self.stamp_path, self.index_path))
+
+    @property
+    def last_access(self):
+        """Time when extracted content was last used, or None if there is none
+        """
+        mtimes = [os.stat(p).st_mtime
+                  for p in (self.stamp_path, self.index_path, self._path)
+                  if exists(p)]
+        return max(mtimes) if mtimes else None
+
+    def _touch(self):
+        """Record the access, so recently used archives stay in the cache
+        """
+        # stamp remains newer than extracted content
+        for path in (self.stamp_path, self.index_path):
+            if exists(path):
+                os.utime(path, None)
+                return
+
     @property
     def is_extracted(self):
         return exists(self.path) and exists(self.stamp_path) \
@@ -420,7 +632,7 @@ class ExtractedArchive(object):
         """
         path = self.path
 
-        with lock_if_check_fails(
+        with self._extract_lock, lock_if_check_fails(
             check=(lambda s: s.is_extracted, (self,)),
             lock_path=path,
             operation="extract"
@@ -474,6 +686,7 @@ class ExtractedArchive(object):
         """Generator to provide filenames which are available under extracted archive
         """
         path = self.assure_extracted()
+        self._touch()
         path_len = len(path) + (len(os.sep) if not path.endswith(os.sep) else 0)
         for root, dirs, files in os.walk(path):  # TEMP
             for name in files:
@@ -526,13 +739,130 @@ class ExtractedArchive(object):
                 return None
         return leading if leading is None else opj(*leading)
 
+    def get_members_index(self):
+        """Return the index of the files within the archive
+
+        The index is built upon the first request by reading only the headers
+        of the archive, and is stored next to the extracted content, so
+        it is reused until the archive changes.
+
+        Returns
+        -------
+        dict
+          with 'format' ('tar', 'zip', or None if extraction of individual
+          files is not supported) and 'members' mapping paths within archive
+          to (offset, size, name in the archive) of their content
+        """
+        archive_stat = os.stat(self._archive)
+        stamp = [archive_stat.st_size, archive_stat.st_mtime]
+        index = self._index
+        if index is None and exists(self.index_path):
+            try:
+                with open(self.index_path) as f:
+                    index = json.load(f)
+            except ValueError as exc:
+                lgr.debug("Ignoring corrupted index %s: %s", self.index_path, exc)
+        if index is not None and index.get('stamp') == stamp:
+            self._index = index
+            return index
+
+        lgr.debug("Indexing files within %s", self._archive)
+        format_, members = _build_members_index(self._archive)
+        index = {'stamp': stamp, 'format': format_, 'members': members}
+        # write it out atomically, so concurrent readers get it complete
+        index_tmp = self.index_path + '.' + _get_random_id()
+        with open(index_tmp, 'w') as f:
+            json.dump(index, f)
+        os.rename(index_tmp, self.index_path)
+        self._index = index
+        return index
+
+    def _extract_member(self, afile):
+        """Extract only `afile` from the archive
+
+        Returns
+        -------
+        str or None
+          Path to the extracted file, or None if it could not be extracted
+          individually, so entire archive needs to be extracted
+        """
+        index = self.get_members_index()
+        name = _get_member_name(urlunquote(afile))
+        member = index['members'].get(name) if index['format'] else None
+        if member is None:
+            return None
+        offset, size, member_name = member
+        path = self.get_extracted_filename(afile)
+
+        with lock_if_check_fails(
+            check=(lambda p: exists(p) and getsize(p) == size, (path,)),
+            lock_path=self.path,
+            operation="extract"
+        ) as (check, lock):
+            if lock:
+                self._copy_member(
+                    index['format'], member_name, offset, size, path)
+        return path
+
+    def _copy_member(self, format_, name, offset, size, path):
+        lgr.debug(u"Extracting {name} from {self._archive} into {path}"
+                  .format(**locals()))
+        if format_ == 'zip':
+            archive = zipfile.ZipFile(self._archive)
+            # seeks to the local header of the file
+            open_member = lambda: archive.open(name)
+        else:
+            # opens transparently compressed tarballs as well, for which
+            # seeking is done by sequential decompression
+            archive = tarfile.open(self._archive, 'r:*')
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.type = tarfile.REGTYPE
+            tarinfo.offset_data = offset
+            tarinfo.size = size
+            open_member = lambda: archive.extractfile(tarinfo)
+
+        path_dir = dirname(path)
+        if not exists(path_dir):
+            os.makedirs(path_dir)
+        path_tmp = path + '.' + _get_random_id()
+        try:
+            with archive:
+                src = open_member()
+                try:
+                    with open(path_tmp, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+                finally:
+                    src.close()
+            if getsize(path_tmp) != size:
+                raise IOError(
+                    "Got only %d out of %d bytes of %s from %s"
+                    % (getsize(path_tmp), size, name, self._archive))
+            os.rename(path_tmp, path)
+        finally:
+            if exists(path_tmp):
+                os.unlink(path_tmp)
+
     def get_extracted_file(self, afile):
         lgr.debug(u"Requested file {afile} from archive {self._archive}".format(**locals()))
         # TODO: That could be a good place to provide "compatibility" layer if
         # filenames within archive are too obscure for local file system.
         # We could somehow adjust them while extracting and here channel back
         # "fixed" up names since they are only to point to the load
+        if not self.is_extracted:
+            try:
+                path = self._extract_member(afile)
+            except Exception as exc:
+                # e.g. a compression method not supported by zipfile, which
+                # the tools used for the full extraction might support
+                lgr.debug("Failed to extract %s alone from %s, extracting "
+                          "entire archive: %s", afile, self._archive,
+                          exc_str(exc))
+                path = None
+            if path:
+                self._touch()
+                return path
         self.assure_extracted()
+        self._touch()
         path = self.get_extracted_filename(afile)
         # TODO: make robust
         lgr.log(2, "Verifying that %s exists" % abspath(path))
@@ -35,3 +35,42 @@ class DictCache(OrderedDict):
         if self.size_limit is not None:
             while len(self) > self.size_limit:
                 self.popitem(last=False)
+
+
+class LRUCache(object):
+    """A dictionary-like cache with a limited total size
+
+    Least recently used entries are expunged first. The size of each entry
+    is determined by a `sizeof` function, hence the limit can be expressed
+    in any unit (number of entries by default).
+    """
+    def __init__(self, size_limit, sizeof=None):
+        self.size_limit = size_limit
+        self._sizeof = sizeof or (lambda value: 1)
+        self._store = OrderedDict()
+        self.size = 0
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, key):
+        # re-insert to mark as most recently used
+        value, size = self._store.pop(key)
+        self._store[key] = (value, size)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self._store else default
+
+    def __setitem__(self, key, value):
+        if key in self._store:
+            self.size -= self._store.pop(key)[1]
+        size = self._sizeof(value)
+        self._store[key] = (value, size)
+        self.size += size
+        while self.size > self.size_limit and self._store:
+            _, (_, size) = self._store.popitem(last=False)
+            self.size -= size
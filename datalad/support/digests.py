@@ -10,6 +10,9 @@
 """
 
 import hashlib
+import os
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 
 from ..utils import auto_repr
 
@@ -24,29 +27,84 @@ class Digester(object):
     Loosely based on snippet by PM 2Ring 2014.10.23
     http://unix.stackexchange.com/a/163769/55543
 
-    Ideally we should find an efficient way to parallelize this but
-    atm this one is sufficiently speedy
+    Files larger than a single block are read in large blocks, and each
+    digest is updated in its own thread while the next block is read.
+    hashlib releases the GIL while hashing, so digests are computed on
+    multiple cores.  Use `digest_files` to hash many files at once.
     """
 
     DEFAULT_DIGESTS = ['md5', 'sha1', 'sha256', 'sha512']
 
-    def __init__(self, digests=None, blocksize=1 << 16):
+    def __init__(self, digests=None, blocksize=1 << 20, parallel=True):
         self._digests = digests or self.DEFAULT_DIGESTS
         self._digest_funcs = [getattr(hashlib, digest) for digest in self._digests]
         self.blocksize = blocksize
+        self.parallel = parallel
 
     @property
     def digests(self):
         return self._digests
 
     def __call__(self, fpath):
+        return self._digest(fpath, parallel=self.parallel)
+
+    def _digest(self, fpath, parallel):
         lgr.debug("Estimating digests for %s" % fpath)
         digests = [x() for x in self._digest_funcs]
         with open(fpath, 'rb') as f:
+            if parallel and len(digests) > 1 \
+                    and os.fstat(f.fileno()).st_size > self.blocksize:
+                self._update_parallel(f, digests)
+            else:
+                while True:
+                    block = f.read(self.blocksize)
+                    if not block:
+                        break
+                    [d.update(block) for d in digests]
+
+        return {n: d.hexdigest() for n, d in zip(self.digests, digests)}
+
+    def _update_parallel(self, f, digests):
+        pool = ThreadPool(len(digests))
+        try:
+            updates = []
             while True:
                 block = f.read(self.blocksize)
+                # next block was read while the previous one was digested
+                [u.get() for u in updates]
                 if not block:
                     break
-                [d.update(block) for d in digests]
+                updates = [pool.apply_async(d.update, (block,))
+                           for d in digests]
+        finally:
+            pool.terminate()
 
-        return {n: d.hexdigest() for n, d in zip(self.digests, digests)}
+    def digest_files(self, fpaths, jobs=None):
+        """Compute digests for multiple files, hashing them in parallel
+
+        Parameters
+        ----------
+        fpaths : iterable of str
+        jobs : int, optional
+          Number of files to hash at the same time.  By default -- number
+          of CPUs
+
+        Yields
+        ------
+        (str, dict)
+          File path and its digests, in the order of `fpaths`
+        """
+        jobs = jobs or cpu_count()
+        if jobs == 1:
+            for fpath in fpaths:
+                yield fpath, self(fpath)
+            return
+        pool = ThreadPool(jobs)
+        try:
+            # every file is already digested in a thread of its own
+            for res in pool.imap(
+                    lambda fpath: (fpath, self._digest(fpath, parallel=False)),
+                    fpaths):
+                yield res
+        finally:
+            pool.terminate()
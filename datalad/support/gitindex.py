@@ -0,0 +1,197 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Streaming reader for git's index file
+
+GitPython's `IndexFile` builds a full-blown object for every entry, which
+is slow and memory hungry for repositories with millions of files. This
+reader memory-maps the index file and yields compact, tuple-based records
+one at a time. Index versions 2, 3 and 4 (path prefix compression) are
+supported. Extensions (e.g. the cache tree) are ignored, except for the
+`link` extension of a split index, which is refused. The checksum is not
+verified.
+
+See Documentation/technical/index-format.txt in git's sources for the
+file format.
+"""
+
+import binascii
+import mmap
+import os
+import struct
+from collections import namedtuple
+from glob import glob
+from os.path import dirname
+from os.path import join as opj
+
+from six import PY2
+
+# ctime (s, ns), mtime (s, ns), dev, ino, mode, uid, gid, size, sha1, flags
+_ENTRY = struct.Struct('>10I20sH')
+_HEADER = struct.Struct('>4sII')
+_FLAGS = struct.Struct('>H')
+# signature, size
+_EXTENSION = struct.Struct('>4sI')
+# trailing SHA-1 of the whole file
+_CHECKSUM_SIZE = 20
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_SHIFT = 12
+_NAME_MASK = 0xfff
+
+
+class IndexEntry(namedtuple(
+        'IndexEntry',
+        ['path', 'mode', 'binsha', 'stage', 'size', 'mtime', 'ctime',
+         'dev', 'inode', 'uid', 'gid'])):
+    """A single entry of git's index
+
+    `path` is relative to the repository root and uses '/' as separator.
+    `mtime` and `ctime` are in seconds since the epoch, like `os.stat()`
+    reports them.
+    """
+    __slots__ = ()
+
+    @property
+    def hexsha(self):
+        hexsha = binascii.hexlify(self.binsha)
+        return hexsha if PY2 else hexsha.decode('ascii')
+
+
+def _decode_varint(buf, pos):
+    """Decode git's offset encoding (used by index v4) at `pos`
+
+    Returns
+    -------
+    (value, new position)
+    """
+    c = ord(buf[pos:pos + 1])
+    pos += 1
+    value = c & 0x7f
+    while c & 0x80:
+        c = ord(buf[pos:pos + 1])
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7f)
+    return value, pos
+
+
+def _skip_varint(buf, pos):
+    """Return the position after the varint at `pos`"""
+    while ord(buf[pos:pos + 1]) & 0x80:
+        pos += 1
+    return pos + 1
+
+
+def _get_extensions(buf, version, nentries):
+    """Return the signatures of the extensions that follow the entries
+
+    Only the position of every entry is computed, nothing is decoded.
+    """
+    entry_size = _ENTRY.size
+    flags_offset = entry_size - _FLAGS.size
+    unpack_flags = _FLAGS.unpack_from
+    pos = _HEADER.size
+    for i in range(nentries):
+        start = pos
+        flags, = unpack_flags(buf, pos + flags_offset)
+        pos += entry_size
+        if flags & _FLAG_EXTENDED and version > 2:
+            pos += 2
+        if version == 4:
+            pos = buf.find(b'\0', _skip_varint(buf, pos)) + 1
+        else:
+            namelen = flags & _NAME_MASK
+            end = pos + namelen if namelen < _NAME_MASK \
+                else buf.find(b'\0', pos)
+            pos = start + ((end - start + 8) & ~7)
+    signatures = []
+    end = len(buf) - _CHECKSUM_SIZE
+    while pos + _EXTENSION.size <= end:
+        signature, size = _EXTENSION.unpack_from(buf, pos)
+        signatures.append(signature)
+        pos += _EXTENSION.size + size
+    return signatures
+
+
+def iter_index(fname):
+    """Yield the entries of a git index file
+
+    Parameters
+    ----------
+    fname : str
+      Path of the index file, e.g. `.git/index`.
+
+    Yields
+    ------
+    IndexEntry
+      in the order of the index, i.e. sorted by path and stage
+
+    Raises
+    ------
+    ValueError
+      If the file is not an index file, or uses a version or feature
+      (split index) that is not supported.
+    """
+    with open(fname, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        signature, version, nentries = _HEADER.unpack_from(buf, 0)
+        if signature != b'DIRC':
+            raise ValueError("%s is not a git index file" % fname)
+        if version not in (2, 3, 4):
+            raise ValueError(
+                "version %i of git index %s is not supported"
+                % (version, fname))
+        if glob(opj(dirname(fname), 'sharedindex.*')) and \
+                b'link' in _get_extensions(buf, version, nentries):
+            # the entries are spread across this file and a shared index.
+            # There is no split index without a sharedindex.* file, but
+            # stale ones remain after the split index is turned off. Only
+            # then the extensions need to be located, which takes an
+            # extra pass over the entries
+            raise ValueError("split index of %s is not supported" % fname)
+        unpack_entry = _ENTRY.unpack_from
+        # bypass the (pure Python) constructor of the namedtuple
+        new_entry = tuple.__new__
+        entry_size = _ENTRY.size
+        pos = _HEADER.size
+        prev_path = b''
+        for i in range(nentries):
+            start = pos
+            (ctime_s, ctime_ns, mtime_s, mtime_ns, dev, ino, mode, uid, gid,
+             size, binsha, flags) = unpack_entry(buf, pos)
+            pos += entry_size
+            if flags & _FLAG_EXTENDED and version > 2:
+                # extended flags (skip-worktree, intent-to-add), not needed
+                pos += 2
+            if version == 4:
+                strip, pos = _decode_varint(buf, pos)
+                end = buf.find(b'\0', pos)
+                path = prev_path[:len(prev_path) - strip] + buf[pos:end]
+                pos = end + 1
+                prev_path = path
+            else:
+                namelen = flags & _NAME_MASK
+                end = pos + namelen if namelen < _NAME_MASK \
+                    else buf.find(b'\0', pos)
+                path = buf[pos:end]
+                # entries are NUL-padded to a multiple of 8 bytes
+                pos = start + ((end - start + 8) & ~7)
+            yield new_entry(IndexEntry, (
+                path.decode('utf-8'),
+                mode,
+                binsha,
+                (flags >> _FLAG_STAGE_SHIFT) & 3,
+                size,
+                mtime_s + mtime_ns * 1e-9,
+                ctime_s + ctime_ns * 1e-9,
+                dev, ino, uid, gid))
+    finally:
+        buf.close()
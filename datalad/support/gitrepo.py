@@ -59,6 +59,7 @@ from ..utils import assure_unicode
 # imports from same module:
 from .external_versions import external_versions
 from .exceptions import CommandError
+from .gitindex import iter_index
 from .exceptions import DeprecatedError
 from .exceptions import FileNotInRepositoryError
 from .exceptions import MissingBranchError
@@ -1161,8 +1162,40 @@ class GitRepo(RepoInterface):
             list of paths rooting in git's base dir
         """
 
-        return [x[0] for x in self.cmd_call_wrapper(
-            self.repo.index.entries.keys)]
+        return [e.path for e in self.get_index_entries()]
+
+    def get_index_entries(self):
+        """Yield the entries of git's index
+
+        The index file is read directly, without building GitPython's
+        `IndexFile`. Only if its format is not supported, GitPython is
+        used instead.
+
+        Yields
+        ------
+        IndexEntry
+            with (at least) `path` (relative, POSIX), `mode`, `hexsha` and
+            `stage` attributes
+        """
+        index = opj(self.repo.git_dir, 'index')
+        if not exists(index):
+            # nothing was ever added
+            return
+        entries = iter_index(index)
+        try:
+            # the format is checked before the first entry comes out
+            first = next(entries, None)
+        except ValueError as e:
+            lgr.debug("Reading the index with GitPython: %s", exc_str(e))
+            for entry in self.cmd_call_wrapper(
+                    self.repo.index.entries.values):
+                yield entry
+            return
+        if first is None:
+            return
+        yield first
+        for entry in entries:
+            yield entry
 
     def get_hexsha(self, object=None):
         """Return a hexsha for a given object. If None - of current HEAD
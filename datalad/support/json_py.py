@@ -24,6 +24,7 @@ from simplejson import load as jsonload
 from simplejson import dump as jsondump
 # simply mirrored for now
 from simplejson import loads as json_loads
+from simplejson import dumps as json_dumps
 from simplejson import JSONDecodeError
 
 
@@ -0,0 +1,144 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Seekable, block-compressed msgpack streams of path-keyed records
+
+This is an alternative to the xz-compressed JSON streams of `json_py` for
+(potentially huge) collections of records that carry a 'path' property,
+such as aggregated content metadata. Records are sorted by path and
+packed into independently compressed blocks. A footer lists the first
+path and the byte range of each block, hence all records for a particular
+path (or any path underneath it) can be read by decompressing only the
+blocks that contain them.
+
+File layout::
+
+  MAGIC | block | block | ... | footer | footer offset (8 byte, big endian)
+
+Each block and the footer are zlib-compressed msgpack documents. A block
+is a list of records, the footer is a list of [first path, offset, length]
+triplets, one per block.
+"""
+
+import os
+import os.path as op
+import struct
+import zlib
+from bisect import bisect_right
+from os.path import dirname
+from os.path import exists
+from os import makedirs
+
+# !!! msgpack is an optional dependency, hence it is imported only once a
+# packed stream is actually written or read
+
+
+MAGIC = b'DLPS\x01'
+_TRAILER = struct.Struct('>Q')
+# number of records per compressed block, a trade-off between compression
+# ratio and the amount of data that needs to be decompressed for a lookup
+BLOCK_SIZE = 1000
+
+
+def _pack(obj):
+    import msgpack
+    return zlib.compress(msgpack.packb(obj, use_bin_type=True))
+
+
+def _unpack(buf):
+    import msgpack
+    return msgpack.unpackb(zlib.decompress(buf), raw=False)
+
+
+def is_packstream(fname):
+    """Whether a file starts with the signature of a packed stream"""
+    with open(fname, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def dump2packstream(obj, fname, blocksize=BLOCK_SIZE):
+    """Write an iterable of records (dicts with a 'path') to a packed stream
+
+    Parameters
+    ----------
+    obj : iterable
+      Records to store. Each must have a 'path' key with a string value.
+      Records are stored sorted by path, not in the order given.
+    fname : str
+      Target file name. Any existing file is replaced.
+    blocksize : int
+      Number of records per compressed block.
+    """
+    indir = dirname(fname)
+    if op.lexists(fname):
+        os.remove(fname)
+    elif indir and not exists(indir):
+        makedirs(indir)
+    records = sorted(obj, key=lambda r: r['path'])
+    blocks = []
+    with open(fname, 'wb') as f:
+        f.write(MAGIC)
+        for i in range(0, len(records), blocksize):
+            block = records[i:i + blocksize]
+            buf = _pack(block)
+            blocks.append([block[0]['path'], f.tell(), len(buf)])
+            f.write(buf)
+        footer_offset = f.tell()
+        f.write(_pack(blocks))
+        f.write(_TRAILER.pack(footer_offset))
+
+
+def _read_footer(f):
+    f.seek(-_TRAILER.size, os.SEEK_END)
+    end = f.tell()
+    footer_offset, = _TRAILER.unpack(f.read(_TRAILER.size))
+    f.seek(footer_offset)
+    return _unpack(f.read(end - footer_offset))
+
+
+def _read_block(f, offset, length):
+    f.seek(offset)
+    return _unpack(f.read(length))
+
+
+def load_packstream(fname, path=None):
+    """Yield records from a packed stream
+
+    Parameters
+    ----------
+    fname : str
+      Path of the packed stream.
+    path : str, optional
+      If given, only records with this exact path, or any path underneath
+      it (i.e. `path` followed by a '/') are reported, and only the
+      blocks that may contain such records are read.
+    """
+    with open(fname, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a packed stream" % fname)
+        blocks = _read_footer(f)
+        if path is None:
+            for _, offset, length in blocks:
+                for r in _read_block(f, offset, length):
+                    yield r
+            return
+        prefix = path + '/'
+        # all matching paths sort within [path, path + '0'), as '0' is
+        # the character following '/'
+        stop = path + '0'
+        # the last block starting before the path could still contain it
+        start = max(0, bisect_right([b[0] for b in blocks], path) - 1)
+        for first, offset, length in blocks[start:]:
+            if first >= stop:
+                return
+            for r in _read_block(f, offset, length):
+                rpath = r['path']
+                if rpath >= stop:
+                    return
+                if rpath == path or rpath.startswith(prefix):
+                    yield r
@@ -14,6 +14,7 @@ git calls to a ssh remote without the need to reauthenticate.
 """
 
 import logging
+import threading
 from socket import gethostname
 from hashlib import md5
 from os import remove
@@ -348,6 +349,9 @@ class SSHManager(object):
     def __init__(self):
         self._socket_dir = None
         self._connections = dict()
+        # connections might be requested from multiple threads at once,
+        # e.g. while publishing multiple datasets in parallel
+        self._lock = threading.Lock()
         # Initialization of prev_connections is happening during initial
         # handling of socket_dir, so we do not define them here explicitly
         # to an empty list to fail if logic is violated
@@ -439,12 +443,13 @@ class SSHManager(object):
         ctrl_path = "%s/%s" % (self.socket_dir, conhash)
 
         # do we know it already?
-        if ctrl_path in self._connections:
-            return self._connections[ctrl_path]
-        else:
-            c = SSHConnection(ctrl_path, sshri)
-            self._connections[ctrl_path] = c
-            return c
+        with self._lock:
+            if ctrl_path in self._connections:
+                return self._connections[ctrl_path]
+            else:
+                c = SSHConnection(ctrl_path, sshri)
+                self._connections[ctrl_path] = c
+                return c
 
     def close(self, allow_fail=True):
         """Closes all connections, known to this instance.
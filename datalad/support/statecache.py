@@ -0,0 +1,148 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Persistent cache for information derived from a repository's state
+
+Some information (e.g. the configuration, or the list of gitlinks in the
+index) is expensive to obtain, because it requires spawning git, but only
+changes when particular files change. This module stores such information
+under `.git/datalad/cache` together with the state (mtime, inode, size) of
+the files it was derived from. A cached value is only reported as long as
+none of these files changed.
+
+This module is used by the `ConfigManager`, hence it must not import
+anything from datalad.
+"""
+
+import json
+import logging
+import os
+from os.path import join as opj
+from os.path import isdir
+from os.path import exists
+from time import time
+
+lgr = logging.getLogger('datalad.support.statecache')
+
+# bump when the layout of a cache file changes
+_CACHE_VERSION = 1
+
+
+def get_cache_dir(repopath):
+    """Return the state cache directory of a repository, or None
+
+    None is returned when there is no `.git` directory (e.g. `.git` is
+    a file pointing elsewhere).
+    """
+    dotgit = opj(repopath, '.git')
+    if not isdir(dotgit):
+        return None
+    return opj(dotgit, 'datalad', 'cache')
+
+
+def get_file_state(path):
+    """Return [mtime, inode, size] of a file, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_ino, st.st_size]
+
+
+def load_state(repopath, name, files=None):
+    """Load a cached value, if still valid
+
+    Parameters
+    ----------
+    repopath : str
+      Repository path.
+    name : str
+      Name of the cache entry.
+    files : iterable, optional
+      Paths of files whose state must be unchanged, in addition to those
+      recorded when the value was saved.
+
+    Returns
+    -------
+    The cached value, or None if there is none, or it is stale.
+    """
+    cachedir = get_cache_dir(repopath)
+    if cachedir is None:
+        return None
+    cachefile = opj(cachedir, name + '.json')
+    if not exists(cachefile):
+        return None
+    try:
+        with open(cachefile) as f:
+            rec = json.load(f)
+    except Exception as e:
+        lgr.debug("Ignoring unreadable state cache %s: %s", cachefile, e)
+        return None
+    if rec.get('version') != _CACHE_VERSION:
+        return None
+    states = rec.get('files', {})
+    if files and not set(files).issubset(states):
+        return None
+    for fname, state in states.items():
+        if get_file_state(fname) != state:
+            lgr.debug("State cache %s is stale: %s changed", cachefile, fname)
+            return None
+    return rec.get('value')
+
+
+def save_state(repopath, name, files, value):
+    """Save a value in the cache, together with the state of `files`
+
+    Nothing is saved if any of the files was modified in the last two
+    seconds, as a subsequent modification with a low-resolution mtime
+    (FAT32 has 2s, EXT3 has 1s!) could go unnoticed.
+
+    Returns
+    -------
+    bool
+      Whether the value was saved.
+    """
+    cachedir = get_cache_dir(repopath)
+    if cachedir is None:
+        return False
+    current_time = time()
+    states = {}
+    for fname in files:
+        state = get_file_state(fname)
+        if state is not None and (current_time - state[0]) <= 2.0:
+            return False
+        states[fname] = state
+    cachefile = opj(cachedir, name + '.json')
+    try:
+        if not exists(cachedir):
+            os.makedirs(cachedir)
+        # write to a temporary file and move it in place, so concurrent
+        # readers never see a partial cache file
+        tmpfile = '{}.{}.tmp'.format(cachefile, os.getpid())
+        with open(tmpfile, 'w') as f:
+            json.dump(
+                {'version': _CACHE_VERSION, 'files': states, 'value': value},
+                f)
+        if os.name == 'nt' and exists(cachefile):
+            # os.rename() does not replace on windows
+            os.remove(cachefile)
+        os.rename(tmpfile, cachefile)
+    except (OSError, IOError) as e:
+        lgr.debug("Failed to save state cache %s: %s", cachefile, e)
+        return False
+    return True
+
+
+def clear_state(repopath, name):
+    """Remove a cache entry, if it exists"""
+    cachedir = get_cache_dir(repopath)
+    if cachedir is None:
+        return
+    cachefile = opj(cachedir, name + '.json')
+    if exists(cachefile):
+        os.remove(cachefile)
@@ -19,7 +19,7 @@ _COUNTS = (
     'files', 'urls',
     'add_git', 'add_annex', 'dropped',
     'skipped', 'overwritten', 'renamed', 'removed',
-    'downloaded', 'downloaded_size', 'downloaded_time',
+    'downloaded', 'downloaded_size', 'downloaded_time', 'connections',
     'datasets_crawled',
     'datasets_crawl_failed',
 )
@@ -165,6 +165,7 @@ class ActivityStats(object):
             ("URLs processed", "urls"),
             (" downloaded", "downloaded"),
             (" size", "downloaded_size"),
+            (" connections", "connections"),
             ("Files processed", "files"),
             (" skipped", "skipped"),
             (" renamed", "renamed"),
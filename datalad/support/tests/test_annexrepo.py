@@ -15,6 +15,8 @@ from datalad.tests.utils import known_failure_v6
 import logging
 from functools import partial
 import os
+import sys
+import time
 from os import mkdir
 from os.path import join as opj
 from os.path import basename
@@ -33,8 +35,10 @@ import git
 from git import GitCommandError
 from mock import patch
 import gc
+import threading
 
 from datalad.cmd import Runner
+from datalad.cmd import GitRunner
 
 from datalad.support.external_versions import external_versions
 
@@ -96,6 +100,8 @@ from datalad.support.gitrepo import GitRepo
 # imports from same module:
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.annexrepo import ProcessAnnexProgressIndicators
+from datalad.support.annexrepo import BatchedAnnex
+from datalad.support.annexrepo import readline_rstripped
 from .utils import check_repo_deals_with_inode_change
 
 
@@ -1329,6 +1335,145 @@ def test_annex_drop(src, dst):
     # too much arguments:
     assert_raises(CommandError, ar.drop, ['.'], options=['--all'])
 
+    # results could be streamed
+    ar.get(testfile)
+    result = ar.drop([testfile], stream=True)
+    assert_not_is_instance(result, list)
+    # nothing happens until consumed
+    ok_(ar.file_has_content(testfile))
+    result = list(result)
+    assert_false(ar.file_has_content(testfile))
+    eq_(len(result), 1)
+    eq_(result[0]['file'], testfile)
+
+
+@with_tempfile
+def test_iter_annex_command_json(path):
+    repo = AnnexRepo(path, create=True)
+    consumed = threading.Event()
+    annex_waited = []
+
+    def streaming_annex(command, annex_options=None, log_stdout=None,
+                        **kwargs):
+        log_stdout('{"command":"get","file":"f1","success":true}\n')
+        # the record must reach the consumer while annex is still running
+        annex_waited.append(consumed.wait(10))
+        log_stdout('{"command":"get","file":"f2","success":true}\n')
+        return '', ''
+
+    with patch.object(repo, '_run_annex_command', streaming_annex):
+        results = repo._iter_annex_command_json('get', files=['f1', 'f2'])
+        eq_(next(results)['file'], 'f1')
+        consumed.set()
+        eq_([r['file'] for r in results], ['f2'])
+    eq_(annex_waited, [True])
+
+    # failures to run are re-raised in the consumer
+    def failing_annex(command, **kwargs):
+        raise CommandError(cmd="git annex get", msg="fatal", code=1,
+                           stderr="fatal")
+
+    with patch.object(repo, '_run_annex_command', failing_annex):
+        assert_raises(CommandError, list,
+                      repo._iter_annex_command_json('get', files=['f1']))
+
+    # annex is terminated if not consumed to the end
+    procs = []
+
+    def slow_annex(command, annex_options=None, on_start=None, **kwargs):
+        def started(proc):
+            procs.append(proc)
+            on_start(proc)
+        return GitRunner().run(
+            [sys.executable, '-c',
+             'import sys, time; '
+             'print(\'{"command":"get","file":"f1","success":true}\'); '
+             'sys.stdout.flush(); time.sleep(60)'],
+            on_start=started, **kwargs)
+
+    with patch.object(repo, '_run_annex_command', slow_annex), \
+            swallow_logs():
+        results = repo._iter_annex_command_json('get', files=['f1', 'f2'])
+        eq_(next(results)['file'], 'f1')
+        t0 = time.time()
+        results.close()
+    ok_(time.time() - t0 < 30)
+    ok_(procs[0].poll() is not None)
+
+
+@with_tree(tree={'file%d' % i: 'content%d' % i for i in range(10)})
+def test_annex_command_json_batch(path):
+    repo = AnnexRepo(path, create=True)
+    repo.add('.')
+    repo.commit()
+    files = sorted(repo.get_annexed_files())
+    eq_(len(files), 10)
+
+    if external_versions['cmd:annex'] < repo._BATCH_JSON_MIN_VERSION:
+        raise SkipTest("Batch mode is not used with this annex")
+
+    ok_(repo._can_batch_json('find', files))
+    assert_false(repo._can_batch_json('find', files + ['nonexistent']))
+    assert_false(repo._can_batch_json('find', files + [curdir]))
+    assert_false(repo._can_batch_json('add', files))
+
+    calls = []
+    orig_run = repo._run_annex_command
+
+    def run_annex(command, annex_options=None, **kwargs):
+        calls.append(annex_options)
+        return orig_run(command, annex_options=annex_options, **kwargs)
+
+    # argv would need to be split into 10 invocations
+    with patch('datalad.support.annexrepo.CMD_MAX_ARG', len(files[0])), \
+            patch.object(repo, '_run_annex_command', run_annex):
+        found = repo._run_annex_command_json('find', files=files)
+        eq_(len(calls), 1)
+        assert_in('--batch', calls[0])
+        eq_([j['file'] for j in found], files)
+
+        # the same (and the same order) as if passed on the command line
+        eq_(repo.whereis(files),
+            repo.whereis(files + [curdir])[:len(files)])
+        eq_(len(calls), 1 + 1 + len(files) + 1)
+        assert_not_in('--batch', calls[-1])
+
+        # nothing but annexed content is reported
+        create_tree(path, {'ingit': 'ingit'})
+        repo.add('ingit', git=True)
+        del calls[:]
+        eq_(len(repo._run_annex_command_json('find', files=['ingit'])), 0)
+        assert_in('--batch', calls[0])
+
+
+@with_tree(tree={'file1': 'content1', 'file2': 'content2'})
+@with_tempfile
+def test_annex_transfer_without_preflight(src, dst):
+    origin = AnnexRepo(src, create=True)
+    origin.add('.')
+    origin.commit()
+    files = ['file1', 'file2']
+
+    ar = AnnexRepo.clone(src, dst)
+    ar.config.set(
+        'datalad.repo.transfer-preflight', 'false', where='local')
+
+    def no_preflight(*args):
+        raise AssertionError("must not be called")
+
+    with patch.object(ar, '_get_expected_files', no_preflight):
+        results = ar.get(files)
+        eq_(sorted(r['file'] for r in results), files)
+        ok_(all(r['success'] for r in results))
+        ok_(all(ar.file_has_content(files)))
+        # present ones are skipped by annex
+        eq_(ar.get(files), [])
+
+        origin.drop(files, options=['--force'])
+        eq_(sorted(ar.copy_to(files, 'origin')), files)
+        ok_(all(origin.file_has_content(files)))
+        eq_(ar.copy_to(files, 'origin'), [])
+
 
 @with_tree({"a.txt": "a", "b.txt": "b", "c.py": "c", "d": "d"})
 def test_annex_get_annexed_files(path):
@@ -1585,6 +1730,26 @@ def test_ProcessAnnexProgressIndicators():
         eq_(proc.finish(), None)
         eq_(proc.total_pbar, None)
 
+    # without knowing entries in advance
+    proc = ProcessAnnexProgressIndicators(lazy=True)
+    assert(proc.total_pbar is not None)
+    eq_(proc.total_pbar.total, None)
+    with swallow_outputs() as cmo:
+        for l in irrelevant_lines:
+            eq_(proc(l), l)
+        eq_(proc.expected, {})
+        # size is taken from the progress record
+        eq_(proc('{"byte-progress":10,"total-size":100,"action":'
+                 '{"command":"get","key":"key1","file":"file1"}}'), None)
+        eq_(proc.expected, {'key1': 100})
+        eq_(proc.total_pbar.total, 100)
+        eq_(proc(success_lines[0]), success_lines[0])
+        # or from the key
+        eq_(proc(success_lines[1]), success_lines[1])
+        eq_(proc.expected, {'key1': 100, 'backend-s10--key2': 10})
+        eq_(proc.total_pbar.total, 110)
+        eq_(proc.finish(), None)
+
 
 @with_tempfile
 @with_tempfile
@@ -2273,3 +2438,109 @@ def test_fake_dates(path):
         eq_(timestamp, commit.committed_date)
     assert_in("timestamp={}s".format(timestamp),
               ar.repo.git.cat_file("blob", "git-annex:uuid.log"))
+
+
+@with_tempfile
+def test_BatchedAnnex_pipelined(path):
+    ar = AnnexRepo(path, create=True)
+    files = ['f{}'.format(i) for i in range(50)]
+    for f in files:
+        with open(opj(path, f), 'w') as fp:
+            fp.write(f)
+    ar.add(files)
+    ar.commit('add files')
+    files.append('notthere')
+
+    for cmd, kwargs in (('lookupkey', {}),
+                        ('find', {}),
+                        ('info', dict(json=True, annex_options=['--bytes']))):
+        lockstep = BatchedAnnex(cmd, path=path, **kwargs)
+        # small window to exercise flow control
+        pipelined = BatchedAnnex(cmd, path=path, pipelined=True, window=3,
+                                 **kwargs)
+        try:
+            eq_(pipelined(files), lockstep(files))
+            # single requests go through as well
+            eq_(pipelined(files[0]), lockstep(files[0]))
+        finally:
+            lockstep.close()
+            pipelined.close()
+    eq_(ar.get_file_key(files[:-1]), [ar.get_file_key(f) for f in files[:-1]])
+
+    # failing to process a reply does not leave the process behind with
+    # replies that would be received by the next call
+    replies = []
+
+    def output_proc(stdout):
+        if len(replies) == 3:
+            replies.append(None)
+            raise RuntimeError("failed")
+        replies.append(readline_rstripped(stdout))
+        return replies[-1]
+
+    pipelined = BatchedAnnex('lookupkey', path=path, pipelined=True,
+                             window=3, output_proc=output_proc)
+    try:
+        assert_raises(RuntimeError, pipelined, files)
+        eq_(pipelined._process, None)
+        eq_(pipelined(files[:2]), [ar.get_file_key(f) for f in files[:2]])
+    finally:
+        pipelined.close()
+
+
+@with_tree(tree={'a': 'a', 'b': 'b'})
+@serve_path_via_http()
+@with_tempfile
+def test_AnnexRepo_add_urls_to_files(sitepath, siteurl, path):
+    if os.environ.get('DATALAD_FAKE__DATES'):
+        raise SkipTest(
+            "Faked dates are enabled; skipping batched addurl tests")
+    urls_files = [(urljoin(siteurl, f), f) for f in ('a', 'b')]
+    for annex_version, jobs_opt in (
+            (AnnexRepo._BATCH_JOBS_MIN_VERSION, '-J2'),
+            # -J is not passed to an annex not supporting it in batch mode
+            ('6.20180913', None)):
+        ar = AnnexRepo(opj(path, annex_version), create=True)
+        with patch.dict(external_versions._versions,
+                        {'cmd:annex': annex_version}):
+            res = list(ar.add_urls_to_files(urls_files, jobs=2))
+        eq_([r['file'] for r in res], ['a', 'b'])
+        ok_(all(r['success'] for r in res))
+        options = [o for b in ar._batched.values() for o in b.annex_options]
+        (assert_in if jobs_opt else assert_not_in)('-J', ' '.join(options))
+        ar._batched.close()
+
+
+@with_tempfile
+def test_AnnexRepo_add_metadata_batched(path):
+    ar = AnnexRepo(path, create=True)
+    create_tree(path, {'a': 'a', 'b': 'b', 'c': 'c'})
+    ar.add(['a', 'b', 'c'])
+    ar.commit('add files')
+    list(ar.set_metadata('a', add={'tag': 'old', 'other': 'kept'}))
+    res = list(ar.add_metadata_batched(
+        [('a', {'Tag': 'new'}),
+         ('b', {'tag': ['one', 'two'], 'name': 'b'}),
+         ('notthere', {'tag': 'x'}),
+         ('c', {'tag': 'one'})],
+        # exercise chunking
+        chunksize=2))
+    eq_([r['success'] for r in res], [True, True, False, True])
+    eq_([r['file'] for r in res], ['a', 'b', 'notthere', 'c'])
+    # values are added to existing ones
+    deq_({'a': {'tag': ['new', 'old'], 'other': ['kept']},
+          'b': {'tag': ['one', 'two'], 'name': ['b']},
+          'c': {'tag': ['one']}},
+         dict(ar.get_metadata(['a', 'b', 'c'])))
+
+    # annex dying on the way yields failures for the files without a reply
+    orig_call = BatchedAnnex.__call__
+
+    def lossy_call(self, cmds):
+        return orig_call(self, cmds)[:-1]
+
+    with patch.object(BatchedAnnex, '__call__', lossy_call):
+        res = list(ar.add_metadata_batched(
+            [('a', {'tag': 'x'}), ('b', {'tag': 'y'})]))
+    eq_([r['file'] for r in res], ['a', 'b'])
+    eq_([r['success'] for r in res], [False, False])
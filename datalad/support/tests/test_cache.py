@@ -8,6 +8,7 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 
 from ..cache import DictCache
+from ..cache import LRUCache
 from ...tests.utils import assert_equal
 
 
@@ -21,3 +22,28 @@ def test_DictCache():
 
     d['c'] = 2
     assert_equal(d, {'c': 2, 'b': 1})
+
+
+def test_LRUCache():
+    d = LRUCache(size_limit=2)
+    d['a'] = 2
+    d['b'] = 1
+    assert_equal(len(d), 2)
+    # access makes 'a' the most recently used entry
+    assert_equal(d['a'], 2)
+    d['c'] = 3
+    assert_equal(sorted(d._store), ['a', 'c'])
+    assert_equal(d.get('b'), None)
+
+    # size limit in custom units
+    d = LRUCache(size_limit=5, sizeof=len)
+    d['a'] = [1, 2]
+    d['b'] = [1, 2, 3]
+    assert_equal(d.size, 5)
+    d['c'] = [1]
+    assert 'a' not in d
+    assert_equal(d.size, 4)
+    # an entry exceeding the limit on its own is not kept
+    d['d'] = list(range(6))
+    assert 'd' not in d
+    assert_equal(d.size, 0)
@@ -44,3 +44,19 @@ def test_digester(path):
             'sha256': '80028815b3557e30d7cbef1d8dbc30af0ec0858eff34b960d2839fd88ad08871',
             'sha512': '684d23393eee455f44c13ab00d062980937a5d040259d69c6b291c983bf635e1d405ff1dc2763e433d69b8f299b3f4da500663b813ce176a43e29ffcc31b0159'
         })
+
+
+@with_tree(tree={'sample.txt': '123',
+                 'empty': '',
+                 'long.txt': '123abz\n'*1000000})
+def test_digester_parallel(path):
+    fpaths = [opj(path, f) for f in ('sample.txt', 'empty', 'long.txt')]
+    sequential = Digester(parallel=False)
+    expected = [sequential(f) for f in fpaths]
+    # small blocks, so all digests get updated concurrently for many blocks
+    digester = Digester(blocksize=1 << 12)
+    assert_equal([digester(f) for f in fpaths], expected)
+    assert_equal(list(digester.digest_files(fpaths, jobs=2)),
+                 list(zip(fpaths, expected)))
+    assert_equal(list(Digester(['md5']).digest_files(fpaths[:1], jobs=1)),
+                 [(fpaths[0], {'md5': expected[0]['md5']})])
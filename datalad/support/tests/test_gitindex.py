@@ -0,0 +1,103 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+
+import os
+from os.path import join as opj
+
+from mock import patch
+
+from datalad.support.gitindex import iter_index
+from datalad.support.gitrepo import GitRepo
+
+from datalad.tests.utils import with_tree
+from datalad.tests.utils import with_tempfile
+from datalad.tests.utils import eq_
+from datalad.tests.utils import assert_false
+from datalad.tests.utils import assert_raises
+from datalad.tests.utils import assert_greater
+
+
+@with_tree(tree={
+    'file': 'content',
+    'empty': '',
+    u'äöü東': 'unicode',
+    'd1': {'sub': {'deep': '1'}, 'sub2': '2'},
+    'd1.x': 'sorts after d1/',
+    'long' * 40: 'long name'})
+def test_iter_index(path):
+    repo = GitRepo(path, create=True)
+    repo.add('.')
+    index = opj(path, '.git', 'index')
+
+    def _git_entries():
+        # GitPython only supports index version 2
+        out, _ = repo._git_custom_command(
+            [], ['git', 'ls-files', '--stage', '-z'])
+        entries = []
+        for line in out.split('\0'):
+            if not line:
+                continue
+            props, fpath = line.split('\t')
+            mode, hexsha, stage = props.split()
+            entries.append((fpath, int(mode, 8), hexsha, int(stage),
+                            os.lstat(opj(path, fpath)).st_size))
+        return sorted(entries)
+
+    for version in ('2', '3', '4'):
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--index-version', version])
+        # force a (second) entry with extended flags
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--skip-worktree', 'empty'])
+        with patch('datalad.support.gitindex._get_extensions') as get_ext:
+            entries = list(iter_index(index))
+            # a single pass without a split index
+            assert_false(get_ext.called)
+        eq_(len(entries), 7)
+        # reported in the order of the index
+        eq_([e.path for e in entries], sorted(e.path for e in entries))
+        eq_(sorted((e.path, e.mode, e.hexsha, e.stage, e.size)
+                   for e in entries),
+            _git_entries())
+        assert_greater(entries[0].mtime, 0)
+        eq_(sorted(repo.get_indexed_files()),
+            sorted(e.path for e in entries))
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--no-skip-worktree', 'empty'])
+
+
+@with_tempfile
+def test_iter_index_invalid(path):
+    with open(path, 'wb') as f:
+        f.write(b'notanindexfile')
+    assert_raises(ValueError, list, iter_index(path))
+    # an empty file has no entries
+    with open(path, 'wb') as f:
+        pass
+    eq_(list(iter_index(path)), [])
+
+
+@with_tree(tree={'file': 'content', 'd': {'sub': 'sub'}})
+def test_iter_index_split(path):
+    repo = GitRepo(path, create=True)
+    repo.add('.')
+    index = opj(path, '.git', 'index')
+    for version in ('2', '4'):
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--index-version', version])
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--split-index'])
+        assert_raises(ValueError, list, iter_index(index))
+        repo._git_custom_command(
+            [], ['git', 'update-index', '--no-split-index'])
+        # the sharedindex.* file stays behind, but is not used anymore
+        assert_greater(
+            len([f for f in os.listdir(opj(path, '.git'))
+                 if f.startswith('sharedindex.')]), 0)
+        eq_(sorted(e.path for e in iter_index(index)), ['d/sub', 'file'])
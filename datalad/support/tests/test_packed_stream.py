@@ -0,0 +1,54 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+
+from os.path import join as opj
+
+from datalad.support.packed_stream import dump2packstream
+from datalad.support.packed_stream import load_packstream
+from datalad.support.packed_stream import is_packstream
+from datalad.support.json_py import dump2xzstream
+
+from datalad.tests.utils import with_tempfile
+from datalad.tests.utils import eq_
+from datalad.tests.utils import ok_
+from datalad.tests.utils import assert_raises
+
+
+@with_tempfile(mkdir=True)
+def test_packstream(path):
+    paths = [u'a', u'a.txt', u'a/b', u'a/b/c', u'a/bc', u'b', u'b/äöü東',
+             u'c/a']
+    # feed in reverse order, records come out sorted
+    objs = [{'path': p, 'meta': {'n': i}} for i, p in enumerate(paths)][::-1]
+    fname = opj(path, 'sub', 'obj')
+    # small blocks to cross block boundaries
+    dump2packstream(objs, fname, blocksize=3)
+    ok_(is_packstream(fname))
+    eq_([r['path'] for r in load_packstream(fname)], paths)
+    eq_(list(load_packstream(fname, path=u'b/äöü東')),
+        [{'path': u'b/äöü東', 'meta': {'n': 6}}])
+
+    def _paths(p):
+        return [r['path'] for r in load_packstream(fname, path=p)]
+
+    eq_(_paths(u'a'), [u'a', u'a/b', u'a/b/c', u'a/bc'])
+    eq_(_paths(u'a/b'), [u'a/b', u'a/b/c'])
+    eq_(_paths(u'c'), [u'c/a'])
+    eq_(_paths(u'0'), [])
+    eq_(_paths(u'z'), [])
+    # overwrite, and also the empty case
+    dump2packstream([], fname)
+    eq_(list(load_packstream(fname)), [])
+    eq_(list(load_packstream(fname, path=u'a')), [])
+
+    # refuse to read anything else
+    xzname = opj(path, 'obj.xz')
+    dump2xzstream(objs, xzname)
+    ok_(not is_packstream(xzname))
+    assert_raises(ValueError, list, load_packstream(xzname))
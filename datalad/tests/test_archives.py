@@ -21,6 +21,8 @@ from ..support.archives import ExtractedArchive, ArchivesCache
 from .utils import OBSCURE_FILENAME, assert_raises
 from .utils import assert_in
 from .utils import ok_generator
+from .utils import ok_file_has_content
+from ..utils import assure_unicode
 
 fn_in_archive_obscure = OBSCURE_FILENAME
 fn_archive_obscure = fn_in_archive_obscure.replace('a', 'b')
@@ -177,3 +179,180 @@ def test_get_leading_directory():
     yield _test_get_leading_directory, ea, [opj('d', 'f'), opj('._d')], 'd', {'exclude': ['\._.*']}
     yield _test_get_leading_directory, ea, [opj('d', 'd1', 'f'), opj('d', '._d'), '._x'], opj('d', 'd1'), {'exclude': ['\._.*']}
 
+
+
+@with_tempfile(mkdir=True)
+def check_extract_member(ext, path):
+    import io
+    import tarfile
+    import zipfile
+    fpath = opj(fn_archive_obscure, fn_in_archive_obscure)
+    content = [(fpath, b'2 load'),
+               (opj(fn_archive_obscure, '3.txt'), b'3 load')]
+    archive = opj(path, 'simple' + ext)
+    if ext == '.zip':
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for name, load in content:
+                zf.writestr(name, load)
+    else:
+        mode = {'.tar': 'w', '.tar.gz': 'w:gz'}[ext]
+        with tarfile.open(archive, mode) as tf:
+            for name, load in content:
+                tarinfo = tarfile.TarInfo(name)
+                tarinfo.size = len(load)
+                tf.addfile(tarinfo, io.BytesIO(load))
+    earchive = ExtractedArchive(archive, persistent=True)
+
+    extracted = earchive.get_extracted_file(fpath)
+    eq_(extracted, earchive.get_extracted_filename(fpath))
+    ok_file_has_content(extracted, '2 load')
+    # only the requested file was extracted
+    assert_false(earchive.is_extracted)
+    assert_false(exists(earchive.get_extracted_filename(content[1][0])))
+
+    index = earchive.get_members_index()
+    eq_(index['format'], 'zip' if ext == '.zip' else 'tar')
+    eq_(sorted(index['members']), sorted(assure_unicode(n) for n, _ in content))
+    eq_(index['members'][assure_unicode(fpath)][1], len('2 load'))
+    assert_true(exists(earchive.index_path))
+
+    # index is persistent and gets reused
+    earchive2 = ExtractedArchive(archive, earchive.path, persistent=True)
+    with patch('datalad.support.archives._build_members_index') as build:
+        ok_file_has_content(
+            earchive2.get_extracted_file(content[1][0]), '3 load')
+        assert_false(build.called)
+
+    if ext != '.zip':
+        # full extraction takes over whenever all files are needed
+        eq_(len(list(earchive.get_extracted_files())), 2)
+        assert_true(earchive.is_extracted)
+
+    earchive.clean(force=True)
+    assert_false(exists(earchive.path))
+    assert_false(exists(earchive.index_path))
+
+
+def test_extract_member():
+    yield check_extract_member, '.tar'
+    yield check_extract_member, '.tar.gz'
+    yield check_extract_member, '.zip'
+
+
+@with_tempfile(mkdir=True)
+def test_extract_member_zip_dotslash(path):
+    import zipfile
+    archive = opj(path, 'dotslash.zip')
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('./d/f.txt', b'load')
+    earchive = ExtractedArchive(archive, persistent=True)
+    fpath = opj('d', 'f.txt')
+    ok_file_has_content(earchive.get_extracted_file(fpath), 'load')
+    assert_false(earchive.is_extracted)
+    earchive.clean(force=True)
+
+
+@with_tempfile(mkdir=True)
+def test_extract_member_failure(path):
+    import io
+    import tarfile
+    archive = opj(path, 'simple.tar')
+    with tarfile.open(archive, 'w') as tf:
+        tarinfo = tarfile.TarInfo('f.txt')
+        tarinfo.size = 4
+        tf.addfile(tarinfo, io.BytesIO(b'load'))
+    earchive = ExtractedArchive(archive, persistent=True)
+    # e.g. zip compression methods zipfile does not support
+    with patch.object(ExtractedArchive, '_copy_member',
+                      side_effect=NotImplementedError("unsupported")):
+        ok_file_has_content(earchive.get_extracted_file('f.txt'), 'load')
+    assert_true(earchive.is_extracted)
+    earchive.clean(force=True)
+
+
+@with_tempfile(mkdir=True)
+def test_ArchivesCache_prune(path):
+    import io
+    import tarfile
+    archives = []
+    for name in 'abc':
+        archive = opj(path, name + '.tar')
+        with tarfile.open(archive, 'w') as tf:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = 1000
+            tf.addfile(tarinfo, io.BytesIO(b'x' * 1000))
+        archives.append(archive)
+    a, b, c = archives
+
+    cache = ArchivesCache(path, persistent=True, max_size=2500)
+    eq_(cache.max_size, 2500)
+    # whatever the index takes
+    index_size = lambda archive: os.stat(cache[archive].index_path).st_size
+    ok_file_has_content(cache.get_extracted_file(a, 'a'), 'x' * 1000)
+    ok_file_has_content(cache.get_extracted_file(b, 'b'), 'x' * 1000)
+    eq_(cache[a].size, 1000 + index_size(a))
+    # make "a" look least recently used, and then use it again
+    os.utime(cache[a].index_path, (0, 0))
+    os.utime(cache[b].index_path, (1, 1))
+    assert_true(cache[a].last_access < cache[b].last_access)
+    cache.get_extracted_file(a, 'a')
+    assert_true(cache[a].last_access > cache[b].last_access)
+
+    # so "b" gets removed to make space for "c"
+    ok_file_has_content(cache.get_extracted_file(c, 'c'), 'x' * 1000)
+    assert_false(exists(cache[b].path))
+    assert_false(exists(cache[b].index_path))
+    assert_true(exists(cache[a].get_extracted_filename('a')))
+    # but it can be extracted again, at the price of "a" being removed
+    ok_file_has_content(cache.get_extracted_file(b, 'b'), 'x' * 1000)
+    assert_false(exists(cache[a].path))
+    assert_true(exists(cache[c].path))
+
+    # another cache (e.g. in another process) sees and prunes the same
+    cache2 = ArchivesCache(path, persistent=True, max_size=1500)
+    assert_true(cache2.prune() > 0)
+    eq_(sum(exists(cache[x].path) for x in archives), 1)
+    # no limit -- nothing to prune
+    eq_(ArchivesCache(path, persistent=True, max_size=0).prune(), 0)
+    cache.clean(force=True)
+
+
+@with_tempfile(mkdir=True)
+def test_ArchivesCache_threads(path):
+    import io
+    import tarfile
+    import threading
+    from multiprocessing.pool import ThreadPool
+    archives = []
+    for name in 'ab':
+        archive = opj(path, name + '.tar')
+        with tarfile.open(archive, 'w') as tf:
+            tarinfo = tarfile.TarInfo(name)
+            tarinfo.size = 4
+            tf.addfile(tarinfo, io.BytesIO(name.encode() * 4))
+        archives.append(archive)
+
+    cache = ArchivesCache(path, persistent=True, max_size=0)
+    started = []
+    both_started = threading.Event()
+    orig_copy_member = ExtractedArchive._copy_member
+
+    def copy_member(self, *args):
+        started.append(self)
+        if len(started) == len(archives):
+            both_started.set()
+        # would time out if members were extracted one after another
+        assert_true(both_started.wait(10))
+        return orig_copy_member(self, *args)
+
+    pool = ThreadPool(len(archives))
+    try:
+        with patch.object(ExtractedArchive, '_copy_member', copy_member):
+            paths = pool.map(
+                lambda a: cache.get_extracted_file(a, os.path.basename(a)[0]),
+                archives)
+    finally:
+        pool.terminate()
+    ok_file_has_content(paths[0], 'aaaa')
+    ok_file_has_content(paths[1], 'bbbb')
+    cache.clean(force=True)
@@ -0,0 +1,87 @@
+# emacs: -*- mode: python-mode; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil; coding: utf-8 -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test asyncio-based command call wrapper
+"""
+
+import logging
+import os
+import sys
+import time
+
+from datalad.tests.utils import SkipTest
+from ..cmd_async import AsyncRunner
+from ..cmd_async import AsyncGitRunner
+if AsyncRunner is None:
+    raise SkipTest("asyncio runners need Python 3.5+")
+
+from ..support.exceptions import CommandError
+from ..support.protocol import DryRunProtocol
+from .utils import ok_
+from .utils import eq_
+from .utils import assert_raises
+from .utils import assert_is_instance
+from .utils import assert_not_in
+from .utils import swallow_logs
+from .utils import with_tempfile
+
+
+def test_run_many():
+    runner = AsyncRunner()
+    cmds = [[sys.executable, '-c', 'print({})'.format(i)] for i in range(5)]
+    eq_(runner.run_many(cmds),
+        [('{}\n'.format(i), '') for i in range(5)])
+    # shell commands, with a limit on concurrent jobs
+    eq_(runner.run_many(['echo a', 'echo b >&2'], jobs=1),
+        [('a\n', ''), ('', 'b\n')])
+
+
+def test_run_many_concurrent():
+    runner = AsyncRunner()
+    cmd = [sys.executable, '-c', 'import time; time.sleep(1)']
+    t0 = time.time()
+    runner.run_many([cmd] * 4)
+    # would take at least 4 seconds when running one after another
+    ok_(time.time() - t0 < 3)
+
+
+@with_tempfile
+def test_run_many_failure(path):
+    runner = AsyncRunner()
+    cmds = ['echo ok', 'exit 3']
+    with swallow_logs(new_level=logging.DEBUG) as cml:
+        with assert_raises(CommandError) as cme:
+            runner.run_many(cmds + ['sleep 1; echo done > "%s"' % path])
+        eq_(cme.exception.code, 3)
+        # the other commands were waited for
+        ok_(os.path.exists(path))
+        assert_not_in('Event loop is closed', cml.out)
+        res = runner.run_many(cmds, return_exceptions=True, expect_fail=True)
+    eq_(res[0], ('ok\n', ''))
+    assert_is_instance(res[1], CommandError)
+
+
+def test_run_many_dry():
+    protocol = DryRunProtocol()
+    runner = AsyncRunner(protocol=protocol)
+    eq_(runner.run_many([['some', 'command'], 'other command']),
+        [('DRY', 'DRY')] * 2)
+    # commands are not necessarily started in the order given
+    eq_({tuple(r['command']) for r in protocol},
+        {('some', 'command'), ('other', 'command')})
+
+
+@with_tempfile(mkdir=True)
+def test_git_run_many(path):
+    runner = AsyncGitRunner(cwd=path)
+    runner.run(['git', 'init'])
+    out = runner.run_many([['git', 'rev-parse', '--git-dir'],
+                           ['git', 'config', 'core.bare']])
+    eq_(out, [('.git\n', ''), ('false\n', '')])
+    # the blocking interface is unchanged
+    eq_(runner.run(['git', 'config', 'core.bare'])[0], 'false\n')
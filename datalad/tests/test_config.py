@@ -13,6 +13,7 @@
 import os
 from os.path import exists
 from os.path import join as opj
+from time import time
 
 from mock import patch
 from nose.tools import assert_false, assert_true, assert_equal
@@ -26,6 +27,7 @@ from datalad.utils import swallow_logs
 from datalad.distribution.dataset import Dataset
 from datalad.api import create
 from datalad.config import ConfigManager
+from datalad.support.gitrepo import GitRepo
 from datalad.cmd import CommandError
 
 from datalad.tests.utils import with_testsui
@@ -318,3 +320,45 @@ def test_from_env():
     os.environ['DATALAD_CRAZY_OVERRIDE'] = 'fromenv'
     cfg.reload()
     assert_equal(cfg['datalad.crazy.override'], 'fromenv')
+
+
+@with_tree(tree=_dataset_config_template)
+def test_state_cache(path):
+    dspath = opj(path, 'ds')
+    GitRepo(dspath, create=True)
+    ds = Dataset(dspath)
+    cachefile = opj(dspath, '.git', 'datalad', 'cache', 'config.json')
+    with open(opj(dspath, '.git', 'config'), 'a') as f:
+        f.write('[datalad "repo"]\n\tstate-cache = yes\n')
+
+    def _age_cfgfiles():
+        # freshly modified files are never cached
+        for fname in (opj(dspath, '.git', 'config'),
+                      opj(dspath, '.datalad', 'config'),
+                      opj(os.path.expanduser('~'), '.gitconfig')):
+            if exists(fname):
+                os.utime(fname, (time() - 10, time() - 10))
+
+    _age_cfgfiles()
+    cfg = ConfigManager(ds)
+    assert_true(exists(cachefile))
+    with patch.object(ConfigManager, '_run',
+                      side_effect=AssertionError('must not call git')):
+        cached = ConfigManager(ds)
+        assert_equal(cached._store, cfg._store)
+        # multi-value items are preserved
+        assert_equal(cached['something.user'],
+                     ('name=Jane Doe', 'email=jd@example.com'))
+        # environment still applies
+        with patch.dict('os.environ', {'DATALAD_CRAZY_CFG': 'fromenv'}):
+            assert_equal(ConfigManager(ds)['datalad.crazy.cfg'], 'fromenv')
+    # any modification invalidates the cache
+    cfg.set('something.myint', '4', where='dataset')
+    assert_equal(ConfigManager(ds)['something.myint'], '4')
+    # disabling the cache removes it
+    _age_cfgfiles()
+    ConfigManager(ds)
+    assert_true(exists(cachefile))
+    with patch.dict('os.environ', {'DATALAD_REPO_STATE__CACHE': 'no'}):
+        ConfigManager(ds)
+    assert_false(exists(cachefile))
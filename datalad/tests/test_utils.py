@@ -32,6 +32,7 @@ from ..utils import (
 )
 from ..utils import getpwd, chpwd
 from ..utils import get_path_prefix
+from ..utils import get_path_size
 from ..utils import auto_repr
 from ..utils import find_files
 from ..utils import line_profile
@@ -151,6 +152,14 @@ def test_rotree(d):
     shutil.rmtree(d)
 
 
+@with_tree(tree={'f1': 'load', 'd1': {'f2': '12', 'd2': {'f3': ''}}})
+def test_get_path_size(d):
+    eq_(get_path_size(opj(d, 'f1')), 4)
+    eq_(get_path_size(opj(d, 'd1')), 2)
+    eq_(get_path_size(d), 6)
+    eq_(get_path_size(opj(d, 'absent')), 0)
+
+
 def test_swallow_outputs():
     with swallow_outputs() as cm:
         eq_(cm.out, '')
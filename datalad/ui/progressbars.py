@@ -49,6 +49,10 @@ class ProgressBarBase(object):
     def start(self, initial=0):
         self._current = initial
 
+    def set_total(self, total):
+        """Change the total, e.g. as more of the work to be done becomes known"""
+        self.total = total
+
     def finish(self):
         pass
 
@@ -120,6 +124,12 @@ try:
             super(tqdmProgressBar, self).start()
             self._create()
 
+        def set_total(self, total):
+            super(tqdmProgressBar, self).set_total(total)
+            self._pbar_params['total'] = total
+            if self._pbar is not None:
+                self._pbar.total = total
+
         def refresh(self):
             super(tqdmProgressBar, self).refresh()
             # older tqdms might not have refresh yet but I think we can live
@@ -321,6 +321,22 @@ def rmtree(path, chmod_files='auto', *args, **kwargs):
         os.unlink(path)
 
 
+def get_path_size(path):
+    """Return total size (in bytes) of the files under `path`
+
+    Symlinks are not followed.  If `path` does not exist, 0 is returned
+    """
+    if not op.lexists(path):
+        return 0
+    if islink(path) or not isdir(path):
+        return os.lstat(path).st_size
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            size += os.lstat(opj(root, f)).st_size
+    return size
+
+
 def rmdir(path, *args, **kwargs):
     """os.rmdir with our optional checking for open files"""
     assert_no_open_files(path)
@@ -75,7 +75,7 @@ requires = {
     ] + pbar_requires,
     'downloaders': [
         'boto',
-        'msgpack',
+        'msgpack>=0.5.2',  # also for packed metadata streams
         'requests>=1.2',
     ] + keyring_requires,
     'downloaders-extra': [